@@ -4,14 +4,19 @@
 - load_queries: 加载数据
 - run_benchmark: 运行 workflow
 - print_result / save_result: 输出结果
+
+子模块在首次访问属性时才导入（PEP 562），``import benchmarks`` 本身不加载依赖。
 """
 
-from benchmarks.benchmark import (
-    load_queries,
-    print_result,
-    run_benchmark,
-    save_result,
-)
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from benchmarks.benchmark import (
+        load_queries,
+        print_result,
+        run_benchmark,
+        save_result,
+    )
 
 __all__ = [
     "load_queries",
@@ -19,3 +24,13 @@ __all__ = [
     "print_result",
     "save_result",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        from benchmarks import benchmark
+
+        value = getattr(benchmark, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,16 +3,51 @@
 读取数据 → 运行 workflow → 输出结果
 """
 
-import json
+from __future__ import annotations
+
+import math
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import cycle, islice
 from pathlib import Path
-from typing import Any, Callable
-
-from context_ref.core.cache import ToolCache, CacheEntry
-from context_ref.core.config import CacheConfig
-from context_ref.core.storage.memory import MemoryStorageBackend
-from context_ref.interceptor.wrapper import CacheDecision, ToolInterceptor
+from statistics import fmean
+from typing import TYPE_CHECKING, Any, Callable
+
+# context_ref 只在运行基准和保存结果时需要，延迟导入以便 load_queries 轻量启动
+if TYPE_CHECKING:
+    from context_ref.core.config import CacheConfig
+    from context_ref.core.storage.memory import MemoryStorageBackend
+
+
+_PROGRAMMING_QA: tuple[tuple[str, str], ...] = (
+    ("python", "How to install Python on Windows?"),
+    ("python", "How do I install Python 3.11 on Windows 10?"),
+    ("python", "Python installation guide for Windows 11"),
+    ("python", "pip install command not found Python"),
+    ("python", "How to add Python to PATH on Windows?"),
+    ("git", "How to undo last git commit?"),
+    ("git", "Undo last commit but keep changes"),
+    ("git", "Git reset soft head~1"),
+    ("git", "How to revert a commit in git?"),
+    ("git", "Git commit --amend to modify last commit"),
+    ("docker", "Docker container exited with code 0"),
+    ("docker", "Docker container stops immediately"),
+    ("docker", "How to keep container running?"),
+    ("docker", "Docker run --detach flag explained"),
+    ("docker", "Docker CMD vs ENTRYPOINT difference"),
+    ("sql", "How to join two tables in SQL?"),
+    ("sql", "SQL INNER JOIN vs LEFT JOIN"),
+    ("sql", "Join multiple tables in SQL"),
+    ("sql", "SQL query to combine tables"),
+    ("sql", "PostgreSQL join syntax"),
+    ("database", "How to connect to PostgreSQL?"),
+    ("database", "PostgreSQL connection string format"),
+    ("database", "SQLAlchemy database connection setup"),
+    ("database", "Database connection pooling Python"),
+    ("database", "psycopg2 connection example"),
+)
 
 
 def load_queries(dataset: str, limit: int = 100, **kwargs) -> list[dict[str, Any]]:
@@ -38,61 +73,16 @@ def load_queries(dataset: str, limit: int = 100, **kwargs) -> list[dict[str, Any
 
 def _load_programming_qa(limit: int) -> list[dict]:
     """加载编程问答数据。"""
-    queries = []
-    categories = {
-        "python": [
-            "How to install Python on Windows?",
-            "How do I install Python 3.11 on Windows 10?",
-            "Python installation guide for Windows 11",
-            "pip install command not found Python",
-            "How to add Python to PATH on Windows?",
-        ],
-        "git": [
-            "How to undo last git commit?",
-            "Undo last commit but keep changes",
-            "Git reset soft head~1",
-            "How to revert a commit in git?",
-            "Git commit --amend to modify last commit",
-        ],
-        "docker": [
-            "Docker container exited with code 0",
-            "Docker container stops immediately",
-            "How to keep container running?",
-            "Docker run --detach flag explained",
-            "Docker CMD vs ENTRYPOINT difference",
-        ],
-        "sql": [
-            "How to join two tables in SQL?",
-            "SQL INNER JOIN vs LEFT JOIN",
-            "Join multiple tables in SQL",
-            "SQL query to combine tables",
-            "PostgreSQL join syntax",
-        ],
-        "database": [
-            "How to connect to PostgreSQL?",
-            "PostgreSQL connection string format",
-            "SQLAlchemy database connection setup",
-            "Database connection pooling Python",
-            "psycopg2 connection example",
-        ],
-    }
-
-    query_id = 1
-    for category, texts in categories.items():
-        for text in texts:
-            queries.append(
-                {
-                    "id": str(query_id),
-                    "query": text,
-                    "tool_name": "search",
-                    "input_args": {"query": text},
-                    "category": category,
-                }
-            )
-            query_id += 1
-            if len(queries) >= limit:
-                return queries
-    return queries
+    return [
+        {
+            "id": str(i),
+            "query": text,
+            "tool_name": "search",
+            "input_args": {"query": text},
+            "category": category,
+        }
+        for i, (category, text) in enumerate(_PROGRAMMING_QA[:limit], start=1)
+    ]
 
 
 def _load_toolbench(
@@ -130,18 +120,17 @@ def _load_sample(limit: int) -> list[dict]:
         ("stock", {"symbol": "AAPL"}),
     ]
 
-    queries = []
-    for i in range(limit):
-        tool_name, input_args = samples[i % len(samples)]
-        queries.append(
-            {
-                "id": str(i + 1),
-                "query": f"Sample query {i + 1}",
-                "tool_name": tool_name,
-                "input_args": input_args,
-            }
+    return [
+        {
+            "id": str(i),
+            "query": f"Sample query {i}",
+            "tool_name": tool_name,
+            "input_args": input_args,
+        }
+        for i, (tool_name, input_args) in enumerate(
+            islice(cycle(samples), limit), start=1
         )
-    return queries
+    ]
 
 
 def run_benchmark(
@@ -152,6 +141,7 @@ def run_benchmark(
     dataset_name: str = "benchmark",
     enable_compare: bool = False,
     quiet: bool = False,
+    parallel_workers: int = 1,
 ) -> dict[str, Any]:
     """运行基准测试 workflow。
 
@@ -162,73 +152,109 @@ def run_benchmark(
         dataset_name: 数据集名称
         enable_compare: 是否启用性能对比测试
         quiet: 是否静默模式
+        parallel_workers: 并发执行 API 的线程数。大于 1 时按批决策，
+            批内需要执行的查询并发调用 executor，再按原顺序写入缓存。
+            未提供 executor 或启用 enable_compare 时自动退化为串行。
 
     Returns:
         结果字典
     """
+    from tqdm import tqdm
+
+    from context_ref.core.cache import ToolCache
+    from context_ref.core.config import CacheConfig
+    from context_ref.core.storage.memory import MemoryStorageBackend
+    from context_ref.interceptor.wrapper import CacheDecision, ToolInterceptor
+
     config = config or CacheConfig()
     storage = storage_backend or MemoryStorageBackend()
     cache = ToolCache(config=config, storage=storage)
     interceptor = ToolInterceptor(cache=cache, config=config)
 
+    # 缓存不是线程安全的：决策与保存都在主线程，只有 executor 调用并发
+    use_parallel = parallel_workers > 1 and executor is not None and not enable_compare
+    batch_size = parallel_workers if use_parallel else 1
+    pool = ThreadPoolExecutor(max_workers=parallel_workers) if use_parallel else None
+
     reuse_count = 0
     context_count = 0
     execute_count = 0
-    start_time = time.time()
-    from tqdm import tqdm
-
-    with tqdm(queries, desc="benchmark", leave=False) as pbar:
-        for query in pbar:
-            decision_result = interceptor.decide(
-                query["tool_name"],
-                query["input_args"],
-            )
-
-            if decision_result.decision == CacheDecision.REUSE:
-                reuse_count += 1
-
-            elif decision_result.decision == CacheDecision.PROVIDE_CONTEXT:
-                context_count += 1
-                context_ids = set()
-                if decision_result.context_hints:
-                    for hint in decision_result.context_hints:
-                        context_ids.add(hint.entry.id)
-
-                saved_entry = _execute_and_save(cache, executor, query)
-                if saved_entry.id in context_ids:
-                    cache.storage.decrement_reference(saved_entry.id)
-
-            else:
-                execute_count += 1
-                _execute_and_save(cache, executor, query)
+    reused_queries: list[dict[str, Any]] = []
+    start_time = time.perf_counter()
 
-            pbar.set_postfix_str(
-                f"Reuse: {reuse_count}, Context: {context_count}, Exec: {execute_count}"
-            )
-
-    total_time = time.time() - start_time
+    try:
+        with tqdm(
+            total=len(queries), desc="benchmark", leave=False, disable=quiet
+        ) as pbar:
+            for batch_index, batch_start in enumerate(
+                range(0, len(queries), batch_size)
+            ):
+                batch = queries[batch_start : batch_start + batch_size]
+                decisions = interceptor.decide_batch(
+                    [(query["tool_name"], query["input_args"]) for query in batch]
+                )
+
+                pending = []
+                for query, decision_result in zip(batch, decisions, strict=True):
+                    if decision_result.decision == CacheDecision.REUSE:
+                        reuse_count += 1
+                        reused_queries.append(query)
+                    else:
+                        pending.append((query, decision_result))
+
+                pending_queries = [query for query, _ in pending]
+                if pool is not None:
+                    outcomes = list(
+                        pool.map(lambda q: _execute(executor, q), pending_queries)
+                    )
+                else:
+                    outcomes = [_execute(executor, q) for q in pending_queries]
+
+                for (query, decision_result), (success, output) in zip(
+                    pending, outcomes, strict=True
+                ):
+                    if decision_result.decision == CacheDecision.PROVIDE_CONTEXT:
+                        context_count += 1
+                        # decide() 已为这些条目计入一次上下文引用，保存时避免自引用
+                        context_ids = {
+                            hint.entry.id
+                            for hint in decision_result.context_hints or ()
+                        }
+                    else:
+                        execute_count += 1
+                        context_ids = None
+                    cache.save(
+                        query["tool_name"],
+                        query["input_args"],
+                        output,
+                        success=success,
+                        already_referenced_ids=context_ids,
+                    )
+
+                pbar.update(len(batch))
+                # 刷新 postfix 需要格式化字符串并重绘，每 64 批刷新一次即可
+                if not quiet and batch_index % 64 == 0:
+                    pbar.set_postfix_str(
+                        f"Reuse: {reuse_count}, Context: {context_count}, Exec: {execute_count}"
+                    )
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    total_time = time.perf_counter() - start_time
     stats = cache.stats()
 
     # 性能对比测试：对重用的工具进行实际执行测试
     avg_execution_time = 0.0
+    p50_execution_time = 0.0
+    p95_execution_time = 0.0
     total_time_saved = 0.0
     if enable_compare and reuse_count > 0 and executor:
         if not quiet:
             print("\n开始性能对比测试...")
 
-        # 收集所有被重用的查询
-        reused_queries = []
-        for query in queries:
-            decision_result = interceptor.decide(
-                query["tool_name"],
-                query["input_args"],
-            )
-            if decision_result.decision == CacheDecision.REUSE:
-                reused_queries.append(query)
-
         # 对每个重用的查询进行5次实际执行测试
         execution_times = []
-        from tqdm import tqdm
 
         sample_size = min(len(reused_queries), 100)  # 最多测试100个样本
         with tqdm(
@@ -238,30 +264,36 @@ def run_benchmark(
             leave=False,
         ) as pbar:
             for query in pbar:
-                times = []
+                times_ns = []
                 for _ in range(5):
-                    start = time.time()
+                    start = time.perf_counter_ns()
                     try:
                         executor(query["tool_name"], query["input_args"])
                     except Exception:
                         pass  # 忽略执行错误，只关注时间
-                    times.append(time.time() - start)
+                    times_ns.append(time.perf_counter_ns() - start)
 
-                # 使用平均时间
-                avg_time = sum(times) / len(times) if times else 0
-                execution_times.append(avg_time)
+                # 使用平均时间（秒）
+                execution_times.append(sum(times_ns) / len(times_ns) / 1e9)
 
         if execution_times:
-            avg_execution_time = sum(execution_times) / len(execution_times)
+            avg_execution_time = fmean(execution_times)
+            p50_execution_time = _percentile(execution_times, 50)
+            p95_execution_time = _percentile(execution_times, 95)
             # 计算节约的时间：重用次数 * 平均执行时间
             total_time_saved = reuse_count * avg_execution_time
 
             if not quiet:
                 print(f"平均单次执行时间：{avg_execution_time * 1000:.2f}ms")
+                print(
+                    f"执行时间 P50/P95：{p50_execution_time * 1000:.2f}ms / "
+                    f"{p95_execution_time * 1000:.2f}ms"
+                )
                 print(f"重用节约总时间：{total_time_saved:.2f}s")
 
     result = {
         "dataset_name": dataset_name,
+        "eviction_policy": config.eviction_policy,
         "total_queries": len(queries),
         "cache_hits": reuse_count + context_count,
         "cache_misses": execute_count,
@@ -281,6 +313,8 @@ def run_benchmark(
     # 添加性能对比数据
     if enable_compare and reuse_count > 0:
         result["avg_execution_time"] = avg_execution_time
+        result["p50_execution_time"] = p50_execution_time
+        result["p95_execution_time"] = p95_execution_time
         result["total_time_saved"] = total_time_saved
         result["time_saved_percentage"] = (
             total_time_saved / (total_time + total_time_saved) * 100
@@ -291,30 +325,53 @@ def run_benchmark(
     return result
 
 
-def _execute_and_save(
-    cache: ToolCache,
+def _percentile(values: list[float], pct: float) -> float:
+    """最近秩法计算百分位数。"""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def _execute(
     executor: Callable | None,
     query: dict[str, Any],
-) -> CacheEntry:
-    """执行并保存结果。"""
+) -> tuple[bool, Any]:
+    """执行查询（不写缓存），返回 (success, output)。"""
     tool_name = query["tool_name"]
     input_args = query["input_args"]
 
     if executor:
         try:
-            success, output = executor(tool_name, input_args)
+            return executor(tool_name, input_args)
         except Exception as e:
-            success = False
-            output = {"error": str(e)}
-    else:
-        success = True
-        output = {
-            "result": f"Mock response for {tool_name}",
-            "args": input_args,
-            "timestamp": datetime.now().isoformat(),
-        }
+            return False, {"error": str(e)}
 
-    return cache.save(tool_name, input_args, output, success=success)
+    # 输出会被缓存条目直接引用，每次都需要新 dict；只复用不可变的结果字符串
+    return True, {
+        "result": _mock_result(tool_name),
+        "args": input_args,
+        "timestamp": _mock_timestamp(),
+    }
+
+
+@lru_cache(maxsize=1024)
+def _mock_result(tool_name: str) -> str:
+    return f"Mock response for {tool_name}"
+
+
+# (整秒, ISO 字符串)；整体替换元组，多线程读写也不会看到半更新状态
+_last_timestamp: tuple[int, str] = (0, "")
+
+
+def _mock_timestamp() -> str:
+    """秒级精度的当前时间字符串，同一秒内复用缓存的格式化结果。"""
+    global _last_timestamp
+    sec = int(time.time())
+    cached_sec, cached = _last_timestamp
+    if sec != cached_sec:
+        cached = datetime.fromtimestamp(sec).isoformat()
+        _last_timestamp = (sec, cached)
+    return cached
 
 
 def print_result(result: dict[str, Any]) -> None:
@@ -355,20 +412,36 @@ def print_result(result: dict[str, Any]) -> None:
     if "avg_execution_time" in result:
         print(f"\n性能对比（启用 --enable-compare）：")
         print(f"  平均单次执行时间：{result['avg_execution_time'] * 1000:.2f}ms")
+        if "p95_execution_time" in result:
+            print(
+                f"  执行时间 P50/P95：{result['p50_execution_time'] * 1000:.2f}ms / "
+                f"{result['p95_execution_time'] * 1000:.2f}ms"
+            )
         print(f"  工具重用节约总时间：{result['total_time_saved']:.2f}s")
         print(f"  时间节约百分比：{result['time_saved_percentage']:.2f}%")
 
+    if "hit_rate_by_policy" in result:
+        print("\n各淘汰策略命中率：")
+        for policy, hit_rate in result["hit_rate_by_policy"].items():
+            print(f"  {policy}: {hit_rate:.2%}")
+
 
 def save_result(
     result: dict[str, Any], output_path: str | Path, format: str = "json"
 ) -> None:
-    """保存结果到文件。"""
+    """保存结果到文件（json 覆盖写入，jsonl/csv 追加写入）。"""
+    from context_ref.utils.serialization import dumps_json
+
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     if format == "json":
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+            f.write(dumps_json(result, indent=True))
+    elif format == "jsonl":
+        # 每次运行追加一行，便于多次运行的结果汇总
+        with open(output_path, "a", encoding="utf-8", buffering=1 << 16) as f:
+            f.write(dumps_json(result) + "\n")
     elif format == "csv":
         import csv
 
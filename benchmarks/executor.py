@@ -3,18 +3,26 @@ ToolBench API 执行器。
 """
 
 import importlib.util
-import json
 import os
 import re
 import sys
+import threading
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
+from types import ModuleType
 from typing import Any
 
+from context_ref.utils.serialization import dumps_json, loads_json
+
 
 TOOLBENCH_SERVICE_URL = "http://8.130.32.149:8080/rapidapi"
 
+_NAME_TRANS = str.maketrans(" -.", "___")
+_NON_ALNUM = re.compile(r'[^a-z0-9_]')
+_URL_PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
 
 @dataclass
 class APIExecutionResult:
@@ -25,22 +33,40 @@ class APIExecutionResult:
     status_code: int = 0
 
 
+class _RateLimiter:
+    """按固定速率放行请求；多线程下各线程只等待到自己的时间片。"""
+
+    def __init__(self, rps: float):
+        self._interval = 1.0 / rps
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next_allowed - now)
+            self._next_allowed = max(now, self._next_allowed) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
 def standardize_name(name: str) -> str:
-    result = name.lower().replace(" ", "_").replace("-", "_").replace(".", "_")
-    return re.sub(r'[^a-z0-9_]', '', result)
+    return _NON_ALNUM.sub('', name.lower().translate(_NAME_TRANS))
 
 
 def substitute_url_params(url: str, arguments: dict[str, Any]) -> tuple[str, dict[str, Any]]:
     """替换 URL 中的路径参数占位符，返回 (处理后URL, 剩余查询参数)。"""
+    if "{" not in url:
+        return url, dict(arguments)
+    lower_map: dict[str, str] = {}
+    for key in arguments:
+        lower_map.setdefault(key.lower(), key)
     remaining = dict(arguments)
-    for placeholder in re.findall(r'\{(\w+)\}', url):
-        for key, val in list(remaining.items()):
-            if key.lower() == placeholder.lower():
-                url = url.replace(f"{{{placeholder}}}", str(val))
-                del remaining[key]
-                break
-        else:
+    for placeholder in _URL_PLACEHOLDER.findall(url):
+        actual_key = lower_map.get(placeholder.lower())
+        if actual_key is None or actual_key not in remaining:
             raise ValueError(f"URL 参数 '{placeholder}' 未提供，当前参数: {list(arguments.keys())}")
+        url = url.replace(f"{{{placeholder}}}", str(remaining.pop(actual_key)))
     return url, remaining
 
 
@@ -59,29 +85,85 @@ class ToolBenchAPIExecutor:
         self.toolbench_key = toolbench_key or os.environ.get("TOOLBENCH_KEY", "")
         self.use_toolbench_server = use_toolbench_server
         self.tool_cache: dict[str, dict[str, Any]] = {}
+        self._category_index: dict[str, dict[str, Path]] = {}
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._limiter = _RateLimiter(rps=0.5)
 
         if use_toolbench_server and not self.toolbench_key:
             raise ValueError("use_toolbench_server=True 但未设置 TOOLBENCH_KEY")
 
+    def _get_session(self):
+        """复用 HTTP 连接池（keep-alive），并对限流/网关错误做少量重试。
+
+        并行 worker 会同时调用，加锁保证只创建一个 session。
+        """
+        if self._session is not None:
+            return self._session
+        with self._session_lock:
+            if self._session is not None:
+                return self._session
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=64,
+                max_retries=Retry(
+                    total=2,
+                    backoff_factor=0.1,
+                    status_forcelist=(429, 502, 503, 504),
+                    # 重试用尽后返回最后一次响应，保留 HTTP 状态码
+                    raise_on_status=False,
+                ),
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+            return session
+
+    def close(self) -> None:
+        """释放连接池；之后再调用会重新创建 session。"""
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
     def load_tool_definition(self, tool_name: str, category: str) -> dict[str, Any]:
         cache_key = f"{category}:{tool_name}"
         if cache_key in self.tool_cache:
             return self.tool_cache[cache_key]
 
         search_name = standardize_name(tool_name)
-        cat_dir = self.tool_dir / category
-
-        for tool_file in cat_dir.glob("*.json"):
-            with open(tool_file, encoding="utf-8") as f:
-                tool_def = json.load(f)
-            def_name = standardize_name(tool_def.get("tool_name", ""))
-            if def_name == search_name or tool_file.stem == search_name:
-                tool_def["_category"] = category
-                tool_def["_standardized_name"] = tool_file.stem
-                self.tool_cache[cache_key] = tool_def
-                return tool_def
-
-        raise FileNotFoundError(f"工具定义未找到: {tool_name} in {category}")
+        # 文件名通常就是标准化后的工具名，命中时无需扫描整个类别目录
+        tool_file = self.tool_dir / category / f"{search_name}.json"
+        if not tool_file.is_file():
+            tool_file = self._index_category(category).get(search_name)
+        if tool_file is None:
+            raise FileNotFoundError(f"工具定义未找到: {tool_name} in {category}")
+
+        tool_def = loads_json(tool_file.read_bytes())
+        tool_def["_category"] = category
+        tool_def["_standardized_name"] = tool_file.stem
+        self.tool_cache[cache_key] = tool_def
+        return tool_def
+
+    def _index_category(self, category: str) -> dict[str, Path]:
+        """扫描一次类别目录，建立 标准化名称 -> 定义文件 的索引。"""
+        index = self._category_index.get(category)
+        if index is not None:
+            return index
+
+        index = {}
+        for tool_file in (self.tool_dir / category).glob("*.json"):
+            tool_def = loads_json(tool_file.read_bytes())
+            index.setdefault(standardize_name(tool_def.get("tool_name", "")), tool_file)
+            index.setdefault(tool_file.stem, tool_file)
+
+        self._category_index[category] = index
+        return index
 
     def execute_api(
         self,
@@ -90,8 +172,6 @@ class ToolBenchAPIExecutor:
         arguments: dict[str, Any],
         category: str,
     ) -> APIExecutionResult:
-        import requests
-
         start_time = time.time()
         tool_def = self.load_tool_definition(tool_name, category)
 
@@ -116,19 +196,17 @@ class ToolBenchAPIExecutor:
         arguments: dict,
         start_time: float,
     ) -> APIExecutionResult:
-        import requests
-
         payload = {
             "category": tool_def["_category"],
             "tool_name": tool_def["_standardized_name"],
             "api_name": api_def["name"],
-            "tool_input": json.dumps(arguments),
+            "tool_input": dumps_json(arguments),
             "strip": "truncate",
             "toolbench_key": self.toolbench_key,
         }
 
-        time.sleep(2)  # Rate limit
-        response = requests.post(
+        self._limiter.acquire()
+        response = self._get_session().post(
             TOOLBENCH_SERVICE_URL,
             json=payload,
             headers={"toolbench_key": self.toolbench_key},
@@ -155,8 +233,6 @@ class ToolBenchAPIExecutor:
         arguments: dict,
         start_time: float,
     ) -> APIExecutionResult:
-        import requests
-
         url = api_def["url"]
         method = api_def.get("method", "GET").upper()
         host = tool_def["host"]
@@ -175,14 +251,11 @@ class ToolBenchAPIExecutor:
             "X-RapidAPI-Host": host,
         }
 
-        if method == "GET":
-            response = requests.get(url, headers=headers, params=query_params, timeout=10)
-        elif method == "POST":
-            response = requests.post(url, headers=headers, json=query_params, timeout=10)
-        elif method == "PUT":
-            response = requests.put(url, headers=headers, json=query_params, timeout=10)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers, params=query_params, timeout=10)
+        session = self._get_session()
+        if method in ("GET", "DELETE"):
+            response = session.request(method, url, headers=headers, params=query_params, timeout=10)
+        elif method in ("POST", "PUT"):
+            response = session.request(method, url, headers=headers, json=query_params, timeout=10)
         else:
             raise ValueError(f"不支持的 HTTP 方法: {method}")
 
@@ -205,6 +278,8 @@ class DynamicAPIExecutor:
     def __init__(self, tool_dir: str | Path, rapid_api_key: str | None = None):
         self.tool_dir = Path(tool_dir)
         self.api_key = rapid_api_key or os.environ["RAPIDAPI_KEY"]
+        self._module_cache: dict[str, ModuleType] = {}
+        self._func_cache: dict[tuple[str, str], Callable[..., Any]] = {}
 
     def execute_api(
         self,
@@ -214,9 +289,41 @@ class DynamicAPIExecutor:
         category: str,
     ) -> APIExecutionResult:
         start_time = time.time()
+        api_func = self._resolve_function(tool_name, api_name, category)
 
-        # 定位 api.py
+        # 执行
+        call_args = dict(arguments)
+        call_args["toolbench_rapidapi_key"] = self.api_key
+        result = api_func(**call_args)
+
+        latency = time.time() - start_time
+        return APIExecutionResult(success=True, output=result, latency=latency)
+
+    def _resolve_function(
+        self, tool_name: str, api_name: str, category: str
+    ) -> Callable[..., Any]:
+        """定位并导入工具的 api.py，返回 API 对应函数（按工具缓存模块）。"""
+        func_name = standardize_name(api_name)
+        func_key = (f"{category}:{tool_name}", func_name)
+        if func_key in self._func_cache:
+            return self._func_cache[func_key]
+
+        module = self._load_module(tool_name, category)
+        if not hasattr(module, func_name):
+            available = [n for n in dir(module) if not n.startswith("_") and callable(getattr(module, n))]
+            raise AttributeError(f"函数 '{func_name}' 不存在，可用: {available}")
+
+        api_func = getattr(module, func_name)
+        self._func_cache[func_key] = api_func
+        return api_func
+
+    def _load_module(self, tool_name: str, category: str) -> ModuleType:
         search_name = standardize_name(tool_name)
+        cache_key = f"{category}:{search_name}"
+        if cache_key in self._module_cache:
+            return self._module_cache[cache_key]
+
+        # 定位 api.py
         cat_dir = self.tool_dir / category
 
         tool_path = None
@@ -239,18 +346,5 @@ class DynamicAPIExecutor:
         sys.modules[module_name] = module
         spec.loader.exec_module(module)
 
-        # 查找函数
-        func_name = standardize_name(api_name)
-        if not hasattr(module, func_name):
-            available = [n for n in dir(module) if not n.startswith("_") and callable(getattr(module, n))]
-            raise AttributeError(f"函数 '{func_name}' 不存在，可用: {available}")
-
-        api_func = getattr(module, func_name)
-
-        # 执行
-        call_args = dict(arguments)
-        call_args["toolbench_rapidapi_key"] = self.api_key
-        result = api_func(**call_args)
-
-        latency = time.time() - start_time
-        return APIExecutionResult(success=True, output=result, latency=latency)
+        self._module_cache[cache_key] = module
+        return module
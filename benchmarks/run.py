@@ -51,7 +51,15 @@ def main():
         "--max-cache-size", type=int, default=1000, help="最大缓存条目数"
     )
     parser.add_argument(
-        "--output-format", choices=["json", "csv"], default="json", help="输出格式"
+        "--eviction-policy",
+        nargs="+",
+        choices=["score", "lru", "lfu", "fifo", "lru-k", "tinylfu"],
+        default=["score"],
+        help="淘汰策略；指定多个时依次运行并在结果中给出 hit_rate_by_policy",
+    )
+    parser.add_argument("--lru-k", type=int, default=2, help="lru-k 策略的历史深度")
+    parser.add_argument(
+        "--output-format", choices=["json", "jsonl", "csv"], default="json", help="输出格式"
     )
     parser.add_argument("--output", help="输出文件路径")
     parser.add_argument("--quiet", action="store_true", help="安静模式")
@@ -60,6 +68,12 @@ def main():
         action="store_true",
         help="启用性能对比测试（对重用的工具进行5次实际执行测试并计算时间节约）",
     )
+    parser.add_argument(
+        "--parallel-workers",
+        type=int,
+        default=1,
+        help="并发执行真实 API 的线程数（仅 --real-api 时生效，默认串行）",
+    )
 
     args = parser.parse_args()
 
@@ -84,6 +98,7 @@ def main():
         print(f"已加载 {len(queries)} 个查询")
 
     executor = None
+    api_executor = None
     if args.real_api and args.dataset == "toolbench":
         api_key = os.getenv("RAPIDAPI_KEY")
         if not api_key:
@@ -114,20 +129,37 @@ def main():
     if not args.quiet:
         print("开始运行基准测试...\n")
 
-    config = CacheConfig(
-        similarity_threshold=args.similarity_threshold,
-        reuse_threshold=args.reuse_threshold,
-        max_cache_size=args.max_cache_size,
-    )
+    hit_rate_by_policy = {}
+    result = None
+    try:
+        for policy in args.eviction_policy:
+            config = CacheConfig(
+                similarity_threshold=args.similarity_threshold,
+                reuse_threshold=args.reuse_threshold,
+                max_cache_size=args.max_cache_size,
+                eviction_policy=policy,
+                lru_k=args.lru_k,
+            )
 
-    result = run_benchmark(
-        queries,
-        config,
-        executor,
-        dataset_name=args.dataset,
-        enable_compare=args.enable_compare,
-        quiet=args.quiet,
-    )
+            policy_result = run_benchmark(
+                queries,
+                config,
+                executor,
+                dataset_name=args.dataset,
+                enable_compare=args.enable_compare,
+                quiet=args.quiet,
+                parallel_workers=args.parallel_workers,
+            )
+            hit_rate_by_policy[policy] = policy_result["hit_rate"]
+            # 以第一个策略的结果为主结果
+            if result is None:
+                result = policy_result
+    finally:
+        if api_executor is not None:
+            api_executor.close()
+
+    if len(hit_rate_by_policy) > 1:
+        result["hit_rate_by_policy"] = hit_rate_by_policy
 
     if not args.quiet:
         print_result(result)
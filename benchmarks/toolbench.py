@@ -4,12 +4,29 @@
 """
 
 import json
+import mmap
+import os
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
+from context_ref.utils.serialization import loads_json
 
-@dataclass
+try:
+    import ijson
+except ImportError:  # pragma: no cover - 可选依赖，缺失时整体加载
+    ijson = None
+
+# 合法 JSON 文本可能的首字符及裸字面量
+_JSON_START = frozenset('{["-0123456789')
+_JSON_LITERALS = frozenset(("true", "false", "null"))
+
+
+@dataclass(slots=True)
 class ToolBenchQuery:
     """查询数据。"""
 
@@ -23,7 +40,36 @@ class ToolBenchQuery:
     api_description: str = ""
 
 
-@dataclass
+_new_bare_query = ToolBenchQuery.__new__
+
+
+def _new_query(
+    query_id: str,
+    query: str,
+    tool_name: str,
+    api_name: str | None,
+    category: str,
+    required_params: dict[str, Any],
+    optional_params: dict[str, Any],
+    api_description: str,
+) -> ToolBenchQuery:
+    """批量加载专用：绕过 dataclass __init__ 直接填充槽位。
+
+    调用方必须提供全部字段；ToolBenchQuery 增删字段时需同步修改此处。
+    """
+    obj = _new_bare_query(ToolBenchQuery)
+    obj.query_id = query_id
+    obj.query = query
+    obj.tool_name = tool_name
+    obj.api_name = api_name
+    obj.category = category
+    obj.required_params = required_params
+    obj.optional_params = optional_params
+    obj.api_description = api_description
+    return obj
+
+
+@dataclass(slots=True)
 class ToolCall:
     """对话中的工具调用。"""
 
@@ -55,41 +101,43 @@ def load_toolbench_queries(
     if not query_file.exists():
         raise FileNotFoundError(f"查询文件不存在: {query_file}")
 
-    with open(query_file, "r", encoding="utf-8") as f:
-        raw_queries = json.load(f)
+    raw_queries = _load_json_file(query_file)
+    category_set = frozenset(categories) if categories else None
 
     queries = []
-    for item in raw_queries[:limit] if limit else raw_queries:
-        query_text = item.get("query", "")
-        relevant_apis = item.get("relevant APIs", [])
-        api_list = item.get("api_list", [])
-        query_id = str(item.get("query_id", ""))
+    for item in islice(raw_queries, limit) if limit else raw_queries:
+        relevant_apis = item.get("relevant APIs")
+        api_list = item.get("api_list")
 
-        # 跳过缺少关键信息的查询
-        if not relevant_apis or not api_list:
+        # 跳过缺少关键信息的查询（最廉价的判断放在最前）
+        if not (relevant_apis and api_list):
             continue
 
-        if categories:
-            item_categories = {api.get("category_name", "") for api in api_list}
-            if not any(cat in categories for cat in item_categories):
-                continue
+        if category_set is not None and not any(
+            api.get("category_name", "") in category_set for api in api_list
+        ):
+            continue
+
+        query_text = item.get("query", "")
+        query_id = str(item.get("query_id", ""))
 
         # 提取主要API信息
         primary_api = relevant_apis[0]
-        tool_name = primary_api[0] if isinstance(primary_api, list) else primary_api
-        api_name = (
-            primary_api[1]
-            if isinstance(primary_api, list) and len(primary_api) > 1
-            else None
-        )
-
-        # 查找对应的API详细信息
+        # JSON 解析结果只会是原生 list，身份比较即可
+        if type(primary_api) is list:
+            tool_name = primary_api[0]
+            api_name = primary_api[1] if len(primary_api) > 1 else None
+        else:
+            tool_name, api_name = primary_api, None
+
+        # 查找对应的API详细信息（每条只查一次，线性扫描并在首个匹配处停止）
         api_info = None
         for api in api_list:
-            if api.get("tool_name") == tool_name:
-                if api_name is None or api.get("api_name") == api_name:
-                    api_info = api
-                    break
+            if api.get("tool_name") == tool_name and (
+                api_name is None or api.get("api_name") == api_name
+            ):
+                api_info = api
+                break
 
         # 提取参数信息
         required_params = {}
@@ -107,15 +155,15 @@ def load_toolbench_queries(
         category = api_info.get("category_name", "") if api_info else ""
 
         queries.append(
-            ToolBenchQuery(
-                query_id=query_id,
-                query=query_text,
-                tool_name=tool_name,
-                api_name=api_name,
-                category=category,
-                required_params=required_params,
-                optional_params=optional_params,
-                api_description=api_info.get("api_description", "") if api_info else "",
+            _new_query(
+                query_id,
+                query_text,
+                tool_name,
+                api_name,
+                category,
+                required_params,
+                optional_params,
+                api_info.get("api_description", "") if api_info else "",
             )
         )
 
@@ -134,12 +182,12 @@ def load_toolbench_tool_calls(
     if not file_path.exists():
         raise FileNotFoundError(f"对话文件不存在: {file_path}")
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        conversations = json.load(f)
-
     tool_calls = []
 
-    for conv_idx, conv in enumerate(conversations[:limit] if limit else conversations):
+    conversations = _iter_conversations(file_path)
+    for conv_idx, conv in enumerate(
+        islice(conversations, limit) if limit else conversations
+    ):
         query_id = conv.get("id", f"conv_{conv_idx}")
         conversations_list = conv.get("conversations", [])
 
@@ -152,33 +200,26 @@ def load_toolbench_tool_calls(
             value = entry.get("value", "")
 
             # 解析Action和Action Input
-            if "Action:" not in value or "Action Input:" not in value:
+            parsed = _parse_action(value)
+            if parsed is None:
                 continue
 
             try:
-                # 提取Action（工具名称）
-                action_start = value.find("Action:") + len("Action:")
-                action_end = value.find("Action Input:")
-                action = value[action_start:action_end].strip()
-
-                # 提取Action Input（参数）
-                action_input_start = value.find("Action Input:") + len("Action Input:")
-                # 查找下一个换行或结束位置
-                rest_value = value[action_input_start:]
-                action_input_end = (
-                    rest_value.find("\n\n") if "\n\n" in rest_value else len(rest_value)
-                )
-                action_input = rest_value[:action_input_end].strip()
+                action, action_input = parsed
 
                 if not action or not action_input:
                     continue
 
-                # 尝试解析JSON格式的参数
-                try:
-                    args = json.loads(action_input)
-                    if not isinstance(args, dict):
-                        args = {"value": args}
-                except json.JSONDecodeError:
+                # 尝试解析JSON格式的参数；首字符不可能开启 JSON 时直接视为原始输入，
+                # 省去一次必然失败的解析和异常构造
+                if action_input[0] in _JSON_START or action_input in _JSON_LITERALS:
+                    try:
+                        args = json.loads(action_input)
+                        if not isinstance(args, dict):
+                            args = {"value": args}
+                    except json.JSONDecodeError:
+                        args = {"raw_input": action_input}
+                else:
                     # 如果不是JSON，作为原始输入保存
                     args = {"raw_input": action_input}
 
@@ -200,6 +241,60 @@ def load_toolbench_tool_calls(
     return tool_calls
 
 
+def _parse_action(value: str) -> tuple[str, str] | None:
+    """提取 (Action, Action Input)，缺少任一锚点时返回 None。
+
+    Action 到 Action Input 之间为工具名；Action Input 之后到第一个空行（或结尾）为参数。
+    三个锚点各用一次 str.find 顺序定位（C 层子串搜索，不回溯）。
+    """
+    action_start = value.find("Action:")
+    if action_start < 0:
+        return None
+    action_start += len("Action:")
+
+    action_end = value.find("Action Input:", action_start)
+    if action_end < 0:
+        return None
+    input_start = action_end + len("Action Input:")
+
+    input_end = value.find("\n\n", input_start)
+    if input_end < 0:
+        input_end = len(value)
+
+    return value[action_start:action_end].strip(), value[input_start:input_end].strip()
+
+
+def _iter_conversations(file_path: Path) -> Iterator[dict[str, Any]]:
+    """逐条产出对话记录。
+
+    安装了 ijson 时流式解析顶层数组，内存只保留当前一条对话；否则整体加载。
+    """
+    if ijson is None:
+        yield from _load_json_file(file_path)
+        return
+
+    with open(file_path, "rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+
+def _load_json_file(path: Path) -> Any:
+    """以字节解析整个 JSON 文件（跳过文本解码，有 orjson 时走 orjson）。
+
+    文件经 mmap 映射后直接交给解析器，由操作系统按需分页，不再额外复制一份到
+    Python bytes。
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # 空文件无法 mmap，交给解析器报出常规的 JSON 错误
+            return loads_json(f.read())
+        # 视图先于 mmap 退出，保证在 mmap 关闭前释放
+        with (
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+            memoryview(mm) as view,
+        ):
+            return loads_json(view)
+
+
 def extract_query_tool_pairs(
     data_dir: str | Path,
     subset: str = "G1",
@@ -212,7 +307,7 @@ def extract_query_tool_pairs(
     pairs = []
     for query in queries:
         # 合并必需和可选参数
-        all_params = {**query.required_params, **query.optional_params}
+        all_params = query.required_params | query.optional_params
 
         # 如果没有参数，使用查询文本作为输入
         if not all_params:
@@ -239,11 +334,12 @@ def format_for_benchmark(
     formatted = []
     for query in queries:
         # 构建参数（仅包含实际的API参数）
-        arguments = {**query.required_params, **query.optional_params}
+        arguments = query.required_params | query.optional_params
         if not arguments:
             arguments = {"query": query.query}
 
-        # input_args包含执行API所需的所有信息
+        # input_args包含执行API所需的所有信息；参数只放在 arguments 下，
+        # 不再平铺到顶层，避免与 api_name/category 同名时相互覆盖
         formatted.append(
             {
                 "id": query.query_id,
@@ -253,7 +349,6 @@ def format_for_benchmark(
                     "api_name": query.api_name or query.tool_name,
                     "category": query.category,
                     "arguments": arguments,
-                    **arguments,
                 },
             }
         )
@@ -264,16 +359,19 @@ def format_for_benchmark(
 def count_tool_usage(
     data_dir: str | Path,
     limit: int | None = None,
+    top_k: int | None = None,
 ) -> dict[str, int]:
-    """统计工具使用频率（降序）。"""
-    tool_calls = load_toolbench_tool_calls(data_dir, limit=limit)
-    usage = {}
-
-    for call in tool_calls:
-        tool = call.tool_name
-        usage[tool] = usage.get(tool, 0) + 1
+    """统计工具使用频率（降序）。
 
-    return dict(sorted(usage.items(), key=lambda x: x[1], reverse=True))
+    Args:
+        data_dir: 数据目录
+        limit: 最多读取多少条对话
+        top_k: 只返回使用最多的前 k 个工具，None 表示全部
+    """
+    tool_calls = load_toolbench_tool_calls(data_dir, limit=limit)
+    usage = Counter(call.tool_name for call in tool_calls)
+    # 指定 top_k 时 most_common 走 heapq.nlargest（O(N log K)），不做全量排序
+    return dict(usage.most_common(top_k))
 
 
 def get_unique_tools(
@@ -285,38 +383,35 @@ def get_unique_tools(
     if subsets is None:
         subsets = ["G1", "G2", "G3"]
 
-    tools = []
-    seen_keys = set()
+    # (tool_name, api_name) -> 工具记录；dict 同时负责去重与保持首次出现顺序
+    unique: dict[tuple[str, str], dict[str, Any]] = {}
 
-    for subset in subsets:
-        query_file = data_dir / "instruction" / f"{subset}_query.json"
-        if not query_file.exists():
-            continue
+    query_files = [data_dir / "instruction" / f"{subset}_query.json" for subset in subsets]
+    query_files = [path for path in query_files if path.exists()]
+    if not query_files:
+        return []
 
-        with open(query_file, "r", encoding="utf-8") as f:
-            raw_queries = json.load(f)
+    # 各子集文件互相独立，并行读取解析；map 保持子集顺序，去重仍在主线程按序进行
+    with ThreadPoolExecutor(max_workers=len(query_files)) as pool:
+        parsed_subsets = list(pool.map(_load_json_file, query_files))
 
+    for raw_queries in parsed_subsets:
         for item in raw_queries:
             for api in item.get("api_list", []):
-                tool_name = api.get("tool_name", "")
-                api_name = api.get("api_name", "")
-
-                # 使用(tool_name, api_name)作为唯一键
-                tool_key = (tool_name, api_name)
-                if tool_key in seen_keys:
+                g = api.get
+                tool_key = (g("tool_name", ""), g("api_name", ""))
+                # 先判重，重复出现的 API 不再构造记录
+                if tool_key in unique:
                     continue
 
-                seen_keys.add(tool_key)
-                tools.append(
-                    {
-                        "tool_name": tool_name,
-                        "api_name": api_name,
-                        "category": api.get("category_name", ""),
-                        "description": api.get("api_description", ""),
-                        "method": api.get("method", "GET"),
-                        "required_params": api.get("required_parameters", []),
-                        "optional_params": api.get("optional_parameters", []),
-                    }
-                )
-
-    return tools
+                unique[tool_key] = {
+                    "tool_name": tool_key[0],
+                    "api_name": tool_key[1],
+                    "category": g("category_name", ""),
+                    "description": g("api_description", ""),
+                    "method": g("method", "GET"),
+                    "required_params": g("required_parameters", []),
+                    "optional_params": g("optional_parameters", []),
+                }
+
+    return list(unique.values())
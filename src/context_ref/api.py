@@ -1,6 +1,7 @@
 """Context Reference Count API 服务."""
 
 import os
+from functools import lru_cache
 from fastapi import FastAPI
 from pydantic import BaseModel
 from typing import Any, Dict, List, Optional
@@ -15,16 +16,11 @@ app = FastAPI(
     version="0.1.0",
 )
 
-_cache: Optional[ToolCache] = None
-
-
+@lru_cache(maxsize=1)
 def get_cache() -> ToolCache:
-    """获取或创建缓存实例."""
-    global _cache
-    if _cache is None:
-        config = CacheConfig()
-        _cache = ToolCache(config=config, embedding_func=DefaultEmbedding())
-    return _cache
+    """获取或创建缓存实例（首次调用时创建，之后直接返回同一实例）."""
+    config = CacheConfig()
+    return ToolCache(config=config, embedding_func=DefaultEmbedding())
 
 
 class CacheSearchRequest(BaseModel):
@@ -2,19 +2,29 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, TYPE_CHECKING
+import contextlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Collection, Mapping, Sequence
+from typing import Any, TYPE_CHECKING, cast
 
 from context_ref.core.config import CacheConfig
+from context_ref.core.eviction import AccessHistory, FrequencySketch
 from context_ref.core.models import CacheEntry, CacheHit
 from context_ref.core.storage.memory import MemoryStorageBackend
 from context_ref.core.storage.vector import VectorStore
 from context_ref.core.utils import (
-    compute_weighted_score,
+    compute_retention_score,
+    compute_retention_scores,
+    compute_weighted_scores,
     generate_cache_id,
+    pack_embedding,
     serialize_args,
+    to_timestamp,
+    unpack_embedding,
 )
-from context_ref.embedding.base import EmbeddingFunction
+from context_ref.embedding.base import Embedding, EmbeddingFunction
 
 if TYPE_CHECKING:
     from context_ref.core.storage.redis import RedisStorageBackend
@@ -97,6 +107,57 @@ class ToolCache:
         else:
             self._vector_store = self._create_vector_store_from_config()
 
+        # Access tracking for the scan-resistant policies (in-process only)
+        self._access_history: AccessHistory | None = None
+        self._frequency_sketch: FrequencySketch | None = None
+        if self.config.eviction_policy == "lru-k":
+            self._access_history = AccessHistory(self.config.lru_k)
+        elif self.config.eviction_policy == "tinylfu":
+            self._frequency_sketch = FrequencySketch(self.config.max_cache_size * 8)
+
+        # LRU of input_text -> embedding; retries and agent loops repeat inputs
+        self._embed_cache: OrderedDict[str, Embedding] = OrderedDict()
+        self._embed_lock = threading.Lock()
+
+    def _cached_embedding(self, input_text: str) -> Embedding | None:
+        with self._embed_lock:
+            embedding = self._embed_cache.get(input_text)
+            if embedding is not None:
+                self._embed_cache.move_to_end(input_text)
+            return embedding
+
+    def _remember_embedding(self, input_text: str, embedding: Embedding) -> None:
+        maxsize = self.config.embedding_cache_size
+        if maxsize <= 0:
+            return
+        with self._embed_lock:
+            self._embed_cache[input_text] = embedding
+            self._embed_cache.move_to_end(input_text)
+            while len(self._embed_cache) > maxsize:
+                self._embed_cache.popitem(last=False)
+
+    def _embed(self, input_text: str) -> Embedding:
+        """Embed input_text, reusing the vector of a recently seen input."""
+        embedding = self._cached_embedding(input_text)
+        if embedding is None:
+            embedding = self.embedding_func.embed(input_text)
+            self._remember_embedding(input_text, embedding)
+        return embedding
+
+    def _embed_batch(self, input_texts: list[str]) -> list[Embedding]:
+        """Batch version of _embed; only the cache misses are embedded."""
+        embeddings = [self._cached_embedding(text) for text in input_texts]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            computed = self.embedding_func.embed_batch(
+                [input_texts[i] for i in missing]
+            )
+            for i, embedding in zip(missing, computed, strict=True):
+                embeddings[i] = embedding
+                self._remember_embedding(input_texts[i], embedding)
+        # Every None was filled in above
+        return cast("list[Embedding]", embeddings)
+
     def _create_vector_store_from_config(self) -> VectorStore | None:
         """Create vector store from config (lazy initialization supported)."""
         if self.config.vector_store:
@@ -131,10 +192,13 @@ class ToolCache:
             self._vector_store._collection_name = collection_name
         return self._vector_store
 
-    def _compute_entry_score(self, entry: CacheEntry, similarity: float = 1.0) -> float:
-        """Compute score for an entry with given similarity."""
-        return compute_weighted_score(
-            similarity=similarity,
+    def _compute_entry_score(self, entry: CacheEntry) -> float:
+        """Compute the stored eviction score for an entry.
+
+        This is the time-independent retention score, not the query-time
+        weighted score used to rank search hits.
+        """
+        return compute_retention_score(
             reuse_count=entry.reuse_count,
             provide_context_count=entry.provide_context_count,
             last_accessed=entry.last_accessed_at,
@@ -153,66 +217,154 @@ class ToolCache:
         Returns a list of cache hits sorted by weighted score.
         """
         input_text = serialize_args(input_args)
-        embedding = self.embedding_func.embed(input_text)
+        embedding = self._embed(input_text)
+        return self._search_by_embeddings(tool_name, [embedding], top_k)[0]
+
+    def search_batch(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+        top_k: int | None = None,
+    ) -> list[list[CacheHit]]:
+        """Search for several tool calls at once.
+
+        Embeds all inputs with a single ``embed_batch`` call, then issues one
+        vector store query per distinct tool name. Results are in the same
+        order as ``calls``.
+
+        Args:
+            calls: List of (tool_name, input_args) pairs.
+            top_k: Number of candidates per call (defaults to config.top_k).
+
+        Returns:
+            One list of cache hits per call, each sorted by weighted score.
+        """
+        if not calls:
+            return []
+        input_texts = [serialize_args(input_args) for _, input_args in calls]
+        embeddings = self._embed_batch(input_texts)
+
+        # Calls for the same tool share a filter, so they can share a query
+        groups: dict[str, list[int]] = {}
+        for idx, (tool_name, _) in enumerate(calls):
+            groups.setdefault(tool_name, []).append(idx)
+
+        results: list[list[CacheHit]] = [[] for _ in calls]
+        for tool_name, indexes in groups.items():
+            group_hits = self._search_by_embeddings(
+                tool_name, [embeddings[i] for i in indexes], top_k
+            )
+            for idx, hits in zip(indexes, group_hits, strict=True):
+                results[idx] = hits
+        return results
+
+    def _search_by_embeddings(
+        self,
+        tool_name: str,
+        embeddings: list[Embedding],
+        top_k: int | None = None,
+    ) -> list[list[CacheHit]]:
+        """Search the vector store with precomputed embeddings for one tool."""
         k = top_k or self.config.top_k
 
-        results = self.vector_store.search(
-            query_embedding=embedding,
+        results = self.vector_store.search_batch(
+            query_embeddings=embeddings,
             k=k,
             filter={"tool_name": tool_name},
         )
 
-        if not results.get("ids") or not results["ids"][0]:
-            return []
+        all_ids = results.get("ids") or []
+        all_distances = results.get("distances") or []
+        now = time.time()
+        return [
+            self._build_hits(
+                all_ids[row] if row < len(all_ids) else [],
+                all_distances[row] if row < len(all_distances) else None,
+                now,
+            )
+            for row in range(len(embeddings))
+        ]
 
-        hits: list[CacheHit] = []
-        for idx, entry_id in enumerate(results["ids"][0]):
-            entry_data = self._storage.get(entry_id)
+    def _build_hits(
+        self,
+        ids: list[str],
+        distances: list[float] | None,
+        now: float | None = None,
+    ) -> list[CacheHit]:
+        """Turn one row of vector store results into scored cache hits."""
+        # Drop candidates below the threshold before touching storage
+        threshold = self.config.similarity_threshold
+        candidates: list[tuple[str, float]] = []
+        for idx, entry_id in enumerate(ids):
+            similarity = 1.0 - (distances[idx] if distances else 0.0)
+            if similarity >= threshold:
+                candidates.append((entry_id, similarity))
+
+        # Score straight from the stored dicts; CacheEntry objects are built
+        # afterwards, once per returned hit, in ranked order.
+        datas: list[Mapping[str, Any]] = []
+        similarities: list[float] = []
+        stale_ids: list[str] = []
+        entry_datas = self._storage.get_many([entry_id for entry_id, _ in candidates])
+        for (entry_id, similarity), entry_data in zip(
+            candidates, entry_datas, strict=True
+        ):
             if entry_data is None:
-                try:
-                    if not self._storage.exists(entry_id):
-                        self.vector_store.delete(ids=[entry_id])
-                except Exception:
-                    pass
+                stale_ids.append(entry_id)
                 continue
-
-            entry = CacheEntry.from_dict(entry_data)
-            distance = results["distances"][0][idx] if results["distances"] else 0.0
-            similarity = 1.0 - distance
-
-            if similarity < self.config.similarity_threshold:
-                continue
-
-            weighted_score = compute_weighted_score(
-                similarity=similarity,
-                reuse_count=entry.reuse_count,
-                provide_context_count=entry.provide_context_count,
-                last_accessed=entry.last_accessed_at,
-                reuse_context_factor=self.config.reuse_context_factor,
-                time_decay_lambda=self.config.time_decay_lambda,
-            )
-            hits.append(
-                CacheHit(
-                    entry=entry, similarity=similarity, weighted_score=weighted_score
-                )
+            datas.append(entry_data)
+            similarities.append(similarity)
+
+        # Vector store rows whose storage entry is gone (e.g. evicted by
+        # another process). An entry that exists but failed to decode keeps
+        # its vector, so it can still be found and evicted.
+        stale_ids = [i for i in stale_ids if not self._storage.exists(i)]
+        if stale_ids:
+            with contextlib.suppress(Exception):
+                self.vector_store.delete(ids=stale_ids)
+
+        if now is None:
+            now = time.time()
+        scores = compute_weighted_scores(
+            similarities,
+            [d.get("reuse_count", 0) for d in datas],
+            [d.get("provide_context_count", 0) for d in datas],
+            [to_timestamp(d.get("last_accessed_at"), now) for d in datas],
+            reuse_context_factor=self.config.reuse_context_factor,
+            time_decay_lambda=self.config.time_decay_lambda,
+            now=now,
+        )
+        ranked = sorted(range(len(datas)), key=scores.__getitem__, reverse=True)
+        return [
+            CacheHit(
+                entry=CacheEntry.from_dict(datas[i]),
+                similarity=similarities[i],
+                weighted_score=scores[i],
+                reuse_threshold=self.config.reuse_threshold,
             )
+            for i in ranked
+        ]
 
-        hits.sort(key=lambda h: h.weighted_score, reverse=True)
-        return hits
+    def _record_access(self, entry_id: str) -> None:
+        """Feed an access into the eviction policy's tracking state."""
+        if self._access_history is not None:
+            self._access_history.record(entry_id)
+        elif self._frequency_sketch is not None:
+            self._frequency_sketch.record(entry_id)
 
     def _touch_entry(self, entry_id: str) -> None:
         """Refresh access time and derived score for an entry."""
-        updated = self._storage.update_access_time(entry_id)
-        if not updated:
-            return
-
-        entry_data = self._storage.get(entry_id)
-        if entry_data is None:
-            return
-
-        entry = CacheEntry.from_dict(entry_data)
-        score = self._compute_entry_score(entry)
-        self._storage.update_score(entry_id, score)
+        if self._bump_entry(entry_id, "touch"):
+            self._record_access(entry_id)
+
+    def _bump_entry(self, entry_id: str, kind: str) -> bool:
+        """Record a reuse/context/touch access and rescore in one storage call."""
+        score = self._storage.increment_and_rescore(
+            entry_id,
+            kind,
+            self.config.reuse_context_factor,
+            self.config.time_decay_lambda,
+        )
+        return score is not None
 
     def get_best_match(
         self,
@@ -232,8 +384,23 @@ class ToolCache:
         input_args: dict[str, Any],
         output: Any,
         success: bool = True,
+        already_referenced_ids: Collection[str] | None = None,
     ) -> CacheEntry:
-        """Save a tool call result to cache."""
+        """Save a tool call result to cache.
+
+        Args:
+            tool_name: Name of the tool.
+            input_args: Arguments the tool was called with.
+            output: Tool output to cache.
+            success: Whether the tool call succeeded.
+            already_referenced_ids: Entry IDs that were just credited a
+                provide-context reference for this same call. If the saved
+                entry is one of them, that credit is withdrawn in the same
+                write so an entry never counts as context for itself.
+
+        Returns:
+            The saved cache entry.
+        """
         input_text = serialize_args(input_args)
         entry_id = generate_cache_id(tool_name, input_text)
 
@@ -242,13 +409,20 @@ class ToolCache:
             entry = CacheEntry.from_dict(existing)
             entry.output = output
             entry.success = success
-            entry.last_accessed_at = datetime.now()
+            entry.last_accessed_at = time.time()
+            if (
+                already_referenced_ids
+                and entry_id in already_referenced_ids
+                and entry.provide_context_count > 0
+            ):
+                entry.provide_context_count -= 1
 
             score = self._compute_entry_score(entry)
             self._storage.set(entry_id, entry.to_dict(), score=score)
+            self._record_access(entry_id)
             return entry
 
-        embedding = self.embedding_func.embed(input_text)
+        embedding = self._embed(input_text)
         entry = CacheEntry(
             id=entry_id,
             tool_name=tool_name,
@@ -260,24 +434,145 @@ class ToolCache:
         )
 
         score = self._compute_entry_score(entry)
-        self.vector_store.add(
-            ids=[entry_id],
-            embeddings=[embedding],
-            documents=[input_text],
-            metadata=[{"tool_name": tool_name}],
+        # Entry, score and embedding go out in one storage write; if the
+        # vector store then fails, a single delete undoes all three.
+        self._storage.set(
+            entry_id, entry.to_dict(), score=score, embedding=pack_embedding(embedding)
         )
         try:
-            self._storage.set(entry_id, entry.to_dict(), score=score)
+            self.vector_store.add(
+                ids=[entry_id],
+                embeddings=[embedding],
+                documents=[input_text],
+                metadata=[{"tool_name": tool_name}],
+            )
         except Exception:
-            try:
-                self.vector_store.delete(ids=[entry_id])
-            except Exception:
-                pass
+            with contextlib.suppress(Exception):
+                self._storage.delete(entry_id)
             raise
 
-        self._maybe_evict()
+        self._record_access(entry_id)
+        self._maybe_evict(candidate_id=entry_id)
         return entry
 
+    def save_many(
+        self,
+        records: Sequence[tuple[str, dict[str, Any], Any]],
+        success: bool = True,
+    ) -> list[CacheEntry]:
+        """Save several tool call results at once.
+
+        Equivalent to calling save() for each (tool_name, input_args, output)
+        record, but existing entries are fetched with one storage read, new
+        inputs are embedded in one embed_batch call, and the vector store and
+        storage each receive a single write.
+
+        Args:
+            records: (tool_name, input_args, output) triples.
+            success: Whether the tool calls succeeded.
+
+        Returns:
+            The saved cache entries, in the same order as ``records``.
+        """
+        if not records:
+            return []
+
+        # Later records for the same input win, as with repeated save() calls
+        latest: dict[str, tuple[str, dict[str, Any], str, Any]] = {}
+        order: list[str] = []
+        for tool_name, input_args, output in records:
+            input_text = serialize_args(input_args)
+            entry_id = generate_cache_id(tool_name, input_text)
+            latest[entry_id] = (tool_name, input_args, input_text, output)
+            order.append(entry_id)
+
+        entry_ids = list(latest)
+        now = time.time()
+        entries: dict[str, CacheEntry] = {}
+        new_ids: list[str] = []
+        existing_datas = self._storage.get_many(entry_ids)
+        for entry_id, existing in zip(entry_ids, existing_datas, strict=True):
+            if existing is None:
+                new_ids.append(entry_id)
+                continue
+            entry = CacheEntry.from_dict(existing)
+            entry.output = latest[entry_id][3]
+            entry.success = success
+            entry.last_accessed_at = now
+            entries[entry_id] = entry
+
+        embeddings = self._embed_batch([latest[i][2] for i in new_ids])
+        for entry_id, embedding in zip(new_ids, embeddings, strict=True):
+            tool_name, input_args, input_text, output = latest[entry_id]
+            entries[entry_id] = CacheEntry(
+                id=entry_id,
+                tool_name=tool_name,
+                input_text=input_text,
+                input_args=input_args,
+                output=output,
+                embedding=embedding,
+                success=success,
+            )
+
+        if new_ids:
+            self.vector_store.add(
+                ids=new_ids,
+                embeddings=embeddings,
+                documents=[entries[i].input_text for i in new_ids],
+                metadata=[{"tool_name": entries[i].tool_name} for i in new_ids],
+            )
+        scores = compute_retention_scores(
+            [entry.reuse_count for entry in entries.values()],
+            [entry.provide_context_count for entry in entries.values()],
+            [entry.last_accessed_at for entry in entries.values()],
+            reuse_context_factor=self.config.reuse_context_factor,
+            time_decay_lambda=self.config.time_decay_lambda,
+        )
+        try:
+            self._storage.set_many(
+                [
+                    (entry_id, entry.to_dict(), score)
+                    for (entry_id, entry), score in zip(
+                        entries.items(), scores, strict=True
+                    )
+                ],
+                embeddings={
+                    entry_id: pack_embedding(embedding)
+                    for entry_id, embedding in zip(new_ids, embeddings, strict=True)
+                },
+            )
+        except Exception:
+            if new_ids:
+                with contextlib.suppress(Exception):
+                    self.vector_store.delete(ids=new_ids)
+            raise
+
+        for entry_id in entry_ids:
+            self._record_access(entry_id)
+        if new_ids:
+            self._maybe_evict()
+        return [entries[entry_id] for entry_id in order]
+
+    def get_embedding(self, entry_id: str) -> list[float] | None:
+        """Load the stored embedding of an entry.
+
+        Entry records don't carry their embedding, so search and reference
+        bumps never decode it. This is for the rare caller that needs it,
+        e.g. rebuilding the vector store.
+
+        Args:
+            entry_id: The unique identifier for the entry.
+
+        Returns:
+            The embedding (dequantized from int8, so approximate), or None
+            if none is stored for the entry.
+        """
+        data = self._storage.get_embedding(entry_id)
+        if data is not None:
+            return unpack_embedding(data)
+        legacy = self._storage.get(entry_id)
+        return legacy.get("embedding") if legacy else None
+
     def increment_reuse(self, entry_id: str) -> bool:
         """Increment the reuse count for a cache entry.
 
@@ -289,13 +584,9 @@ class ToolCache:
         Returns:
             True if increment succeeded, False if entry doesn't exist.
         """
-        success = self._storage.increment_reuse(entry_id)
+        success = self._bump_entry(entry_id, "reuse")
         if success:
-            entry_data = self._storage.get(entry_id)
-            if entry_data:
-                entry = CacheEntry.from_dict(entry_data)
-                score = self._compute_entry_score(entry)
-                self._storage.update_score(entry_id, score)
+            self._record_access(entry_id)
         return success
 
     def increment_context(self, entry_id: str) -> bool:
@@ -309,15 +600,36 @@ class ToolCache:
         Returns:
             True if increment succeeded, False if entry doesn't exist.
         """
-        success = self._storage.increment_context(entry_id)
+        success = self._bump_entry(entry_id, "context")
         if success:
-            entry_data = self._storage.get(entry_id)
-            if entry_data:
-                entry = CacheEntry.from_dict(entry_data)
-                score = self._compute_entry_score(entry)
-                self._storage.update_score(entry_id, score)
+            self._record_access(entry_id)
         return success
 
+    def increment_context_many(self, entry_ids: list[str]) -> int:
+        """Increment the provide_context count of several entries at once.
+
+        Same as calling increment_context for each id, but the storage
+        backend applies all of them in one call.
+
+        Args:
+            entry_ids: The unique identifiers of the entries.
+
+        Returns:
+            Number of entries that exist and were incremented.
+        """
+        scores = self._storage.increment_and_rescore_many(
+            entry_ids,
+            "context",
+            self.config.reuse_context_factor,
+            self.config.time_decay_lambda,
+        )
+        updated = 0
+        for entry_id, score in zip(entry_ids, scores, strict=True):
+            if score is not None:
+                self._record_access(entry_id)
+                updated += 1
+        return updated
+
     def increment_reference(self, entry_id: str) -> bool:
         """Increment the reference count for a cache entry (backward compatibility).
 
@@ -331,39 +643,87 @@ class ToolCache:
         """
         return self.increment_reuse(entry_id)
 
-    def _maybe_evict(self) -> None:
-        """Evict entries if cache size exceeds limit."""
-        if self._storage.size() <= self.config.max_cache_size:
-            return
+    def _maybe_evict(self, candidate_id: str | None = None) -> None:
+        """Evict entries if cache size exceeds limit.
 
+        Args:
+            candidate_id: The entry that was just inserted. Under the
+                "tinylfu" policy it is evicted instead of the LRU victim
+                when it has been seen less often than that victim.
+        """
         num_to_evict = self._storage.size() - self.config.max_cache_size
+        if num_to_evict <= 0:
+            return
 
         if self.config.eviction_policy == "score":
-            evict_keys = self._storage.get_bottom_by_score(num_to_evict)
-        elif self.config.eviction_policy == "lru":
+            # Picking and deleting the victims is one atomic storage step
+            evicted = self._storage.pop_bottom_by_score(num_to_evict)
+            self._drop_evicted(evicted)
+            return
+
+        if self.config.eviction_policy == "lru":
             evict_keys = self._storage.get_oldest_by_access(num_to_evict)
         elif self.config.eviction_policy == "lfu":
             evict_keys = self._storage.get_least_used(num_to_evict)
+        elif self.config.eviction_policy == "lru-k":
+            assert self._access_history is not None
+            evict_keys = self._access_history.victims(
+                self._storage.keys(), num_to_evict
+            )
+        elif self.config.eviction_policy == "tinylfu":
+            evict_keys = self._tinylfu_victims(num_to_evict, candidate_id)
         else:
             evict_keys = self._storage.get_oldest_by_creation(num_to_evict)
 
-        for entry_id in evict_keys:
-            self._evict_entry(entry_id)
+        self._evict_entries(evict_keys)
+
+    def _tinylfu_victims(self, n: int, candidate_id: str | None) -> list[str]:
+        """Pick LRU victims, rejecting the candidate if it is colder than them."""
+        assert self._frequency_sketch is not None
+        victims = [
+            key
+            for key in self._storage.get_oldest_by_access(n + 1)
+            if key != candidate_id
+        ][:n]
+        if candidate_id is None or not victims:
+            return victims
+
+        sketch = self._frequency_sketch
+        if sketch.estimate(candidate_id) >= sketch.estimate(victims[0]):
+            return victims
+        # Admission denied: drop the newcomer and keep the warmer victim
+        return [candidate_id] + victims[1:]
+
+    def _evict_entries(self, entry_ids: list[str]) -> None:
+        """Remove entries from storage and the vector store in one call each."""
+        if not entry_ids:
+            return
+        self._storage.delete_many(entry_ids)
+        self._drop_evicted(entry_ids)
 
-    def _evict_entry(self, entry_id: str) -> None:
-        if self._storage.exists(entry_id):
-            self._storage.delete(entry_id)
-            self.vector_store.delete(ids=[entry_id])
+    def _drop_evicted(self, entry_ids: list[str]) -> None:
+        """Remove already-deleted storage entries from the vector store."""
+        if not entry_ids:
+            return
+        self.vector_store.delete(ids=entry_ids)
+        if self._access_history is not None:
+            for entry_id in entry_ids:
+                self._access_history.forget(entry_id)
 
     def clear(self) -> None:
         """Clear all cache entries."""
         self._storage.clear()
         self.vector_store.clear()
+        if self._access_history is not None:
+            self._access_history.clear()
+        if self._frequency_sketch is not None:
+            self._frequency_sketch.clear()
 
     def stats(self) -> dict[str, Any]:
         """Get cache statistics."""
-        entries = list(self._storage.keys())
-        if not entries:
+        agg = self._storage.aggregate_stats()
+        total_entries = agg["total_entries"]
+        if not total_entries:
             return {
                 "total_entries": 0,
                 "total_reuse_count": 0,
@@ -372,26 +732,16 @@ class ToolCache:
                 "avg_reference_count": 0.0,
             }
 
-        total_reuse = 0
-        total_context = 0
-        max_refs = 0
-        for key in entries:
-            data = self._storage.get(key)
-            if data:
-                reuse = data.get("reuse_count", 0)
-                context = data.get("provide_context_count", 0)
-                total_reuse += reuse
-                total_context += context
-                max_refs = max(max_refs, reuse + context)
-
+        total_reuse = agg["total_reuse_count"]
+        total_context = agg["total_context_count"]
         total_refs = total_reuse + total_context
         return {
-            "total_entries": len(entries),
+            "total_entries": total_entries,
             "total_reuse_count": total_reuse,
             "total_context_count": total_context,
             "total_references": total_refs,
-            "avg_reference_count": total_refs / len(entries),
-            "max_reference_count": max_refs,
+            "avg_reference_count": total_refs / total_entries,
+            "max_reference_count": agg["max_reference_count"],
         }
 
     def close(self) -> None:
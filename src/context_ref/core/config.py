@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal, Optional, Union
 
@@ -23,6 +24,7 @@ class CacheConfig(BaseModel):
         time_decay_lambda: Decay rate for recency factor (per hour)
         top_k: Number of candidates to retrieve for similarity search
         eviction_policy: Cache eviction strategy
+        lru_k: History depth for the "lru-k" eviction policy
         persist_path: Path for persistent storage (optional)
         collection_name: Name of the vector store collection (deprecated, use vector_store.collection_name)
         redis_score_key: Key prefix for Redis ZSET scores (deprecated, use storage.prefix)
@@ -62,9 +64,17 @@ class CacheConfig(BaseModel):
         gt=0,
         description="Number of candidates to retrieve for similarity search",
     )
-    eviction_policy: Literal["lru", "lfu", "fifo", "score"] = Field(
+    eviction_policy: Literal["lru", "lfu", "fifo", "score", "lru-k", "tinylfu"] = Field(
         default="score", description="Cache eviction strategy"
     )
+    lru_k: int = Field(
+        default=2, ge=1, description="History depth for the 'lru-k' eviction policy"
+    )
+    embedding_cache_size: int = Field(
+        default=1024,
+        ge=0,
+        description="Embeddings of recent input texts kept in memory (0 disables)",
+    )
     persist_path: Optional[str] = Field(
         default=None, description="Path for persistent storage (optional)"
     )
@@ -129,6 +139,15 @@ class ChromaConfig(BaseSettings):
     auth_credentials_provider: Optional[str] = Field(
         default=None, description="ChromaDB authentication credentials provider"
     )
+    hnsw_m: int = Field(
+        default=24, ge=2, description="HNSW graph degree for new collections"
+    )
+    hnsw_ef_construction: int = Field(
+        default=128, ge=1, description="HNSW build-time candidate list size"
+    )
+    hnsw_ef_search: int = Field(
+        default=100, ge=1, description="HNSW query-time candidate list size"
+    )
 
     @field_validator("mode")
     @classmethod
@@ -224,12 +243,13 @@ class StorageBackendConfig(BaseModel):
         """Ensure Redis config is provided when backend_type is redis."""
         if self.backend_type == "redis" and self.redis is None:
             # Auto-create from environment
-            self.redis = RedisConfig()
-            if not self.redis.is_configured():
+            redis_config = get_redis_config()
+            if redis_config is None:
                 raise ValueError(
                     "Redis configuration required when backend_type='redis'. "
                     "Set REDIS_URL or REDIS_HOST environment variable."
                 )
+            self.redis = redis_config.model_copy()
         return self
 
 
@@ -237,13 +257,24 @@ class VectorStoreConfig(BaseModel):
     """Configuration for vector store selection and settings.
 
     Attributes:
-        store_type: Type of vector store ('chroma' or 'memory')
+        store_type: Type of vector store ('chroma', 'memory' or 'faiss')
         chroma: ChromaDB configuration (used if store_type='chroma')
         collection_name: Name of the vector store collection
+        coalesce_window_ms: Window for joining concurrent Chroma searches
+            into one multi-query call (0 disables it)
+        memory_dtype: Element type of the in-memory store's embedding matrix
+            ('float16' halves its size, 'int8' quarters it)
+        memory_path: File prefix the in-memory store is loaded from and
+            saved to on close (None keeps it in memory only)
+        faiss_ann_min_vectors: Vector count from which the FAISS store
+            builds an HNSW graph; smaller stores are searched exactly
+        faiss_hnsw_m: Graph degree of the FAISS HNSW index
+        faiss_ef_search: Candidate list size for FAISS HNSW searches
     """
 
-    store_type: Literal["chroma", "memory"] = Field(
-        default="chroma", description="Vector store type: 'chroma' or 'memory'"
+    store_type: Literal["chroma", "memory", "faiss"] = Field(
+        default="chroma",
+        description="Vector store type: 'chroma', 'memory' or 'faiss'",
     )
     chroma: Optional["ChromaConfig"] = Field(
         default=None, description="ChromaDB configuration (used if store_type='chroma')"
@@ -251,20 +282,49 @@ class VectorStoreConfig(BaseModel):
     collection_name: str = Field(
         default="tool_cache", description="Name of the vector store collection"
     )
+    coalesce_window_ms: float = Field(
+        default=0.0,
+        ge=0,
+        description="Window for joining concurrent Chroma searches (0 disables it)",
+    )
+    memory_dtype: Literal["float32", "float16", "int8"] = Field(
+        default="float32",
+        description="Embedding element type for store_type='memory'",
+    )
+    memory_path: Optional[str] = Field(
+        default=None,
+        description="Snapshot file prefix for store_type='memory' (optional)",
+    )
+    faiss_ann_min_vectors: int = Field(
+        default=50_000,
+        ge=1,
+        description="Vectors needed before store_type='faiss' uses HNSW",
+    )
+    faiss_hnsw_m: int = Field(
+        default=32, ge=2, description="HNSW graph degree for store_type='faiss'"
+    )
+    faiss_ef_search: int = Field(
+        default=50, ge=1, description="HNSW search breadth for store_type='faiss'"
+    )
 
     @model_validator(mode="after")
     def validate_chroma_required(self) -> "VectorStoreConfig":
         """Ensure Chroma config is provided when store_type is chroma."""
         if self.store_type == "chroma" and self.chroma is None:
-            self.chroma = ChromaConfig()
+            self.chroma = get_chroma_config().model_copy()
         return self
 
 
+# The env-backed configs read os.environ and the .env file on every
+# construction, which dominated CacheConfig() creation. The environment is
+# read once per process; call ``.cache_clear()`` on these to re-read it.
+@lru_cache(maxsize=1)
 def get_chroma_config() -> ChromaConfig:
     """Get ChromaDB configuration from environment variables."""
     return ChromaConfig()
 
 
+@lru_cache(maxsize=1)
 def get_redis_config() -> Optional[RedisConfig]:
     """Get Redis configuration from environment variables, or None if not configured."""
     config = RedisConfig()
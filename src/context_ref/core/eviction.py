@@ -0,0 +1,116 @@
+"""Access-tracking helpers for the scan-resistant eviction policies.
+
+``AccessHistory`` backs the ``lru-k`` policy and ``FrequencySketch`` backs the
+``tinylfu`` admission check. Both live in-process next to the ToolCache, so
+with a shared Redis backend each process tracks only the accesses it has seen.
+"""
+
+from __future__ import annotations
+
+import heapq
+import time
+from collections import deque
+from collections.abc import Iterable
+
+
+class AccessHistory:
+    """Keeps the last ``k`` access times of every entry (LRU-K).
+
+    The eviction victim is the entry whose k-th most recent access is oldest.
+    Entries with fewer than ``k`` recorded accesses have an infinite backward
+    k-distance and are evicted first, oldest last access first, so a one-off
+    scan cannot push out entries that were referenced repeatedly.
+    """
+
+    def __init__(self, k: int = 2) -> None:
+        if k < 1:
+            raise ValueError(f"k must be >= 1, got {k}")
+        self.k = k
+        self._history: dict[str, deque[float]] = {}
+
+    def record(self, key: str) -> None:
+        """Record an access to ``key`` at the current monotonic time."""
+        history = self._history.get(key)
+        if history is None:
+            history = self._history[key] = deque(maxlen=self.k)
+        history.append(time.monotonic())
+
+    def forget(self, key: str) -> None:
+        self._history.pop(key, None)
+
+    def clear(self) -> None:
+        self._history.clear()
+
+    def victims(self, keys: Iterable[str], n: int = 1) -> list[str]:
+        """Return the ``n`` keys with the largest backward k-distance."""
+        k = self.k
+        history_of = self._history.get
+
+        def distance(key: str) -> tuple[int, float]:
+            history = history_of(key)
+            if not history:
+                return (0, float("-inf"))
+            if len(history) < k:
+                return (0, history[-1])
+            return (1, history[0])
+
+        return heapq.nsmallest(n, keys, key=distance)
+
+
+class FrequencySketch:
+    """Approximate access frequencies with a 4-bit Count-Min Sketch (TinyLFU).
+
+    Counters saturate at 15. Once ``10 * width`` increments have been recorded
+    every counter is halved, so old popularity fades and the sketch keeps up
+    with shifts in the workload.
+    """
+
+    _DEPTH = 4
+    _MAX_COUNT = 15
+    # One odd 64-bit multiplier per row (multiply-shift hashing)
+    _SEEDS = (
+        0x9E3779B97F4A7C15,
+        0xC2B2AE3D27D4EB4F,
+        0x165667B19E3779F9,
+        0xD6E8FEB86659FD93,
+    )
+    _UINT64 = (1 << 64) - 1
+
+    def __init__(self, width: int) -> None:
+        # Power-of-two width lets the row index be the top bits of a product.
+        self._width = 1 << max(int(width) - 1, 1).bit_length()
+        self._shift = 64 - (self._width.bit_length() - 1)
+        self._rows = [bytearray(self._width) for _ in range(self._DEPTH)]
+        self._additions = 0
+        self._sample_size = 10 * self._width
+
+    def _indexes(self, key: str) -> list[int]:
+        # The top bits of h * seed are well mixed, so each row gets its own
+        # independent-looking index from a single hash() call.
+        h = hash(key) & self._UINT64
+        shift, uint64 = self._shift, self._UINT64
+        return [((h * seed) & uint64) >> shift for seed in self._SEEDS]
+
+    def record(self, key: str) -> None:
+        """Count one access to ``key``."""
+        for row, idx in zip(self._rows, self._indexes(key), strict=True):
+            if row[idx] < self._MAX_COUNT:
+                row[idx] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def estimate(self, key: str) -> int:
+        """Return the estimated access count of ``key``."""
+        indexes = self._indexes(key)
+        return min(row[idx] for row, idx in zip(self._rows, indexes, strict=True))
+
+    def clear(self) -> None:
+        for row in self._rows:
+            row[:] = bytes(self._width)
+        self._additions = 0
+
+    def _age(self) -> None:
+        for row in self._rows:
+            row[:] = bytes(count >> 1 for count in row)
+        self._additions //= 2
@@ -1,10 +1,14 @@
 """Data models for cache entries and results."""
 
-import json
+import time
 import uuid as uuid_lib
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Mapping
+
+from context_ref.core.utils import to_timestamp
+from context_ref.embedding.base import Embedding
+from context_ref.utils.serialization import dumps_json, loads_json
 
 
 def _generate_uuid() -> str:
@@ -12,7 +16,7 @@ def _generate_uuid() -> str:
     return str(uuid_lib.uuid4())
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheEntry:
     """Represents a cached tool call entry.
 
@@ -23,11 +27,13 @@ class CacheEntry:
         input_text: Serialized input arguments
         input_args: Original input arguments dict
         output: Tool call result
-        embedding: Vector embedding of input_text
+        embedding: Vector embedding of input_text, as returned by the
+            embedding function (not part of to_dict; the storage backend
+            keeps it under its own key)
         reuse_count: Times this entry was directly reused (high similarity)
         provide_context_count: Times this entry was provided as context hint
-        created_at: When the entry was first created
-        last_accessed_at: When the entry was last accessed
+        created_at: When the entry was first created (epoch seconds)
+        last_accessed_at: When the entry was last accessed (epoch seconds)
         success: Whether the tool call succeeded
     """
 
@@ -37,13 +43,23 @@ class CacheEntry:
     input_args: dict[str, Any]
     output: Any
     uuid: str = field(default_factory=_generate_uuid)
-    embedding: list[float] | None = None
+    embedding: Embedding | None = None
     reuse_count: int = 0
     provide_context_count: int = 0
-    created_at: datetime = field(default_factory=datetime.now)
-    last_accessed_at: datetime = field(default_factory=datetime.now)
+    created_at: float = field(default_factory=time.time)
+    last_accessed_at: float = field(default_factory=time.time)
     success: bool = True
 
+    @property
+    def created_at_dt(self) -> datetime:
+        """Creation time as a local datetime."""
+        return datetime.fromtimestamp(self.created_at)
+
+    @property
+    def last_accessed_at_dt(self) -> datetime:
+        """Last access time as a local datetime."""
+        return datetime.fromtimestamp(self.last_accessed_at)
+
     @property
     def total_reference_count(self) -> int:
         """Total number of times this entry was referenced."""
@@ -52,12 +68,12 @@ class CacheEntry:
     def increment_reuse(self) -> None:
         """Increment reuse count and update access time."""
         self.reuse_count += 1
-        self.last_accessed_at = datetime.now()
+        self.last_accessed_at = time.time()
 
     def increment_context(self) -> None:
         """Increment provide_context count and update access time."""
         self.provide_context_count += 1
-        self.last_accessed_at = datetime.now()
+        self.last_accessed_at = time.time()
 
     def to_dict(self) -> dict[str, Any]:
         """Serialize entry to dict for JSON storage."""
@@ -68,32 +84,27 @@ class CacheEntry:
             "input_text": self.input_text,
             "input_args": self.input_args,
             "output": self.output,
-            "embedding": self.embedding,
             "reuse_count": self.reuse_count,
             "provide_context_count": self.provide_context_count,
-            "created_at": self.created_at.isoformat(),
-            "last_accessed_at": self.last_accessed_at.isoformat(),
+            "created_at": self.created_at,
+            "last_accessed_at": self.last_accessed_at,
             "success": self.success,
         }
 
     def to_json(self) -> str:
         """Serialize entry to JSON string."""
-        return json.dumps(self.to_dict(), default=str)
+        return dumps_json(self.to_dict())
 
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> "CacheEntry":
-        """Deserialize entry from dict."""
-        created_at = data.get("created_at")
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
-        elif created_at is None:
-            created_at = datetime.now()
-
-        last_accessed_at = data.get("last_accessed_at")
-        if isinstance(last_accessed_at, str):
-            last_accessed_at = datetime.fromisoformat(last_accessed_at)
-        elif last_accessed_at is None:
-            last_accessed_at = datetime.now()
+    def from_dict(cls, data: Mapping[str, Any]) -> "CacheEntry":
+        """Deserialize entry from dict.
+
+        Records written before embeddings moved to their own key may still
+        carry an ``embedding`` field; it is picked up when present.
+        """
+        now = time.time()
+        created_at = to_timestamp(data.get("created_at"), now)
+        last_accessed_at = to_timestamp(data.get("last_accessed_at"), now)
 
         return cls(
             id=data["id"],
@@ -111,23 +122,28 @@ class CacheEntry:
         )
 
     @classmethod
-    def from_json(cls, json_str: str) -> "CacheEntry":
+    def from_json(cls, json_str: str | bytes) -> "CacheEntry":
         """Deserialize entry from JSON string."""
-        return cls.from_dict(json.loads(json_str))
+        return cls.from_dict(loads_json(json_str))
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheHit:
-    """Represents a cache hit with similarity score and weighted score."""
+    """Represents a cache hit with similarity score and weighted score.
+
+    ``reuse_threshold`` is the CacheConfig.reuse_threshold of the cache that
+    produced the hit.
+    """
 
     entry: CacheEntry
     similarity: float
     weighted_score: float
+    reuse_threshold: float = 0.95
 
     @property
     def should_reuse(self) -> bool:
-        """Whether this hit should be directly reused (default threshold 0.95)."""
-        return self.similarity >= 0.95
+        """Whether this hit is similar enough to be directly reused."""
+        return self.similarity >= self.reuse_threshold
 
     def to_dict(self) -> dict[str, Any]:
         """Serialize cache hit to dict."""
@@ -4,16 +4,22 @@
 - RedisStorageBackend: Redis-based storage for production
 - VectorStore: Abstract interface for vector similarity search
 - ChromaVectorStore: ChromaDB vector store implementation
+- MemoryVectorStore: In-process NumPy vector store
+- FaissVectorStore: In-process FAISS vector store with HNSW search
 """
 
 from context_ref.core.storage.memory import MemoryStorageBackend
 from context_ref.core.storage.redis import RedisStorageBackend
 from context_ref.core.storage.vector import VectorStore
 from context_ref.core.storage.chroma import ChromaVectorStore
+from context_ref.core.storage.memory_vector import MemoryVectorStore
+from context_ref.core.storage.faiss_vector import FaissVectorStore
 
 __all__ = [
     "MemoryStorageBackend",
     "RedisStorageBackend",
     "VectorStore",
     "ChromaVectorStore",
+    "MemoryVectorStore",
+    "FaissVectorStore",
 ]
@@ -1,17 +1,143 @@
 """ChromaDB vector store implementation."""
 
-from typing import Any
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any, Callable
 
 import chromadb
+import numpy as np
 from chromadb.api import ClientAPI
 from chromadb.config import Settings
 
 from context_ref.core.config import get_chroma_config
 from context_ref.core.storage.vector import VectorStore
+from context_ref.embedding.base import Embedding
+from context_ref.utils.serialization import dumps_json
+
+_RESULT_KEYS = ("ids", "distances", "metadatas", "documents")
+
+
+class _PendingQuery:
+    __slots__ = ("embedding", "done", "result", "error")
+
+    def __init__(self, embedding: Embedding) -> None:
+        self.embedding = embedding
+        self.done = threading.Event()
+        self.result: dict[str, Any] | None = None
+        self.error: BaseException | None = None
+
+
+class _QueryCoalescer:
+    """Joins concurrent single searches into one multi-query call.
+
+    The first caller for a given (k, filter) becomes the leader: it waits
+    ``window`` seconds for other threads to join, runs one batched query for
+    everybody and hands each caller its own row. Callers with a different
+    k or filter never share a batch.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[Embedding], int, dict[str, Any] | None], Any],
+        window: float,
+    ) -> None:
+        self._run_batch = run_batch
+        self._window = window
+        self._lock = threading.Lock()
+        self._groups: dict[tuple[int, str], list[_PendingQuery]] = {}
+
+    def search(
+        self, embedding: Embedding, k: int, filter: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        group_key = (k, dumps_json(filter) if filter else "")
+        pending = _PendingQuery(embedding)
+        with self._lock:
+            group = self._groups.get(group_key)
+            leader = group is None
+            if group is None:
+                group = self._groups[group_key] = []
+            group.append(pending)
+
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            assert pending.result is not None
+            return pending.result
+
+        time.sleep(self._window)
+        with self._lock:
+            group = self._groups.pop(group_key)
+        try:
+            result = self._run_batch([p.embedding for p in group], k, filter)
+        except BaseException as exc:
+            for member in group:
+                member.error = exc
+                member.done.set()
+            raise
+        for row, member in enumerate(group):
+            member.result = {
+                key: [result[key][row]] if result.get(key) else None
+                for key in _RESULT_KEYS
+            }
+            member.done.set()
+        assert pending.result is not None
+        return pending.result
+
+
+# Clients shared by every store in the process, keyed by (mode, location),
+# with the number of open stores using each.
+_CLIENTS: dict[tuple[Any, ...], tuple[ClientAPI, int]] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _acquire_client(key: tuple[Any, ...]) -> ClientAPI:
+    """Return the shared client for ``key``, creating it on first use."""
+    with _CLIENTS_LOCK:
+        entry = _CLIENTS.get(key)
+        if entry is not None:
+            client, refs = entry
+            _CLIENTS[key] = (client, refs + 1)
+            return client
+
+        settings = Settings(anonymized_telemetry=False)
+        mode = key[0]
+        if mode == "client":
+            client = chromadb.HttpClient(host=key[1], port=key[2], settings=settings)
+        elif mode == "persistent":
+            client = chromadb.PersistentClient(path=key[1], settings=settings)
+        else:
+            client = chromadb.Client(settings=settings)
+        _CLIENTS[key] = (client, 1)
+        return client
+
+
+def _release_client(key: tuple[Any, ...]) -> None:
+    """Drop one reference; the client is forgotten when none are left."""
+    with _CLIENTS_LOCK:
+        entry = _CLIENTS.get(key)
+        if entry is None:
+            return
+        client, refs = entry
+        if refs > 1:
+            _CLIENTS[key] = (client, refs - 1)
+        else:
+            del _CLIENTS[key]
 
 
 class ChromaVectorStore(VectorStore):
-    """ChromaDB vector store for similarity search."""
+    """ChromaDB vector store for similarity search.
+
+    With ``coalesce_window`` > 0, single-query searches made concurrently
+    from several threads within that many seconds are sent to Chroma as one
+    multi-query call. This trades up to one window of latency for far fewer
+    index traversals under load; it is off by default.
+
+    New collections are built with ``hnsw_m`` neighbours per node and the
+    given ``ef_construction``/``ef_search``; existing collections keep the
+    settings they were created with.
+    """
 
     def __init__(
         self,
@@ -20,14 +146,28 @@ class ChromaVectorStore(VectorStore):
         port: int | None = None,
         path: str | None = None,
         mode: str = "ephemeral",
+        coalesce_window: float = 0.0,
+        hnsw_m: int = 24,
+        ef_construction: int = 128,
+        ef_search: int = 100,
     ) -> None:
         self._collection_name = collection_name
         self._host = host
         self._port = port
         self._path = path
         self._mode = mode
+        self._hnsw_m = hnsw_m
+        self._ef_construction = ef_construction
+        self._ef_search = ef_search
         self._client: ClientAPI | None = None
+        self._client_key: tuple[Any, ...] | None = None
         self._collection: chromadb.Collection | None = None
+        self._max_batch_size: int | None = None
+        self._coalescer = (
+            _QueryCoalescer(self._query, coalesce_window)
+            if coalesce_window > 0
+            else None
+        )
     
     def get_client(self) -> ClientAPI:
         self._init_client()
@@ -43,50 +183,100 @@ class ChromaVectorStore(VectorStore):
         if self._client is not None:
             return
 
-        settings = Settings(anonymized_telemetry=False)
-
         if self._mode == "client" and self._host:
-            self._client = chromadb.HttpClient(
-                host=self._host,
-                port=self._port or 8000,
-                settings=settings,
-            )
+            self._client_key = ("client", self._host, self._port or 8000)
         elif self._mode == "persistent" and self._path:
-            self._client = chromadb.PersistentClient(path=self._path, settings=settings)
+            self._client_key = ("persistent", self._path)
         else:
-            self._client = chromadb.Client(settings=settings)
+            self._client_key = ("ephemeral",)
+        self._client = _acquire_client(self._client_key)
 
         self._collection = self._client.get_or_create_collection(
             name=self._collection_name,
-            metadata={"hnsw:space": "cosine"},
+            metadata=self._collection_metadata(),
         )
 
+    def _collection_metadata(self) -> dict[str, Any]:
+        """HNSW settings applied when the collection is created."""
+        return {
+            "hnsw:space": "cosine",
+            "hnsw:M": self._hnsw_m,
+            "hnsw:construction_ef": self._ef_construction,
+            "hnsw:search_ef": self._ef_search,
+        }
+
+    def set_ef_search(self, ef_search: int) -> None:
+        """Change the query-time candidate list size of the live collection.
+
+        Higher values trade latency for recall. Requires chromadb >= 1.0.
+        """
+        self.get_collection().modify(configuration={"hnsw": {"ef_search": ef_search}})
+        self._ef_search = ef_search
+
     def add(
         self,
         ids: list[str],
-        embeddings: list[list[float]],
+        embeddings: Sequence[Embedding] | np.ndarray,
         documents: list[str],
         metadata: list[dict[str, Any]] | None = None,
     ) -> None:
-        self._init_client()
+        """Add entries in as few collection calls as the client allows.
+
+        Embeddings are handed to Chroma as one contiguous float32 array; a
+        caller that already has one (e.g. straight from the encoder) skips
+        the conversion. Inputs larger than the client's maximum batch size
+        are split into chunks of that size instead of being rejected.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
         collection = self.get_collection()
-        collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=metadata,
-        )
+        step = self._get_max_batch_size()
+        for start in range(0, len(ids), step):
+            end = start + step
+            collection.add(
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                documents=documents[start:end],
+                metadatas=metadata[start:end] if metadata is not None else None,
+            )
+
+    def _get_max_batch_size(self) -> int:
+        if self._max_batch_size is None:
+            self._max_batch_size = self.get_client().get_max_batch_size()
+        return self._max_batch_size
 
     def search(
         self,
-        query_embedding: list[float],
+        query_embedding: Embedding,
         k: int = 5,
         filter: dict[str, Any] | None = None,
     ) -> chromadb.QueryResult:
-        self._init_client()
-        collection = self.get_collection()
-        return collection.query(
-            query_embeddings=[query_embedding],
+        if self._coalescer is not None:
+            return self._coalescer.search(query_embedding, k, filter)
+        return self._query([query_embedding], k, filter)
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Embedding] | np.ndarray,
+        k: int = 5,
+        filter: dict[str, Any] | None = None,
+    ) -> chromadb.QueryResult:
+        """Run all query embeddings through a single collection query.
+
+        A single-row batch is what ``ToolCache`` sends for one lookup, so it
+        goes through the coalescer like ``search`` when one is configured.
+        """
+        if self._coalescer is not None and len(query_embeddings) == 1:
+            return self._coalescer.search(query_embeddings[0], k, filter)
+        return self._query(query_embeddings, k, filter)
+
+    def _query(
+        self,
+        query_embeddings: Sequence[Embedding] | np.ndarray,
+        k: int,
+        filter: dict[str, Any] | None,
+    ) -> chromadb.QueryResult:
+        return self.get_collection().query(
+            query_embeddings=np.asarray(query_embeddings, dtype=np.float32),
             n_results=k,
             where=filter,
             include=["distances", "metadatas", "documents"],
@@ -101,12 +291,16 @@ class ChromaVectorStore(VectorStore):
         c.delete_collection(self._collection_name)
         self._collection = c.create_collection(
             name=self._collection_name,
-            metadata={"hnsw:space": "cosine"},
+            metadata=self._collection_metadata(),
         )
 
     def close(self) -> None:
+        if self._client_key is not None:
+            _release_client(self._client_key)
+            self._client_key = None
         self._client = None
         self._collection = None
+        self._max_batch_size = None
 
     @classmethod
     def from_env(cls) -> "ChromaVectorStore":
@@ -117,7 +311,21 @@ class ChromaVectorStore(VectorStore):
                 host=config.host or "localhost",
                 port=config.port or 8000,
                 mode="client",
+                hnsw_m=config.hnsw_m,
+                ef_construction=config.hnsw_ef_construction,
+                ef_search=config.hnsw_ef_search,
             )
         if config.is_persistent_mode():
-            return cls(path=config.path, mode="persistent")
-        return cls(mode="ephemeral")
+            return cls(
+                path=config.path,
+                mode="persistent",
+                hnsw_m=config.hnsw_m,
+                ef_construction=config.hnsw_ef_construction,
+                ef_search=config.hnsw_ef_search,
+            )
+        return cls(
+            mode="ephemeral",
+            hnsw_m=config.hnsw_m,
+            ef_construction=config.hnsw_ef_construction,
+            ef_search=config.hnsw_ef_search,
+        )
@@ -1,6 +1,6 @@
 """Factory functions for creating storage and vector store instances from config."""
 
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Any, Union
 
 if TYPE_CHECKING:
     from context_ref.core.config import StorageBackendConfig, VectorStoreConfig
@@ -53,36 +53,47 @@ def create_vector_store(config: "VectorStoreConfig") -> "VectorStore":
         config: Vector store configuration
 
     Returns:
-        Vector store instance (ChromaVectorStore or in-memory fallback)
+        Vector store instance (ChromaVectorStore, MemoryVectorStore or
+        FaissVectorStore)
     """
     if config.store_type == "chroma":
         from context_ref.core.storage.chroma import ChromaVectorStore
 
         chroma_config = config.chroma
+        options: dict[str, Any] = {
+            "collection_name": config.collection_name,
+            "coalesce_window": config.coalesce_window_ms / 1000,
+        }
         if chroma_config is None:
-            return ChromaVectorStore(collection_name=config.collection_name)
+            return ChromaVectorStore(**options)
 
+        options.update(
+            hnsw_m=chroma_config.hnsw_m,
+            ef_construction=chroma_config.hnsw_ef_construction,
+            ef_search=chroma_config.hnsw_ef_search,
+        )
         if chroma_config.is_client_mode():
             return ChromaVectorStore(
-                collection_name=config.collection_name,
                 host=chroma_config.host or "localhost",
                 port=chroma_config.port or 8000,
                 mode="client",
+                **options,
             )
         elif chroma_config.is_persistent_mode():
             return ChromaVectorStore(
-                collection_name=config.collection_name,
-                path=chroma_config.path,
-                mode="persistent",
+                path=chroma_config.path, mode="persistent", **options
             )
         else:
-            return ChromaVectorStore(
-                collection_name=config.collection_name, mode="ephemeral"
-            )
+            return ChromaVectorStore(mode="ephemeral", **options)
+    elif config.store_type == "faiss":
+        from context_ref.core.storage.faiss_vector import FaissVectorStore
+
+        return FaissVectorStore(
+            hnsw_m=config.faiss_hnsw_m,
+            ef_search=config.faiss_ef_search,
+            ann_min_vectors=config.faiss_ann_min_vectors,
+        )
     else:
-        # Memory vector store - use ChromaVectorStore in ephemeral mode as fallback
-        from context_ref.core.storage.chroma import ChromaVectorStore
+        from context_ref.core.storage.memory_vector import MemoryVectorStore
 
-        return ChromaVectorStore(
-            collection_name=config.collection_name, mode="ephemeral"
-        )
+        return MemoryVectorStore(dtype=config.memory_dtype, path=config.memory_path)
@@ -0,0 +1,257 @@
+"""FAISS vector store implementation.
+
+In-process cosine search backed by FAISS, with an HNSW graph once the store
+is large enough for approximate search to beat an exact scan. Requires the
+``faiss`` extra (``faiss-cpu``).
+"""
+
+import itertools
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from context_ref.core.storage.vector import VectorStore
+from context_ref.embedding.base import Embedding
+
+
+class FaissVectorStore(VectorStore):
+    """Vector store on FAISS inner-product indexes.
+
+    Vectors are L2-normalized on insert and query, so inner product is
+    cosine similarity. Every vector lives in an exact ``IndexFlatIP``; once
+    the store holds ``ann_min_vectors`` vectors an ``IndexHNSWFlat`` graph is
+    built next to it and used for searches that select at least that many
+    vectors. Smaller selections (e.g. a rarely used tool) are scanned
+    exactly, since a filtered graph walk loses recall when few nodes match.
+
+    FAISS HNSW can't remove vectors, so deletes leave tombstones in the
+    graph; they are skipped at search time and the graph is rebuilt from
+    the exact index once they exceed a quarter of the live vectors.
+
+    Filters support equality on metadata fields (e.g. ``{"tool_name": "x"}``)
+    and are applied inside FAISS through an ID selector.
+    """
+
+    # At 384 dims an exact scan of 10k vectors is as fast as the graph walk
+    # (~0.5 ms) and costs nothing to build; HNSW only wins well past that.
+    ANN_MIN_VECTORS = 50_000
+
+    def __init__(
+        self,
+        hnsw_m: int = 32,
+        ef_construction: int = 40,
+        ef_search: int = 50,
+        ann_min_vectors: int = ANN_MIN_VECTORS,
+    ) -> None:
+        import faiss
+
+        self._faiss = faiss
+        self._hnsw_m = hnsw_m
+        self._ef_construction = ef_construction
+        self._ef_search = ef_search
+        self._ann_min_vectors = ann_min_vectors
+        self._lock = threading.RLock()
+        self._dim: int | None = None
+        self._flat: Any = None
+        self._hnsw: Any = None
+        self._tombstones = 0
+        # FAISS ids are int64 labels; an updated entry gets a fresh label
+        self._next_label = itertools.count()
+        self._labels: dict[str, int] = {}
+        self._entries: dict[int, tuple[str, str, dict[str, Any]]] = {}
+        # metadata field -> value -> labels, for building filter selectors
+        self._postings: dict[str, dict[Any, set[int]]] = {}
+
+    def _normalized(self, embeddings: Any) -> np.ndarray:
+        vectors = np.array(embeddings, dtype=np.float32, ndmin=2)
+        self._faiss.normalize_L2(vectors)
+        return vectors
+
+    def _new_hnsw(self) -> Any:
+        assert self._dim is not None
+        faiss = self._faiss
+        graph = faiss.IndexHNSWFlat(self._dim, self._hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        graph.hnsw.efConstruction = self._ef_construction
+        return faiss.IndexIDMap(graph)
+
+    def _rebuild_hnsw(self) -> None:
+        """Rebuild the graph from the exact index, dropping tombstones."""
+        self._hnsw = self._new_hnsw()
+        if self._flat.ntotal:
+            vectors = self._flat.index.reconstruct_n(0, self._flat.ntotal)
+            labels = self._faiss.vector_to_array(self._flat.id_map)
+            self._hnsw.add_with_ids(vectors, labels)
+        self._tombstones = 0
+
+    def _unindex(self, label: int) -> None:
+        _, _, meta = self._entries.pop(label)
+        for field, value in meta.items():
+            postings = self._postings[field][value]
+            postings.discard(label)
+            if not postings:
+                del self._postings[field][value]
+
+    def add(
+        self,
+        ids: list[str],
+        embeddings: Sequence[Embedding] | np.ndarray,
+        documents: list[str],
+        metadata: list[dict[str, Any]] | None = None,
+    ) -> None:
+        if not ids:
+            return
+        # A repeated id within the batch keeps its last row
+        rows = list({entry_id: row for row, entry_id in enumerate(ids)}.values())
+        vectors = self._normalized(embeddings)[rows]
+        metadatas = metadata or [{} for _ in ids]
+
+        with self._lock:
+            if self._dim is None:
+                self._dim = vectors.shape[1]
+                self._flat = self._faiss.IndexIDMap2(
+                    self._faiss.IndexFlatIP(self._dim)
+                )
+            elif vectors.shape[1] != self._dim:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match store "
+                    f"dimension {self._dim}"
+                )
+            stale = [self._labels[ids[row]] for row in rows if ids[row] in self._labels]
+            if stale:
+                self._remove_labels(stale)
+
+            labels = np.fromiter(
+                (next(self._next_label) for _ in rows), dtype=np.int64, count=len(rows)
+            )
+            for row, label in zip(rows, labels.tolist(), strict=True):
+                entry_id, meta = ids[row], metadatas[row]
+                self._labels[entry_id] = label
+                self._entries[label] = (entry_id, documents[row], meta)
+                for field, value in meta.items():
+                    self._postings.setdefault(field, {}).setdefault(
+                        value, set()
+                    ).add(label)
+            self._flat.add_with_ids(vectors, labels)
+
+            if self._hnsw is not None:
+                self._hnsw.add_with_ids(vectors, labels)
+            elif self._flat.ntotal >= self._ann_min_vectors:
+                self._rebuild_hnsw()
+
+    def _selected_labels(self, filter: dict[str, Any]) -> np.ndarray:
+        selected: set[int] | None = None
+        for field, value in filter.items():
+            if field.startswith("$") or isinstance(value, dict):
+                raise ValueError(
+                    f"FaissVectorStore only supports equality filters, got {field!r}"
+                )
+            postings = self._postings.get(field, {}).get(value, set())
+            selected = postings if selected is None else selected & postings
+            if not selected:
+                break
+        return np.fromiter(selected or (), dtype=np.int64)
+
+    def search(
+        self,
+        query_embedding: Embedding,
+        k: int = 5,
+        filter: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        return self.search_batch([query_embedding], k=k, filter=filter)
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Embedding] | np.ndarray,
+        k: int = 5,
+        filter: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Search all queries in one FAISS call sharing the filter selector."""
+        result: dict[str, Any] = {
+            "ids": [],
+            "distances": [],
+            "metadatas": [],
+            "documents": [],
+        }
+        if len(query_embeddings) == 0:
+            return result
+        queries = self._normalized(query_embeddings)
+        faiss = self._faiss
+
+        with self._lock:
+            if self._flat is None or not self._entries:
+                hits = np.full((len(queries), 0), -1, dtype=np.int64)
+                sims = np.empty((len(queries), 0), dtype=np.float32)
+            else:
+                selector = None
+                selected = len(self._entries)
+                if filter:
+                    labels = self._selected_labels(filter)
+                    selected = len(labels)
+                    selector = faiss.IDSelectorBatch(labels)
+                top = min(k, selected)
+                if top == 0:
+                    hits = np.full((len(queries), 0), -1, dtype=np.int64)
+                    sims = np.empty((len(queries), 0), dtype=np.float32)
+                elif self._hnsw is not None and selected >= self._ann_min_vectors:
+                    # Without a filter, over-fetch past any tombstones
+                    fetch = top if selector is not None else top + self._tombstones
+                    params = faiss.SearchParametersHNSW(efSearch=self._ef_search)
+                    if selector is not None:
+                        params.sel = selector
+                    sims, hits = self._hnsw.search(
+                        queries, min(fetch, self._hnsw.ntotal), params=params
+                    )
+                else:
+                    params = (
+                        faiss.SearchParameters(sel=selector)
+                        if selector is not None
+                        else None
+                    )
+                    sims, hits = self._flat.search(queries, top, params=params)
+
+            per_query = zip(hits.tolist(), sims.tolist(), strict=True)
+            for query_hits, query_sims in per_query:
+                picked = [
+                    (self._entries[label], sim)
+                    for label, sim in zip(query_hits, query_sims, strict=True)
+                    if label in self._entries
+                ][:k]
+                result["ids"].append([entry[0] for entry, _ in picked])
+                result["distances"].append([1.0 - sim for _, sim in picked])
+                result["metadatas"].append([entry[2] for entry, _ in picked])
+                result["documents"].append([entry[1] for entry, _ in picked])
+        return result
+
+    def _remove_labels(self, labels: list[int]) -> None:
+        for label in labels:
+            self._unindex(label)
+        self._flat.remove_ids(np.asarray(labels, dtype=np.int64))
+        if self._hnsw is not None:
+            self._tombstones += len(labels)
+            if self._tombstones * 4 > len(self._entries):
+                self._rebuild_hnsw()
+
+    def delete(self, ids: list[str]) -> None:
+        with self._lock:
+            labels = [
+                label
+                for entry_id in ids
+                if (label := self._labels.pop(entry_id, None)) is not None
+            ]
+            if labels:
+                self._remove_labels(labels)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dim = None
+            self._flat = None
+            self._hnsw = None
+            self._tombstones = 0
+            self._labels.clear()
+            self._entries.clear()
+            self._postings.clear()
+
+    def close(self) -> None:
+        pass
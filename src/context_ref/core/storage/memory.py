@@ -3,8 +3,17 @@
 Simplified implementation for development and testing.
 """
 
-from datetime import datetime
-from typing import Any, Iterator
+import heapq
+import itertools
+import time
+from collections import Counter
+from types import MappingProxyType
+from typing import Any, Callable, Iterator, Mapping, Sequence
+
+from context_ref.core.utils import apply_access_and_score, to_timestamp
+
+# Stored as epoch floats so eviction scans compare them without parsing
+_TIMESTAMP_FIELDS = ("created_at", "last_accessed_at")
 
 
 class MemoryStorageBackend:
@@ -12,65 +21,195 @@ class MemoryStorageBackend:
 
     Thread-safe implementation for local caching.
     For production, use RedisStorageBackend.
+
+    ``get`` and ``get_many`` return read-only live views of the stored
+    entries instead of copies; use ``dict(entry)`` for a mutable snapshot.
     """
 
     def __init__(self) -> None:
         import threading
 
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
         self._data: dict[str, dict[str, Any]] = {}
         self._scores: dict[str, float] = {}
+        # Min-heap of (score, seq, key) for eviction. Rescoring pushes a new
+        # item instead of searching the heap; _score_seqs holds each key's
+        # current seq so superseded items are skipped when they surface.
+        self._score_heap: list[tuple[float, int, str]] = []
+        self._score_seqs: dict[str, int] = {}
+        self._next_seq = itertools.count()
+        self._embeddings: dict[str, bytes] = {}
+        # Rolling aggregates so stats() never has to scan every entry.
+        self._total_reuse = 0
+        self._total_context = 0
+        self._ref_totals: Counter[int] = Counter()
+
+    def _set_score(self, key: str, score: float) -> None:
+        seq = next(self._next_seq)
+        self._scores[key] = score
+        self._score_seqs[key] = seq
+        heapq.heappush(self._score_heap, (score, seq, key))
+        if len(self._score_heap) > 2 * len(self._scores) + 64:
+            self._score_heap = [
+                (score, self._score_seqs[key], key)
+                for key, score in self._scores.items()
+            ]
+            heapq.heapify(self._score_heap)
+
+    def _add_aggregates(self, entry: dict[str, Any]) -> None:
+        reuse = entry.get("reuse_count", 0)
+        context = entry.get("provide_context_count", 0)
+        self._total_reuse += reuse
+        self._total_context += context
+        self._ref_totals[reuse + context] += 1
 
-    def get(self, key: str) -> dict[str, Any] | None:
+    def _remove_aggregates(self, entry: dict[str, Any]) -> None:
+        reuse = entry.get("reuse_count", 0)
+        context = entry.get("provide_context_count", 0)
+        self._total_reuse -= reuse
+        self._total_context -= context
+        refs = reuse + context
+        self._ref_totals[refs] -= 1
+        if not self._ref_totals[refs]:
+            del self._ref_totals[refs]
+
+    def get(self, key: str) -> Mapping[str, Any] | None:
+        entry = self._data.get(key)
+        return MappingProxyType(entry) if entry is not None else None
+
+    def set(
+        self,
+        key: str,
+        value: dict[str, Any],
+        score: float = 0.0,
+        embedding: bytes | None = None,
+    ) -> None:
         with self._lock:
-            entry = self._data.get(key)
-            return entry.copy() if entry else None
+            self._put(key, value, score)
+            if embedding is not None:
+                self._embeddings[key] = embedding
+
+    def _put(self, key: str, value: dict[str, Any], score: float) -> None:
+        """Store an entry and its score; the caller holds the lock."""
+        old = self._data.get(key)
+        if old is not None:
+            self._remove_aggregates(old)
+        stored = value.copy()
+        for field in _TIMESTAMP_FIELDS:
+            if stored.get(field) is not None:
+                stored[field] = to_timestamp(stored[field], 0.0)
+        self._data[key] = stored
+        self._set_score(key, score)
+        self._add_aggregates(value)
+
+    def get_many(self, keys: Sequence[str]) -> list[Mapping[str, Any] | None]:
+        data = self._data
+        return [
+            MappingProxyType(entry) if (entry := data.get(key)) is not None else None
+            for key in keys
+        ]
 
-    def set(self, key: str, value: dict[str, Any], score: float = 0.0) -> None:
+    def set_many(
+        self,
+        items: Sequence[tuple[str, dict[str, Any], float]],
+        embeddings: Mapping[str, bytes] | None = None,
+    ) -> None:
+        """Write several (key, value, score) entries and their embeddings."""
         with self._lock:
-            self._data[key] = value.copy()
-            self._scores[key] = score
+            for key, value, score in items:
+                self._put(key, value, score)
+            if embeddings:
+                self._embeddings.update(embeddings)
 
     def delete(self, key: str) -> bool:
         with self._lock:
-            deleted = self._data.pop(key, None) is not None
-            self._scores.pop(key, None)
-            return deleted
+            return self._remove(key)
+
+    def _remove(self, key: str) -> bool:
+        """Drop an entry and everything keyed by it; the caller holds the lock."""
+        entry = self._data.pop(key, None)
+        self._scores.pop(key, None)
+        self._score_seqs.pop(key, None)
+        self._embeddings.pop(key, None)
+        if entry is None:
+            return False
+        self._remove_aggregates(entry)
+        return True
+
+    def set_embedding(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._embeddings[key] = data
+
+    def get_embedding(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._embeddings.get(key)
+
+    def delete_many(self, keys: Sequence[str]) -> int:
+        """Delete several entries; returns how many existed."""
+        with self._lock:
+            return sum(self._remove(key) for key in keys)
 
     def exists(self, key: str) -> bool:
         with self._lock:
             return key in self._data
 
     def keys(self) -> Iterator[str]:
+        # Snapshot under the lock but yield outside it, so callers can
+        # modify the backend while iterating.
         with self._lock:
-            yield from list(self._data.keys())
+            keys = list(self._data)
+        yield from keys
 
     def clear(self) -> None:
         with self._lock:
             self._data.clear()
             self._scores.clear()
+            self._score_heap.clear()
+            self._score_seqs.clear()
+            self._embeddings.clear()
+            self._total_reuse = 0
+            self._total_context = 0
+            self._ref_totals.clear()
 
     def size(self) -> int:
         with self._lock:
             return len(self._data)
 
+    def aggregate_stats(self) -> dict[str, int]:
+        """Return entry count, counter totals and the largest reference count."""
+        with self._lock:
+            return {
+                "total_entries": len(self._data),
+                "total_reuse_count": self._total_reuse,
+                "total_context_count": self._total_context,
+                "max_reference_count": max(self._ref_totals, default=0),
+            }
+
     def update_score(self, key: str, score: float) -> bool:
         with self._lock:
             if key not in self._data:
                 return False
-            self._scores[key] = score
+            self._set_score(key, score)
             return True
 
     def get_score(self, key: str) -> float | None:
         with self._lock:
             return self._scores.get(key)
 
+    def get_counts(self, key: str) -> tuple[int, int] | None:
+        """Return (reuse_count, provide_context_count) without copying the entry."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            return entry.get("reuse_count", 0), entry.get("provide_context_count", 0)
+
     def update_access_time(self, key: str) -> bool:
         with self._lock:
             entry = self._data.get(key)
             if entry is None:
                 return False
-            entry["last_accessed_at"] = datetime.now()
+            entry["last_accessed_at"] = time.time()
             return True
 
     def increment_reuse(self, key: str) -> bool:
@@ -78,8 +217,10 @@ class MemoryStorageBackend:
             entry = self._data.get(key)
             if entry is None:
                 return False
+            self._remove_aggregates(entry)
             entry["reuse_count"] = entry.get("reuse_count", 0) + 1
-            entry["last_accessed_at"] = datetime.now()
+            self._add_aggregates(entry)
+            entry["last_accessed_at"] = time.time()
             return True
 
     def increment_context(self, key: str) -> bool:
@@ -87,10 +228,60 @@ class MemoryStorageBackend:
             entry = self._data.get(key)
             if entry is None:
                 return False
+            self._remove_aggregates(entry)
             entry["provide_context_count"] = entry.get("provide_context_count", 0) + 1
-            entry["last_accessed_at"] = datetime.now()
+            self._add_aggregates(entry)
+            entry["last_accessed_at"] = time.time()
             return True
 
+    def increment_and_rescore(
+        self,
+        key: str,
+        kind: str,
+        reuse_context_factor: float = 0.6,
+        time_decay_lambda: float = 0.01,
+    ) -> float | None:
+        """Bump a counter (or just the access time) and update the score.
+
+        Returns:
+            The new score, or None if the key doesn't exist.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._remove_aggregates(entry)
+            score = apply_access_and_score(
+                entry, kind, reuse_context_factor, time_decay_lambda
+            )
+            self._add_aggregates(entry)
+            self._set_score(key, score)
+            return score
+
+    def increment_and_rescore_many(
+        self,
+        keys: Sequence[str],
+        kind: str,
+        reuse_context_factor: float = 0.6,
+        time_decay_lambda: float = 0.01,
+    ) -> list[float | None]:
+        """increment_and_rescore for several keys under one lock acquisition."""
+        scores: list[float | None] = []
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    scores.append(None)
+                    continue
+                self._remove_aggregates(entry)
+                score = apply_access_and_score(
+                    entry, kind, reuse_context_factor, time_decay_lambda
+                )
+                self._add_aggregates(entry)
+                self._set_score(key, score)
+                scores.append(score)
+        return scores
+
     def decrement_reference(self, key: str) -> bool:
         with self._lock:
             entry = self._data.get(key)
@@ -98,51 +289,67 @@ class MemoryStorageBackend:
                 return False
             reuse = entry.get("reuse_count", 0)
             context = entry.get("provide_context_count", 0)
+            self._remove_aggregates(entry)
             if reuse > 0:
                 entry["reuse_count"] = reuse - 1
             elif context > 0:
                 entry["provide_context_count"] = context - 1
+            self._add_aggregates(entry)
             return True
 
     def get_bottom_by_score(self, n: int = 1) -> list[str]:
         """Get keys with lowest scores (for eviction)."""
         with self._lock:
-            sorted_items = sorted(self._scores.items(), key=lambda x: x[1])
-            return [k for k, _ in sorted_items[:n]]
+            bottom = self._pop_score_items(n)
+            for item in bottom:
+                heapq.heappush(self._score_heap, item)
+            return [key for _, _, key in bottom]
+
+    def _pop_score_items(self, n: int) -> list[tuple[float, int, str]]:
+        """Pop the n lowest live heap items, discarding superseded ones."""
+        heap = self._score_heap
+        seqs = self._score_seqs
+        items: list[tuple[float, int, str]] = []
+        while heap and len(items) < n:
+            item = heapq.heappop(heap)
+            if seqs.get(item[2]) == item[1]:
+                items.append(item)
+        return items
+
+    def pop_bottom_by_score(self, n: int = 1) -> list[str]:
+        """Atomically remove and return the n lowest-scored keys."""
+        with self._lock:
+            keys = [key for _, _, key in self._pop_score_items(n)]
+            for key in keys:
+                self._remove(key)
+            return keys
+
+    def _smallest_by(
+        self, n: int, rank: Callable[[dict[str, Any]], float]
+    ) -> list[str]:
+        """Return the n keys whose entries have the lowest ``rank``.
+
+        Ties go to the smaller key, the same order as a Redis ZSET index.
+        """
+        with self._lock:
+            entries = ((rank(entry), key) for key, entry in self._data.items())
+            return [key for _, key in heapq.nsmallest(n, entries)]
 
     def get_oldest_by_access(self, n: int = 1) -> list[str]:
         """Get keys by oldest access time (LRU eviction)."""
-        with self._lock:
-            items = []
-            for key, entry in self._data.items():
-                last = entry.get("last_accessed_at", datetime.min)
-                if isinstance(last, str):
-                    last = datetime.fromisoformat(last)
-                items.append((key, last))
-            items.sort(key=lambda x: x[1])
-            return [k for k, _ in items[:n]]
+        return self._smallest_by(n, lambda entry: entry.get("last_accessed_at", 0.0))
 
     def get_least_used(self, n: int = 1) -> list[str]:
         """Get keys by lowest reference count (LFU eviction)."""
-        with self._lock:
-            items = []
-            for key, entry in self._data.items():
-                total = entry.get("reuse_count", 0) + entry.get("provide_context_count", 0)
-                items.append((key, total))
-            items.sort(key=lambda x: x[1])
-            return [k for k, _ in items[:n]]
+        return self._smallest_by(
+            n,
+            lambda entry: entry.get("reuse_count", 0)
+            + entry.get("provide_context_count", 0),
+        )
 
     def get_oldest_by_creation(self, n: int = 1) -> list[str]:
         """Get keys by creation time (FIFO eviction)."""
-        with self._lock:
-            items = []
-            for key, entry in self._data.items():
-                created = entry.get("created_at", datetime.min)
-                if isinstance(created, str):
-                    created = datetime.fromisoformat(created)
-                items.append((key, created))
-            items.sort(key=lambda x: x[1])
-            return [k for k, _ in items[:n]]
+        return self._smallest_by(n, lambda entry: entry.get("created_at", 0.0))
 
     def close(self) -> None:
         pass
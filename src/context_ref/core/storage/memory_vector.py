@@ -0,0 +1,335 @@
+"""In-memory vector store implementation.
+
+Exact cosine search over a contiguous NumPy matrix, for development, tests
+and single-process deployments that don't need a Chroma server.
+"""
+
+import os
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+
+from context_ref.core.storage.vector import VectorStore
+from context_ref.embedding.base import Embedding
+from context_ref.utils.serialization import dumps_json, loads_json
+
+
+class MemoryVectorStore(VectorStore):
+    """Vector store keeping all embeddings in one (N, D) float32 array.
+
+    Rows are L2-normalized on insert, so cosine similarity for every stored
+    vector is a single matrix product with the normalized query. Deleting a
+    row moves the last row into the hole, keeping the live rows contiguous.
+
+    Filters support equality on metadata fields (e.g. ``{"tool_name": "x"}``).
+    Each filtered field is kept as an int32 code column so the row mask is a
+    vectorized comparison too.
+
+    With ``dtype="float16"`` the matrix takes half the memory. With
+    ``dtype="int8"`` it takes a quarter: each row is scaled so its largest
+    component maps to 127 and the per-row scales are kept in a separate
+    float32 vector. Searches upcast either kind block by block, so they
+    still multiply in float32 and never hold a full float32 copy.
+
+    With ``path`` the store is loaded from ``<path>.npy`` (the matrix as one
+    contiguous array) and ``<path>.meta.json`` (ids, documents, metadata)
+    if they exist, and written back there on ``close()``. Loading is a
+    single array read instead of one database row per vector, which suits
+    a persistent storage backend (Redis) next to an in-process index.
+    """
+
+    _INITIAL_CAPACITY = 64
+    # Rows upcast at a time when searching a float16 matrix
+    _SEARCH_BLOCK = 4096
+
+    def __init__(
+        self,
+        dtype: Literal["float32", "float16", "int8"] = "float32",
+        path: str | None = None,
+    ) -> None:
+        self._lock = threading.RLock()
+        self._path = path
+        self._dtype = np.dtype(dtype)
+        self._vectors: np.ndarray | None = None
+        # Per-row dequantization scales, only for an int8 matrix
+        self._scales: np.ndarray | None = None
+        self._size = 0
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._documents: list[str] = []
+        self._metadatas: list[dict[str, Any]] = []
+        # metadata field -> value -> code, and field -> per-row code column
+        self._codes: dict[str, dict[Any, int]] = {}
+        self._columns: dict[str, np.ndarray] = {}
+        if path is not None and Path(f"{path}.meta.json").exists():
+            self.load(path)
+
+    def _reserve(self, dim: int, extra: int) -> None:
+        if self._vectors is None:
+            capacity = max(self._INITIAL_CAPACITY, extra)
+            self._vectors = np.zeros((capacity, dim), dtype=self._dtype)
+            if self._dtype == np.int8:
+                self._scales = np.zeros(capacity, dtype=np.float32)
+            return
+        if self._vectors.shape[1] != dim:
+            raise ValueError(
+                f"Embedding dimension {dim} does not match store dimension "
+                f"{self._vectors.shape[1]}"
+            )
+        needed = self._size + extra
+        capacity = len(self._vectors)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        grown = np.zeros((capacity, dim), dtype=self._dtype)
+        grown[: self._size] = self._vectors[: self._size]
+        self._vectors = grown
+        if self._scales is not None:
+            scales = np.zeros(capacity, dtype=np.float32)
+            scales[: self._size] = self._scales[: self._size]
+            self._scales = scales
+        for field, column in self._columns.items():
+            self._columns[field] = self._grow_column(column, capacity)
+
+    @staticmethod
+    def _grow_column(column: np.ndarray, capacity: int) -> np.ndarray:
+        grown = np.full(capacity, -1, dtype=np.int32)
+        grown[: len(column)] = column
+        return grown
+
+    def _column(self, field: str) -> np.ndarray:
+        column = self._columns.get(field)
+        if column is None:
+            assert self._vectors is not None
+            column = np.full(len(self._vectors), -1, dtype=np.int32)
+            self._columns[field] = column
+            self._codes[field] = {}
+        return column
+
+    def _set_metadata(self, row: int, metadata: dict[str, Any]) -> None:
+        for column in self._columns.values():
+            column[row] = -1
+        for field, value in metadata.items():
+            column = self._column(field)
+            codes = self._codes[field]
+            column[row] = codes.setdefault(value, len(codes))
+
+    def add(
+        self,
+        ids: list[str],
+        embeddings: Sequence[Embedding] | np.ndarray,
+        documents: list[str],
+        metadata: list[dict[str, Any]] | None = None,
+    ) -> None:
+        if not ids:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        scales = None
+        if self._dtype == np.int8:
+            scales = np.abs(vectors).max(axis=1) / 127
+            scales[scales == 0] = 1.0
+            vectors = np.rint(vectors / scales[:, None])
+        metadatas = metadata or [{} for _ in ids]
+
+        with self._lock:
+            self._reserve(vectors.shape[1], len(ids))
+            assert self._vectors is not None
+            for i, (entry_id, vector, document, meta) in enumerate(
+                zip(ids, vectors, documents, metadatas, strict=True)
+            ):
+                row = self._rows.get(entry_id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._rows[entry_id] = row
+                    self._ids.append(entry_id)
+                    self._documents.append(document)
+                    self._metadatas.append(meta)
+                else:
+                    self._documents[row] = document
+                    self._metadatas[row] = meta
+                self._vectors[row] = vector
+                if scales is not None:
+                    assert self._scales is not None
+                    self._scales[row] = scales[i]
+                self._set_metadata(row, meta)
+
+    def _mask(self, filter: dict[str, Any] | None) -> np.ndarray | None:
+        """Return a boolean row mask for ``filter``, or None for all rows."""
+        if not filter:
+            return None
+        mask = np.ones(self._size, dtype=bool)
+        for field, value in filter.items():
+            if field.startswith("$") or isinstance(value, dict):
+                raise ValueError(
+                    f"MemoryVectorStore only supports equality filters, got {field!r}"
+                )
+            code = self._codes.get(field, {}).get(value)
+            if code is None:
+                return np.zeros(self._size, dtype=bool)
+            mask &= self._columns[field][: self._size] == code
+        return mask
+
+    def search(
+        self,
+        query_embedding: Embedding,
+        k: int = 5,
+        filter: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        return self.search_batch([query_embedding], k=k, filter=filter)
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Embedding] | np.ndarray,
+        k: int = 5,
+        filter: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Score all queries against the (filtered) matrix in one product."""
+        result: dict[str, Any] = {
+            "ids": [],
+            "distances": [],
+            "metadatas": [],
+            "documents": [],
+        }
+        if len(query_embeddings) == 0:
+            return result
+
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = np.divide(queries, norms, out=np.zeros_like(queries), where=norms > 0)
+
+        with self._lock:
+            if self._vectors is None or self._size == 0:
+                rows = np.empty(0, dtype=np.intp)
+                sims = np.empty((len(queries), 0), dtype=np.float32)
+            else:
+                mask = self._mask(filter)
+                selected: slice | np.ndarray
+                if mask is None:
+                    rows = np.arange(self._size)
+                    selected = slice(0, self._size)
+                else:
+                    rows = np.flatnonzero(mask)
+                    selected = rows
+                sims = self._similarities(
+                    queries,
+                    self._vectors[selected],
+                    None if self._scales is None else self._scales[selected],
+                )
+
+            n = len(rows)
+            top = min(k, n)
+            for query_sims in sims:
+                if top == 0:
+                    best = np.empty(0, dtype=np.intp)
+                elif top < n:
+                    best = np.argpartition(-query_sims, top - 1)[:top]
+                    best = best[np.argsort(-query_sims[best], kind="stable")]
+                else:
+                    best = np.argsort(-query_sims, kind="stable")
+                picked = rows[best]
+                result["ids"].append([self._ids[row] for row in picked])
+                result["distances"].append((1.0 - query_sims[best]).tolist())
+                result["metadatas"].append([self._metadatas[row] for row in picked])
+                result["documents"].append([self._documents[row] for row in picked])
+        return result
+
+    def _similarities(
+        self, queries: np.ndarray, matrix: np.ndarray, scales: np.ndarray | None
+    ) -> np.ndarray:
+        if matrix.dtype == np.float32:
+            return np.asarray(queries @ matrix.T, dtype=np.float32)
+        sims = np.empty((len(queries), len(matrix)), dtype=np.float32)
+        for start in range(0, len(matrix), self._SEARCH_BLOCK):
+            block = matrix[start : start + self._SEARCH_BLOCK].astype(np.float32)
+            np.matmul(queries, block.T, out=sims[:, start : start + len(block)])
+        if scales is not None:
+            sims *= scales
+        return sims
+
+    def delete(self, ids: list[str]) -> None:
+        with self._lock:
+            for entry_id in ids:
+                row = self._rows.pop(entry_id, None)
+                if row is None:
+                    continue
+                last = self._size - 1
+                if row != last:
+                    # Move the last row into the hole
+                    assert self._vectors is not None
+                    self._vectors[row] = self._vectors[last]
+                    if self._scales is not None:
+                        self._scales[row] = self._scales[last]
+                    for column in self._columns.values():
+                        column[row] = column[last]
+                    moved_id = self._ids[last]
+                    self._ids[row] = moved_id
+                    self._documents[row] = self._documents[last]
+                    self._metadatas[row] = self._metadatas[last]
+                    self._rows[moved_id] = row
+                self._ids.pop()
+                self._documents.pop()
+                self._metadatas.pop()
+                self._size = last
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors = None
+            self._scales = None
+            self._size = 0
+            self._ids.clear()
+            self._rows.clear()
+            self._documents.clear()
+            self._metadatas.clear()
+            self._codes.clear()
+            self._columns.clear()
+
+    def save(self, path: str | None = None) -> None:
+        """Write the store to ``<path>.npy`` and ``<path>.meta.json``.
+
+        Both files are written under temporary names and then renamed, so
+        a crash mid-save leaves the previous snapshot intact.
+        """
+        path = path or self._path
+        if path is None:
+            raise ValueError("No path given and the store has no path")
+        with self._lock:
+            if self._vectors is None:
+                vectors = np.empty((0, 0), dtype=self._dtype)
+            else:
+                vectors = self._vectors[: self._size]
+            meta = {
+                "ids": self._ids,
+                "documents": self._documents,
+                "metadatas": self._metadatas,
+                "scales": (
+                    None
+                    if self._scales is None
+                    else self._scales[: self._size].tolist()
+                ),
+            }
+            with open(f"{path}.npy.tmp", "wb") as f:
+                np.save(f, vectors)
+            Path(f"{path}.meta.json.tmp").write_text(dumps_json(meta), encoding="utf-8")
+        os.replace(f"{path}.npy.tmp", f"{path}.npy")
+        os.replace(f"{path}.meta.json.tmp", f"{path}.meta.json")
+
+    def load(self, path: str) -> None:
+        """Replace the contents with a snapshot written by ``save``."""
+        meta = loads_json(Path(f"{path}.meta.json").read_bytes())
+        vectors = np.load(f"{path}.npy").astype(np.float32)
+        if meta["scales"] is not None:
+            vectors *= np.asarray(meta["scales"], dtype=np.float32)[:, None]
+        with self._lock:
+            self.clear()
+            self.add(meta["ids"], vectors, meta["documents"], meta["metadatas"])
+
+    def close(self) -> None:
+        if self._path is not None:
+            self.save()
@@ -3,20 +3,101 @@
 ZSET-based storage for production caching with score management.
 """
 
+import heapq
 import json
+import time
 import redis
-from datetime import datetime
-from typing import Any, Iterator
+from itertools import islice
+from typing import Any, Callable, Iterator, Mapping, Sequence, TypeVar, cast
+
+from redis.typing import EncodableT, FieldT
 
 from context_ref.core.config import RedisConfig, get_redis_config
+from context_ref.core.utils import (
+    _ACCESS_COUNTERS,
+    compute_retention_score,
+    to_timestamp,
+)
+from context_ref.utils.serialization import dumps_json_bytes, loads_json
+
+
+# Pops the n lowest-scored entries in one server-side step. Aggregates are
+# updated from the entry's counters so they stay in step with the deletes.
+# KEYS: scores, refs, agg, last_accessed, created. ARGV: n, key prefix.
+_POP_BOTTOM_BY_SCORE = """
+local ids = redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+for _, id in ipairs(ids) do
+    local entry_key = ARGV[2] .. 'entry:' .. id
+    local counts = redis.call(
+        'HMGET', entry_key, 'reuse_count', 'provide_context_count')
+    local reuse = tonumber(counts[1]) or 0
+    local context = tonumber(counts[2]) or 0
+    if reuse ~= 0 then
+        redis.call('HINCRBY', KEYS[3], 'reuse_count', -reuse)
+    end
+    if context ~= 0 then
+        redis.call('HINCRBY', KEYS[3], 'provide_context_count', -context)
+    end
+    redis.call('DEL', entry_key, ARGV[2] .. 'emb:' .. id)
+    redis.call('ZREM', KEYS[1], id)
+    redis.call('ZREM', KEYS[2], id)
+    redis.call('ZREM', KEYS[4], id)
+    redis.call('ZREM', KEYS[5], id)
+end
+return ids
+"""
+
+
+# Records an access on an existing entry: optionally bumps one counter, sets
+# the access time and keeps agg/refs/last_accessed in step. Returns the new
+# (reuse_count, provide_context_count), or nil if the entry doesn't exist.
+# KEYS: entry, agg, refs, last_accessed. ARGV: id, counter field or '', now.
+_RECORD_ACCESS = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+if ARGV[2] ~= '' then
+    redis.call('HINCRBY', KEYS[1], ARGV[2], 1)
+    redis.call('HINCRBY', KEYS[2], ARGV[2], 1)
+    redis.call('ZINCRBY', KEYS[3], 1, ARGV[1])
+end
+redis.call('HSET', KEYS[1], 'last_accessed_at', ARGV[3])
+redis.call('ZADD', KEYS[4], ARGV[3], ARGV[1])
+return redis.call('HMGET', KEYS[1], 'reuse_count', 'provide_context_count')
+"""
+
+
+# Keys per SCAN page / MGET / DEL when walking every entry
+_SCAN_BATCH = 1000
+
+_T = TypeVar("_T")
+
+# Entry fields kept as plain hash values; any other field is stored as JSON
+_STR_FIELDS = frozenset({"id", "uuid", "tool_name", "input_text"})
+_INT_FIELDS = frozenset({"reuse_count", "provide_context_count"})
+_FLOAT_FIELDS = frozenset({"created_at", "last_accessed_at"})
+_BOOL_FIELDS = frozenset({"success"})
+
+# Fields _queue_indexes compares between the old and new entry
+_INDEX_FIELDS = (
+    "reuse_count",
+    "provide_context_count",
+    "last_accessed_at",
+    "created_at",
+)
 
 
 class RedisStorageBackend:
     """Redis storage backend with ZSET-based score management.
 
     Uses Redis data structures:
-    - String: Store cache entry JSON (key: {prefix}entry:{id})
+    - Hash: Store cache entry fields (key: {prefix}entry:{id})
+    - String: Store int8-quantized embedding (key: {prefix}emb:{id})
     - ZSET: Store entry scores for ranking (key: {prefix}scores)
+    - ZSET: Store reuse + context count per entry (key: {prefix}refs)
+    - ZSET: Store last access timestamp per entry (key: {prefix}last_accessed)
+    - ZSET: Store creation timestamp per entry (key: {prefix}created)
+    - HASH: Running reuse/context totals for stats (key: {prefix}agg)
     """
 
     def __init__(
@@ -35,6 +116,9 @@ class RedisStorageBackend:
         self._url = url
         self._prefix = prefix
         self._client: redis.Redis | None = None
+        self._raw_client: redis.Redis | None = None
+        self._pop_bottom_script: Any = None
+        self._record_access_script: Any = None
 
     @classmethod
     def from_env(cls, config: RedisConfig | None = None) -> "RedisStorageBackend":
@@ -63,68 +147,315 @@ class RedisStorageBackend:
                 )
         return self._client
 
+    def _get_raw_client(self) -> redis.Redis:
+        """Client without response decoding, for binary embedding values."""
+        if self._raw_client is None:
+            if self._url:
+                self._raw_client = redis.from_url(self._url)
+            else:
+                self._raw_client = redis.Redis(
+                    host=self._host,
+                    port=self._port,
+                    db=self._db,
+                    password=self._password,
+                )
+        return self._raw_client
+
+    def _embedding_key(self, key: str) -> str:
+        return f"{self._prefix}emb:{key}"
+
     def _entry_key(self, key: str) -> str:
         return f"{self._prefix}entry:{key}"
 
     def _scores_key(self) -> str:
         return f"{self._prefix}scores"
 
-    def _serialize(self, value: dict[str, Any]) -> str:
-        data = value.copy()
-        for k, v in data.items():
-            if isinstance(v, datetime):
-                data[k] = v.isoformat()
-        return json.dumps(data, default=str)
+    def _refs_key(self) -> str:
+        return f"{self._prefix}refs"
 
-    def _deserialize(self, data: str | None) -> dict[str, Any] | None:
-        if data is None:
-            return None
-        try:
-            return json.loads(data)
-        except json.JSONDecodeError:
-            return None
+    def _agg_key(self) -> str:
+        return f"{self._prefix}agg"
+
+    def _last_accessed_key(self) -> str:
+        return f"{self._prefix}last_accessed"
+
+    def _created_key(self) -> str:
+        return f"{self._prefix}created"
+
+    def _queue_indexes(
+        self,
+        pipe: redis.client.Pipeline,
+        key: str,
+        old: dict[str, Any] | None,
+        new: dict[str, Any] | None,
+    ) -> None:
+        """Queue aggregate and index updates for an entry going from old to new."""
+        old_reuse = old.get("reuse_count", 0) if old else 0
+        old_context = old.get("provide_context_count", 0) if old else 0
+        new_reuse = new.get("reuse_count", 0) if new else 0
+        new_context = new.get("provide_context_count", 0) if new else 0
+        if new_reuse != old_reuse:
+            pipe.hincrby(self._agg_key(), "reuse_count", new_reuse - old_reuse)
+        if new_context != old_context:
+            pipe.hincrby(
+                self._agg_key(), "provide_context_count", new_context - old_context
+            )
+        if new is None:
+            pipe.zrem(self._refs_key(), key)
+            pipe.zrem(self._last_accessed_key(), key)
+            pipe.zrem(self._created_key(), key)
+            return
+        pipe.zadd(self._refs_key(), {key: new_reuse + new_context})
+        last_accessed = new.get("last_accessed_at")
+        if old is None or last_accessed != old.get("last_accessed_at"):
+            pipe.zadd(
+                self._last_accessed_key(), {key: to_timestamp(last_accessed, 0.0)}
+            )
+        created = new.get("created_at")
+        if old is None or created != old.get("created_at"):
+            pipe.zadd(self._created_key(), {key: to_timestamp(created, 0.0)})
+
+    def _serialize(self, value: dict[str, Any]) -> dict[FieldT, EncodableT]:
+        """Flatten an entry dict into hash fields.
+
+        Counters, timestamps and identifiers are stored as plain values so
+        they can be updated in place with HINCRBY/HSET; nested values such as
+        ``input_args`` and ``output`` are JSON-encoded.
+        """
+        flat: dict[FieldT, EncodableT] = {}
+        for field, item in value.items():
+            if field in _STR_FIELDS:
+                if item is not None:
+                    flat[field] = item
+            elif field in _INT_FIELDS:
+                flat[field] = int(item or 0)
+            elif field in _FLOAT_FIELDS:
+                if item is not None:
+                    flat[field] = to_timestamp(item, 0.0)
+            elif field in _BOOL_FIELDS:
+                flat[field] = int(bool(item))
+            else:
+                flat[field] = dumps_json_bytes(item)
+        return flat
+
+    def _deserialize(self, mapping: Mapping[str, str | None]) -> dict[str, Any] | None:
+        """Rebuild an entry dict from hash fields; None if empty or corrupt."""
+        data: dict[str, Any] = {}
+        for field, raw in mapping.items():
+            if raw is None:
+                continue
+            if field in _STR_FIELDS:
+                data[field] = raw
+            elif field in _INT_FIELDS:
+                data[field] = int(raw)
+            elif field in _FLOAT_FIELDS:
+                data[field] = float(raw)
+            elif field in _BOOL_FIELDS:
+                data[field] = raw == "1"
+            else:
+                try:
+                    data[field] = loads_json(raw)
+                except json.JSONDecodeError:
+                    return None
+        return data or None
+
+    def _read_index_fields(
+        self, entry_keys: Sequence[str]
+    ) -> list[dict[str, Any] | None]:
+        """Fetch just the fields _queue_indexes needs, one pipeline for all keys."""
+        pipe = self._get_client().pipeline(transaction=False)
+        for entry_key in entry_keys:
+            pipe.hmget(entry_key, _INDEX_FIELDS)
+        return [
+            self._deserialize(dict(zip(_INDEX_FIELDS, values, strict=True)))
+            for values in pipe.execute()
+        ]
+
+    def _transaction(
+        self, func: Callable[[redis.client.Pipeline], _T], *watches: str
+    ) -> _T:
+        """Run ``func`` in a WATCH/MULTI transaction and return its result.
+
+        ``func`` is re-run when a watched key changes; the result of the
+        attempt that committed is returned.
+        """
+        results: list[_T] = []
+
+        def run(pipe: redis.client.Pipeline) -> None:
+            results[:] = [func(pipe)]
+
+        self._get_client().transaction(run, *watches)
+        return results[0]
 
     def get(self, key: str) -> dict[str, Any] | None:
         client = self._get_client()
-        data = client.get(self._entry_key(key))
-        return self._deserialize(data)
+        mapping = cast("dict[str, str]", client.hgetall(self._entry_key(key)))
+        return self._deserialize(mapping)
 
-    def set(self, key: str, value: dict[str, Any], score: float = 0.0) -> None:
+    def set(
+        self,
+        key: str,
+        value: dict[str, Any],
+        score: float = 0.0,
+        embedding: bytes | None = None,
+    ) -> None:
+        """Write an entry, its score and optionally its embedding in one MULTI."""
         client = self._get_client()
-        pipe = client.pipeline()
-        pipe.set(self._entry_key(key), self._serialize(value))
-        pipe.zadd(self._scores_key(), {key: score})
-        pipe.execute()
+        entry_key = self._entry_key(key)
 
-    def delete(self, key: str) -> bool:
+        def write(pipe: redis.client.Pipeline) -> None:
+            (old,) = self._read_index_fields([entry_key])
+            pipe.multi()
+            pipe.delete(entry_key)
+            pipe.hset(entry_key, mapping=self._serialize(value))
+            pipe.zadd(self._scores_key(), {key: score})
+            if embedding is not None:
+                pipe.set(self._embedding_key(key), embedding)
+            self._queue_indexes(pipe, key, old, value)
+
+        client.transaction(write, entry_key)
+
+    def get_many(self, keys: Sequence[str]) -> list[dict[str, Any] | None]:
+        if not keys:
+            return []
+        pipe = self._get_client().pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(self._entry_key(key))
+        return [self._deserialize(mapping) for mapping in pipe.execute()]
+
+    def set_many(
+        self,
+        items: Sequence[tuple[str, dict[str, Any], float]],
+        embeddings: Mapping[str, bytes] | None = None,
+    ) -> None:
+        """Write several (key, value, score) entries and their embeddings.
+
+        Everything goes out in one MULTI/EXEC, with the previous values read
+        under WATCH so the aggregates stay exact. Keys must be distinct.
+        """
+        if not items:
+            return
         client = self._get_client()
-        pipe = client.pipeline()
-        pipe.delete(self._entry_key(key))
-        pipe.zrem(self._scores_key(), key)
-        results = pipe.execute()
-        return results[0] > 0
+        entry_keys = [self._entry_key(key) for key, _, _ in items]
+
+        def write(pipe: redis.client.Pipeline) -> None:
+            olds = self._read_index_fields(entry_keys)
+            pipe.multi()
+            pipe.delete(*entry_keys)
+            for entry_key, old, (key, value, _) in zip(
+                entry_keys, olds, items, strict=True
+            ):
+                pipe.hset(entry_key, mapping=self._serialize(value))
+                self._queue_indexes(pipe, key, old, value)
+            pipe.zadd(self._scores_key(), {key: score for key, _, score in items})
+            for key, data in (embeddings or {}).items():
+                pipe.set(self._embedding_key(key), data)
+
+        client.transaction(write, *entry_keys)
+
+    def delete(self, key: str) -> bool:
+        entry_key = self._entry_key(key)
+
+        def remove(pipe: redis.client.Pipeline) -> bool:
+            (old,) = self._read_index_fields([entry_key])
+            pipe.multi()
+            pipe.delete(entry_key, self._embedding_key(key))
+            pipe.zrem(self._scores_key(), key)
+            if old is not None:
+                self._queue_indexes(pipe, key, old, None)
+            return old is not None
+
+        return self._transaction(remove, entry_key)
+
+    def set_embedding(self, key: str, data: bytes) -> None:
+        self._get_raw_client().set(self._embedding_key(key), data)
+
+    def get_embedding(self, key: str) -> bytes | None:
+        data = self._get_raw_client().get(self._embedding_key(key))
+        return cast("bytes | None", data)
+
+    def delete_many(self, keys: Sequence[str]) -> int:
+        """Delete several entries in one MULTI/EXEC; returns how many existed."""
+        if not keys:
+            return 0
+        entry_keys = [self._entry_key(key) for key in keys]
+
+        def remove(pipe: redis.client.Pipeline) -> int:
+            olds = self._read_index_fields(entry_keys)
+            pipe.multi()
+            pipe.delete(*entry_keys, *(self._embedding_key(key) for key in keys))
+            pipe.zrem(self._scores_key(), *keys)
+            deleted = 0
+            for key, old in zip(keys, olds, strict=True):
+                if old is not None:
+                    self._queue_indexes(pipe, key, old, None)
+                    deleted += 1
+            return deleted
+
+        return self._transaction(remove, *entry_keys)
 
     def exists(self, key: str) -> bool:
         client = self._get_client()
         return client.exists(self._entry_key(key)) > 0
 
+    def _scan_chunks(self, pattern: str) -> Iterator[list[str]]:
+        """Yield the full keys matching ``pattern`` in lists of _SCAN_BATCH."""
+        client = self._get_client()
+        keys = client.scan_iter(match=pattern, count=_SCAN_BATCH)
+        while chunk := list(islice(keys, _SCAN_BATCH)):
+            yield chunk
+
+    def _iter_entries(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yield (key, entry) for every entry, one pipelined HGETALL per chunk."""
+        client = self._get_client()
+        prefix_len = len(self._entry_key(""))
+        for chunk in self._scan_chunks(f"{self._prefix}entry:*"):
+            pipe = client.pipeline(transaction=False)
+            for entry_key in chunk:
+                pipe.hgetall(entry_key)
+            for entry_key, mapping in zip(chunk, pipe.execute(), strict=True):
+                data = self._deserialize(mapping)
+                if data:
+                    yield entry_key[prefix_len:], data
+
     def keys(self) -> Iterator[str]:
         client = self._get_client()
         pattern = f"{self._prefix}entry:*"
         prefix_len = len(f"{self._prefix}entry:")
-        for key in client.scan_iter(match=pattern):
+        for key in client.scan_iter(match=pattern, count=_SCAN_BATCH):
             yield key[prefix_len:]
 
     def clear(self) -> None:
         client = self._get_client()
-        for key in client.scan_iter(match=f"{self._prefix}entry:*"):
-            client.delete(key)
-        client.delete(self._scores_key())
+        for pattern in (f"{self._prefix}entry:*", f"{self._prefix}emb:*"):
+            for chunk in self._scan_chunks(pattern):
+                client.delete(*chunk)
+        client.delete(
+            self._scores_key(),
+            self._refs_key(),
+            self._agg_key(),
+            self._last_accessed_key(),
+            self._created_key(),
+        )
 
     def size(self) -> int:
         client = self._get_client()
         return client.zcard(self._scores_key())
 
+    def aggregate_stats(self) -> dict[str, int]:
+        """Return entry count, counter totals and the largest reference count."""
+        pipe = self._get_client().pipeline()
+        pipe.zcard(self._scores_key())
+        pipe.hmget(self._agg_key(), "reuse_count", "provide_context_count")
+        pipe.zrange(self._refs_key(), -1, -1, withscores=True)
+        total_entries, (reuse, context), top = pipe.execute()
+        return {
+            "total_entries": total_entries,
+            "total_reuse_count": int(reuse or 0),
+            "total_context_count": int(context or 0),
+            "max_reference_count": int(top[0][1]) if top else 0,
+        }
+
     def update_score(self, key: str, score: float) -> bool:
         client = self._get_client()
         if not client.exists(self._entry_key(key)):
@@ -136,96 +467,219 @@ class RedisStorageBackend:
         client = self._get_client()
         return client.zscore(self._scores_key(), key)
 
-    def update_access_time(self, key: str) -> bool:
-        data = self.get(key)
-        if data is None:
-            return False
-        data["last_accessed_at"] = datetime.now().isoformat()
+    def get_counts(self, key: str) -> tuple[int, int] | None:
+        """Return (reuse_count, provide_context_count) with one HMGET."""
         client = self._get_client()
-        client.set(self._entry_key(key), self._serialize(data))
-        return True
+        reuse, context = client.hmget(
+            self._entry_key(key), "reuse_count", "provide_context_count"
+        )
+        if reuse is None and context is None:
+            return None
+        return int(reuse or 0), int(context or 0)
+
+    def _record_access(
+        self,
+        key: str,
+        counter: str | None,
+        now: float | None = None,
+        client: Any = None,
+    ) -> tuple[int, int] | None:
+        """Run _RECORD_ACCESS; returns the new (reuse, context) counts.
+
+        With a pipeline as ``client`` the call is only queued and the raw
+        reply comes back from ``execute()``.
+        """
+        if self._record_access_script is None:
+            self._record_access_script = self._get_client().register_script(
+                _RECORD_ACCESS
+            )
+        keys = [
+            self._entry_key(key),
+            self._agg_key(),
+            self._refs_key(),
+            self._last_accessed_key(),
+        ]
+        counts = self._record_access_script(
+            keys=keys, args=[key, counter or "", now or time.time()], client=client
+        )
+        if counts is None or client is not None:
+            return None
+        reuse, context = counts
+        return int(reuse or 0), int(context or 0)
+
+    def update_access_time(self, key: str) -> bool:
+        return self._record_access(key, None) is not None
 
     def increment_reuse(self, key: str) -> bool:
-        data = self.get(key)
-        if data is None:
-            return False
-        data["reuse_count"] = data.get("reuse_count", 0) + 1
-        data["last_accessed_at"] = datetime.now().isoformat()
-        client = self._get_client()
-        client.set(self._entry_key(key), self._serialize(data))
-        return True
+        return self._record_access(key, "reuse_count") is not None
 
     def increment_context(self, key: str) -> bool:
-        data = self.get(key)
-        if data is None:
-            return False
-        data["provide_context_count"] = data.get("provide_context_count", 0) + 1
-        data["last_accessed_at"] = datetime.now().isoformat()
-        client = self._get_client()
-        client.set(self._entry_key(key), self._serialize(data))
-        return True
+        return self._record_access(key, "provide_context_count") is not None
+
+    def increment_and_rescore(
+        self,
+        key: str,
+        kind: str,
+        reuse_context_factor: float = 0.6,
+        time_decay_lambda: float = 0.01,
+    ) -> float | None:
+        """Bump a counter (or just the access time) and update the score.
+
+        The counter and access time are updated server-side in one script
+        call. The retention score only grows with the counters and the access
+        time, so it is written with ZADD XX GT: when concurrent bumps race,
+        the highest (latest) score wins and deleted entries are not revived.
+
+        Returns:
+            The new score, or None if the key doesn't exist.
+        """
+        try:
+            counter = _ACCESS_COUNTERS[kind]
+        except KeyError:
+            raise ValueError(f"Unknown access kind: {kind!r}") from None
+        now = time.time()
+        counts = self._record_access(key, counter, now)
+        if counts is None:
+            return None
+        reuse, context = counts
+        score = compute_retention_score(
+            reuse_count=reuse,
+            provide_context_count=context,
+            last_accessed=now,
+            reuse_context_factor=reuse_context_factor,
+            time_decay_lambda=time_decay_lambda,
+        )
+        self._get_client().zadd(self._scores_key(), {key: score}, xx=True, gt=True)
+        return score
+
+    def increment_and_rescore_many(
+        self,
+        keys: Sequence[str],
+        kind: str,
+        reuse_context_factor: float = 0.6,
+        time_decay_lambda: float = 0.01,
+    ) -> list[float | None]:
+        """increment_and_rescore for several keys in two pipelined round trips."""
+        try:
+            counter = _ACCESS_COUNTERS[kind]
+        except KeyError:
+            raise ValueError(f"Unknown access kind: {kind!r}") from None
+        if not keys:
+            return []
+        now = time.time()
+        pipe = self._get_client().pipeline(transaction=False)
+        for key in keys:
+            self._record_access(key, counter, now, client=pipe)
+        scores: list[float | None] = []
+        updates: dict[str, float] = {}
+        for key, counts in zip(keys, pipe.execute(), strict=True):
+            if counts is None:
+                scores.append(None)
+                continue
+            reuse, context = counts
+            score = compute_retention_score(
+                reuse_count=int(reuse or 0),
+                provide_context_count=int(context or 0),
+                last_accessed=now,
+                reuse_context_factor=reuse_context_factor,
+                time_decay_lambda=time_decay_lambda,
+            )
+            updates[key] = score
+            scores.append(score)
+        if updates:
+            self._get_client().zadd(self._scores_key(), updates, xx=True, gt=True)
+        return scores
 
     def decrement_reference(self, key: str) -> bool:
-        data = self.get(key)
-        if data is None:
-            return False
-        reuse = data.get("reuse_count", 0)
-        context = data.get("provide_context_count", 0)
-        if reuse > 0:
-            data["reuse_count"] = reuse - 1
-        elif context > 0:
-            data["provide_context_count"] = context - 1
-        client = self._get_client()
-        client.set(self._entry_key(key), self._serialize(data))
-        return True
+        entry_key = self._entry_key(key)
+
+        def drop(pipe: redis.client.Pipeline) -> bool:
+            reuse, context = pipe.hmget(
+                entry_key, "reuse_count", "provide_context_count"
+            )
+            if reuse is None and context is None:
+                return False
+            if int(reuse or 0) > 0:
+                counter = "reuse_count"
+            elif int(context or 0) > 0:
+                counter = "provide_context_count"
+            else:
+                return True
+            pipe.multi()
+            pipe.hincrby(entry_key, counter, -1)
+            pipe.hincrby(self._agg_key(), counter, -1)
+            pipe.zincrby(self._refs_key(), -1, key)
+            return True
+
+        return self._transaction(drop, entry_key)
 
     def get_bottom_by_score(self, n: int = 1) -> list[str]:
         """Get keys with lowest scores (for eviction)."""
         client = self._get_client()
-        return list(client.zrange(self._scores_key(), 0, n - 1))
+        return cast("list[str]", client.zrange(self._scores_key(), 0, n - 1))
+
+    def pop_bottom_by_score(self, n: int = 1) -> list[str]:
+        """Atomically remove and return the n lowest-scored keys (Lua)."""
+        if self._pop_bottom_script is None:
+            client = self._get_client()
+            self._pop_bottom_script = client.register_script(_POP_BOTTOM_BY_SCORE)
+        keys = [
+            self._scores_key(),
+            self._refs_key(),
+            self._agg_key(),
+            self._last_accessed_key(),
+            self._created_key(),
+        ]
+        return list(self._pop_bottom_script(keys=keys, args=[n, self._prefix]))
+
+    def _index_range(
+        self, index_key: str, n: int, rank: Callable[[dict[str, Any]], float]
+    ) -> list[str]:
+        """Return the n lowest members of an index ZSET.
+
+        Entries written before the index existed are missing from it; while
+        the index is shorter than ``scores`` this falls back to ranking every
+        entry with ``rank``.
+        """
+        pipe = self._get_client().pipeline()
+        pipe.zcard(self._scores_key())
+        pipe.zcard(index_key)
+        pipe.zrange(index_key, 0, n - 1)
+        total, indexed, keys = pipe.execute()
+        if indexed >= total:
+            return list(keys)
+        entries = ((rank(data), key) for key, data in self._iter_entries())
+        return [key for _, key in heapq.nsmallest(n, entries)]
 
     def get_oldest_by_access(self, n: int = 1) -> list[str]:
         """Get keys by oldest access time (LRU eviction)."""
-        entries = []
-        for key in self.keys():
-            data = self.get(key)
-            if data:
-                last = data.get("last_accessed_at")
-                if isinstance(last, str):
-                    last = datetime.fromisoformat(last)
-                elif last is None:
-                    last = datetime.min
-                entries.append((key, last))
-        entries.sort(key=lambda x: x[1])
-        return [k for k, _ in entries[:n]]
+        return self._index_range(
+            self._last_accessed_key(),
+            n,
+            lambda data: data.get("last_accessed_at", 0.0),
+        )
 
     def get_least_used(self, n: int = 1) -> list[str]:
         """Get keys by lowest reference count (LFU eviction)."""
-        entries = []
-        for key in self.keys():
-            data = self.get(key)
-            if data:
-                total = data.get("reuse_count", 0) + data.get("provide_context_count", 0)
-                entries.append((key, total))
-        entries.sort(key=lambda x: x[1])
-        return [k for k, _ in entries[:n]]
+        return self._index_range(
+            self._refs_key(),
+            n,
+            lambda data: data.get("reuse_count", 0)
+            + data.get("provide_context_count", 0),
+        )
 
     def get_oldest_by_creation(self, n: int = 1) -> list[str]:
         """Get keys by creation time (FIFO eviction)."""
-        entries = []
-        for key in self.keys():
-            data = self.get(key)
-            if data:
-                created = data.get("created_at")
-                if isinstance(created, str):
-                    created = datetime.fromisoformat(created)
-                elif created is None:
-                    created = datetime.min
-                entries.append((key, created))
-        entries.sort(key=lambda x: x[1])
-        return [k for k, _ in entries[:n]]
+        return self._index_range(
+            self._created_key(),
+            n,
+            lambda data: data.get("created_at", 0.0),
+        )
 
     def close(self) -> None:
         if self._client is not None:
             self._client.close()
             self._client = None
+        if self._raw_client is not None:
+            self._raw_client.close()
+            self._raw_client = None
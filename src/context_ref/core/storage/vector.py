@@ -1,8 +1,13 @@
 """Vector store interface for similarity search."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from typing import Any
 
+import numpy as np
+
+from context_ref.embedding.base import Embedding
+
 
 class VectorStore(ABC):
     """Abstract interface for vector storage backends."""
@@ -11,7 +16,7 @@ class VectorStore(ABC):
     def add(
         self,
         ids: list[str],
-        embeddings: list[list[float]],
+        embeddings: Sequence[Embedding] | np.ndarray,
         documents: list[str],
         metadata: list[dict[str, Any]] | None = None,
     ) -> None:
@@ -21,7 +26,7 @@ class VectorStore(ABC):
     @abstractmethod
     def search(
         self,
-        query_embedding: list[float],
+        query_embedding: Embedding,
         k: int = 5,
         filter: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
@@ -31,6 +36,31 @@ class VectorStore(ABC):
         """
         ...
 
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Embedding] | np.ndarray,
+        k: int = 5,
+        filter: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Search for several embeddings that share the same filter.
+
+        Returns the same keys as ``search`` with one inner list per query.
+        The default implementation calls ``search`` for each embedding;
+        backends that accept a query matrix should override it.
+        """
+        merged: dict[str, Any] = {
+            "ids": [],
+            "distances": [],
+            "metadatas": [],
+            "documents": [],
+        }
+        for embedding in query_embeddings:
+            result = self.search(embedding, k=k, filter=filter)
+            for key, rows in merged.items():
+                values = result.get(key)
+                rows.append(values[0] if values else [])
+        return merged
+
     @abstractmethod
     def delete(self, ids: list[str]) -> None:
         """Delete entries by ID."""
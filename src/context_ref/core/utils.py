@@ -10,14 +10,27 @@ from __future__ import annotations
 import hashlib
 import json
 import math
+import struct
+import time
+from array import array
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Reference counts are normalized by log(100), saturating around 100 refs
+_INV_LOG_100 = 1.0 / math.log(100.0)
 
 
 def generate_cache_id(tool_name: str, input_text: str) -> str:
     """Generate a deterministic cache ID from tool name and input.
 
-    Uses SHA-256 hash truncated to 16 characters for readability.
+    Uses an 8-byte BLAKE2b digest (16 hex characters): faster than SHA-256
+    and, being in the standard library, identical in every process that
+    shares a backend. IDs are for deduplication only and are not meant to
+    resist deliberate collisions.
 
     Args:
         tool_name: Name of the tool
@@ -30,8 +43,13 @@ def generate_cache_id(tool_name: str, input_text: str) -> str:
         >>> generate_cache_id("search", '{"query": "python"}')
         'a3b2c1d4e5f6g7h8'
     """
-    content = f"{tool_name}:{input_text}"
-    return hashlib.sha256(content.encode()).hexdigest()[:16]
+    content = f"{tool_name}\0{input_text}"
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+# Reused encoder: json.dumps() builds a new JSONEncoder whenever it is given
+# non-default options, which costs more than encoding a small args dict.
+_ARGS_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
 
 
 def serialize_args(args: dict[str, Any]) -> str:
@@ -49,16 +67,68 @@ def serialize_args(args: dict[str, Any]) -> str:
         >>> serialize_args({"b": 2, "a": 1})
         '{"a": 1, "b": 2}'
     """
-    return json.dumps(args, sort_keys=True, default=str)
+    return _ARGS_ENCODER.encode(args)
+
+
+def pack_embedding(embedding: Sequence[float] | np.ndarray) -> bytes:
+    """Quantize an embedding to int8 with one per-vector scale.
+
+    Layout: little-endian float32 scale, then one signed byte per dim
+    (``4 + dim`` bytes, about a quarter of float32). The scale maps the
+    largest absolute component to 127, so the direction, and therefore
+    cosine similarity, is kept to within about 1%. NumPy arrays are
+    quantized without going through Python floats.
+    """
+    if hasattr(embedding, "dtype"):
+        import numpy as np
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        peak = float(np.abs(vector).max()) if vector.size else 0.0
+        scale = peak / 127 if peak else 1.0
+        packed: bytes = np.rint(vector / np.float32(scale)).astype("<i1").tobytes()
+        return struct.pack("<f", scale) + packed
+    peak = max((abs(x) for x in embedding), default=0.0)
+    scale = peak / 127 if peak else 1.0
+    quantized = array("b", [round(x / scale) for x in embedding])
+    return struct.pack("<f", scale) + quantized.tobytes()
+
+
+def unpack_embedding(data: bytes) -> list[float]:
+    """Dequantize an embedding written by pack_embedding."""
+    scale: float = struct.unpack_from("<f", data)[0]
+    return [q * scale for q in array("b", data[4:])]
+
+
+def to_timestamp(value: float | datetime | str | None, default: float) -> float:
+    """Convert a stored timestamp to epoch seconds.
+
+    Entries store epoch floats; ISO strings and datetimes written by older
+    versions are still accepted.
+
+    Args:
+        value: Epoch seconds, datetime, ISO-8601 string, or None
+        default: Value returned when ``value`` is None
+
+    Returns:
+        Epoch seconds as float
+    """
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
 
 
 def compute_weighted_score(
     similarity: float,
     reuse_count: int,
     provide_context_count: int,
-    last_accessed: datetime,
+    last_accessed: float | datetime,
     reuse_context_factor: float = 0.6,
     time_decay_lambda: float = 0.01,
+    now: float | None = None,
 ) -> float:
     """Compute weighted score combining similarity, reference counts, and recency.
 
@@ -79,9 +149,10 @@ def compute_weighted_score(
         similarity: Cosine similarity score (0-1)
         reuse_count: Number of times entry was directly reused
         provide_context_count: Number of times entry was provided as context
-        last_accessed: Last access timestamp
+        last_accessed: Last access time as epoch seconds (datetime also accepted)
         reuse_context_factor: Weight factor for reuse vs context (default: 0.6)
         time_decay_lambda: Time decay rate parameter (default: 0.01)
+        now: Current epoch seconds; read from the clock when omitted
 
     Returns:
         Weighted score for ranking cache entries
@@ -99,7 +170,11 @@ def compute_weighted_score(
         # Returns ~0.8 + log(1.6)/log(100) * exp(-1.0) ≈ 0.85
     """
     # Calculate time decay factor
-    delta_t = (datetime.now() - last_accessed).total_seconds() / 3600
+    if isinstance(last_accessed, datetime):
+        last_accessed = last_accessed.timestamp()
+    if now is None:
+        now = time.time()
+    delta_t = (now - last_accessed) / 3600
     recency_factor = math.exp(-time_decay_lambda * delta_t)
 
     # Calculate weighted reference count
@@ -111,7 +186,7 @@ def compute_weighted_score(
 
     # Normalize reference count logarithmically
     # log(100) ≈ 4.605, so normalized_ref maxes out at 1.0 around 100 total refs
-    normalized_ref = math.log(weighted_count + 1) / math.log(100)
+    normalized_ref = math.log1p(weighted_count) * _INV_LOG_100
     normalized_ref = min(normalized_ref, 1.0)
 
     # Combine similarity with weighted reference contribution
@@ -119,6 +194,236 @@ def compute_weighted_score(
     return score
 
 
+# Below this many scores the NumPy call overhead outweighs the vectorization
+_VECTORIZE_MIN_SCORES = 16
+
+
+def compute_weighted_scores(
+    similarities: Sequence[float],
+    reuse_counts: Sequence[int],
+    provide_context_counts: Sequence[int],
+    last_accessed: Sequence[float],
+    reuse_context_factor: float = 0.6,
+    time_decay_lambda: float = 0.01,
+    now: float | None = None,
+) -> list[float]:
+    """Compute ``compute_weighted_score`` for many entries at once.
+
+    All sequences must have the same length. The current time is read once
+    for the whole batch. Large batches are scored with NumPy ufuncs; small
+    ones (the usual ``top_k``) fall back to the scalar formula, which is
+    faster at that size.
+
+    Args:
+        similarities: Cosine similarity per entry
+        reuse_counts: Direct reuse count per entry
+        provide_context_counts: Context provision count per entry
+        last_accessed: Last access time per entry, as epoch seconds
+        reuse_context_factor: Weight factor for reuse vs context (default: 0.6)
+        time_decay_lambda: Time decay rate parameter (default: 0.01)
+        now: Current epoch seconds; read from the clock once when omitted
+
+    Returns:
+        Weighted scores in input order
+    """
+    if now is None:
+        now = time.time()
+    n = len(similarities)
+    if n < _VECTORIZE_MIN_SCORES:
+        # Same formula as compute_weighted_score with the per-call constants
+        # hoisted out, so each entry costs one log1p and one exp.
+        context_factor = 1 - reuse_context_factor
+        decay = -time_decay_lambda / 3600
+        log1p, exp = math.log1p, math.exp
+        return [
+            similarity
+            + min(
+                log1p(reuse_context_factor * reuse + context_factor * context)
+                * _INV_LOG_100,
+                1.0,
+            )
+            * exp(decay * (now - accessed))
+            for similarity, reuse, context, accessed in zip(
+                similarities,
+                reuse_counts,
+                provide_context_counts,
+                last_accessed,
+                strict=True,
+            )
+        ]
+
+    import numpy as np
+
+    # Every step writes into one of two scratch arrays, so the whole batch
+    # allocates only its input conversions.
+    recency_factor = np.array(last_accessed, dtype=float)
+    np.subtract(now, recency_factor, out=recency_factor)
+    recency_factor *= -time_decay_lambda / 3600
+    np.exp(recency_factor, out=recency_factor)
+
+    scores = np.array(reuse_counts, dtype=float)
+    scores *= reuse_context_factor
+    context = np.array(provide_context_counts, dtype=float)
+    context *= 1 - reuse_context_factor
+    scores += context
+    np.log1p(scores, out=scores)
+    scores *= _INV_LOG_100
+    np.minimum(scores, 1.0, out=scores)
+
+    scores *= recency_factor
+    scores += np.asarray(similarities, dtype=float)
+    result: list[float] = scores.tolist()
+    return result
+
+
+# Floor for the reference term so unreferenced entries still order by recency
+_MIN_RETENTION_REF = 1e-3
+
+
+def compute_retention_score(
+    reuse_count: int,
+    provide_context_count: int,
+    last_accessed: float,
+    reuse_context_factor: float = 0.6,
+    time_decay_lambda: float = 0.01,
+) -> float:
+    """Compute the eviction score stored for an entry.
+
+    The reference term of compute_weighted_score decays as
+    ``normalized_ref * exp(-lambda * (now - last_accessed) / 3600)``. Taking
+    the log and dropping the ``-lambda * now`` part, which is the same for
+    every entry, leaves a value that does not depend on the current time:
+
+        score = lambda * last_accessed / 3600 + log(normalized_ref)
+
+    Entries ranked by this score keep the order the decayed score would give
+    them at any later time, so idle entries never need rescoring for
+    "lowest score first" eviction to stay correct.
+
+    Args:
+        reuse_count: Number of times entry was directly reused
+        provide_context_count: Number of times entry was provided as context
+        last_accessed: Last access time as epoch seconds
+        reuse_context_factor: Weight factor for reuse vs context (default: 0.6)
+        time_decay_lambda: Time decay rate parameter (default: 0.01)
+
+    Returns:
+        Time-independent retention score; higher means keep longer
+    """
+    normalized_ref = normalize_reference_count(
+        reuse_count, provide_context_count, reuse_context_factor=reuse_context_factor
+    )
+    return time_decay_lambda * last_accessed / 3600 + math.log(
+        max(normalized_ref, _MIN_RETENTION_REF)
+    )
+
+
+def compute_retention_scores(
+    reuse_counts: Sequence[int],
+    provide_context_counts: Sequence[int],
+    last_accessed: Sequence[float],
+    reuse_context_factor: float = 0.6,
+    time_decay_lambda: float = 0.01,
+) -> list[float]:
+    """Compute ``compute_retention_score`` for many entries at once.
+
+    All sequences must have the same length. Like compute_weighted_scores,
+    large batches use NumPy ufuncs and small ones the scalar formula.
+
+    Args:
+        reuse_counts: Direct reuse count per entry
+        provide_context_counts: Context provision count per entry
+        last_accessed: Last access time per entry, as epoch seconds
+        reuse_context_factor: Weight factor for reuse vs context (default: 0.6)
+        time_decay_lambda: Time decay rate parameter (default: 0.01)
+
+    Returns:
+        Retention scores in input order
+    """
+    if len(reuse_counts) < _VECTORIZE_MIN_SCORES:
+        return [
+            compute_retention_score(
+                reuse_count=reuse,
+                provide_context_count=context,
+                last_accessed=accessed,
+                reuse_context_factor=reuse_context_factor,
+                time_decay_lambda=time_decay_lambda,
+            )
+            for reuse, context, accessed in zip(
+                reuse_counts, provide_context_counts, last_accessed, strict=True
+            )
+        ]
+
+    import numpy as np
+
+    scores = np.array(reuse_counts, dtype=float)
+    scores *= reuse_context_factor
+    context = np.array(provide_context_counts, dtype=float)
+    context *= 1 - reuse_context_factor
+    scores += context
+    np.log1p(scores, out=scores)
+    scores *= _INV_LOG_100
+    np.clip(scores, _MIN_RETENTION_REF, 1.0, out=scores)
+    np.log(scores, out=scores)
+
+    recency = np.array(last_accessed, dtype=float)
+    recency *= time_decay_lambda / 3600
+    scores += recency
+    result: list[float] = scores.tolist()
+    return result
+
+
+_ACCESS_COUNTERS: dict[str, str | None] = {
+    "reuse": "reuse_count",
+    "context": "provide_context_count",
+    "touch": None,
+}
+
+
+def apply_access_and_score(
+    data: dict[str, Any],
+    kind: str,
+    reuse_context_factor: float = 0.6,
+    time_decay_lambda: float = 0.01,
+    now: float | None = None,
+) -> float:
+    """Record an access on a serialized cache entry in place and rescore it.
+
+    Storage backends use this to bump a counter and recompute the stored
+    retention score in one step, without rebuilding a CacheEntry.
+
+    Args:
+        data: Entry dict as produced by CacheEntry.to_dict (mutated)
+        kind: "reuse" or "context" to bump that counter, "touch" to only
+            refresh the access time
+        reuse_context_factor: Weight for reuse vs context
+        time_decay_lambda: Time decay rate
+        now: Access time as epoch seconds; read from the clock when omitted
+
+    Returns:
+        The entry's new retention score (see compute_retention_score)
+
+    Raises:
+        ValueError: If kind is not one of the values above
+    """
+    try:
+        counter = _ACCESS_COUNTERS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown access kind: {kind!r}") from None
+    if counter is not None:
+        data[counter] = data.get(counter, 0) + 1
+    if now is None:
+        now = time.time()
+    data["last_accessed_at"] = now
+    return compute_retention_score(
+        reuse_count=data.get("reuse_count", 0),
+        provide_context_count=data.get("provide_context_count", 0),
+        last_accessed=now,
+        reuse_context_factor=reuse_context_factor,
+        time_decay_lambda=time_decay_lambda,
+    )
+
+
 def normalize_reference_count(
     reuse_count: int,
     provide_context_count: int,
@@ -144,19 +449,22 @@ def normalize_reference_count(
         reuse_context_factor * reuse_count
         + (1 - reuse_context_factor) * provide_context_count
     )
-    normalized = math.log(weighted_count + 1) / math.log(max_refs)
-    return min(normalized, 1.0)
+    inv_log_max = _INV_LOG_100 if max_refs == 100.0 else 1.0 / math.log(max_refs)
+    return min(math.log1p(weighted_count) * inv_log_max, 1.0)
 
 
 def compute_recency_factor(
-    last_accessed: datetime,
+    last_accessed: float | datetime,
     time_decay_lambda: float = 0.01,
+    now: float | None = None,
 ) -> float:
     """Compute time-based recency factor using exponential decay.
 
     Args:
-        last_accessed: Last access timestamp
+        last_accessed: Last access time as epoch seconds (datetime also accepted)
         time_decay_lambda: Decay rate (default: 0.01, ~50% decay in 69 hours)
+        now: Current epoch seconds; read from the clock when omitted. Pass
+            the same value for every entry of a ranking pass.
 
     Returns:
         Recency factor in (0, 1]
@@ -169,7 +477,11 @@ def compute_recency_factor(
         >>> compute_recency_factor(now - timedelta(hours=69))  # ~50% decay
         0.5
     """
-    delta_t_hours = (datetime.now() - last_accessed).total_seconds() / 3600
+    if isinstance(last_accessed, datetime):
+        last_accessed = last_accessed.timestamp()
+    if now is None:
+        now = time.time()
+    delta_t_hours = (now - last_accessed) / 3600
     return math.exp(-time_decay_lambda * delta_t_hours)
 
 
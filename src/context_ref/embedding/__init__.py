@@ -1,6 +1,7 @@
 """Embedding function implementations."""
 
 from context_ref.embedding.base import EmbeddingFunction
+from context_ref.embedding.batched import BatchedEmbedding
 from context_ref.embedding.default import DefaultEmbedding
 
-__all__ = ["EmbeddingFunction", "DefaultEmbedding"]
+__all__ = ["EmbeddingFunction", "DefaultEmbedding", "BatchedEmbedding"]
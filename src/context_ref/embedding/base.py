@@ -1,10 +1,24 @@
 """Base embedding function interface."""
 
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# A single vector: a list of floats, or a (D,) float32 NumPy array
+Embedding = Union[list[float], "np.ndarray"]
 
 
 class EmbeddingFunction(ABC):
-    """Abstract base class for embedding functions."""
+    """Abstract base class for embedding functions.
+
+    Implementations may return plain lists or float32 NumPy arrays. Arrays
+    are handed to the vector store as-is, which skips a ``tolist()`` per
+    vector on the way in and the per-float re-parse on the way out.
+    """
 
     @property
     @abstractmethod
@@ -13,10 +27,14 @@ class EmbeddingFunction(ABC):
         ...
 
     @abstractmethod
-    def embed(self, text: str) -> list[float]:
+    def embed(self, text: str) -> Embedding:
         """Embed a single text string."""
         ...
 
-    def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Embed multiple texts. Default implementation calls embed() for each."""
+    def embed_batch(self, texts: list[str]) -> list[Embedding] | np.ndarray:
+        """Embed multiple texts. Default implementation calls embed() for each.
+
+        Model-backed subclasses should override this with the model's own
+        batched call, so the texts share one forward pass.
+        """
         return [self.embed(text) for text in texts]
@@ -0,0 +1,77 @@
+"""Embedding wrapper that joins concurrent single embeds into batches."""
+
+import threading
+from typing import Any
+
+from context_ref.embedding.base import Embedding, EmbeddingFunction
+
+
+class _PendingBatch:
+    __slots__ = ("texts", "full", "results", "error", "done")
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+        self.full = threading.Event()
+        self.results: Any = None
+        self.error: BaseException | None = None
+        self.done = threading.Event()
+
+
+class BatchedEmbedding(EmbeddingFunction):
+    """Coalesces concurrent ``embed`` calls into one ``embed_batch`` call.
+
+    The first caller becomes the leader of a batch: it waits up to
+    ``window`` seconds (or until ``max_batch`` texts have joined), embeds
+    every text in one forward pass and hands each caller its own row.
+    Single-threaded callers pay the window once per call, so this only
+    helps when several threads (e.g. parallel tool calls) embed at once.
+
+    Example:
+        cache = ToolCache(embedding_func=BatchedEmbedding(DefaultEmbedding()))
+    """
+
+    def __init__(
+        self, inner: EmbeddingFunction, window: float = 0.005, max_batch: int = 16
+    ) -> None:
+        self._inner = inner
+        self._window = window
+        self._max_batch = max_batch
+        self._lock = threading.Lock()
+        self._batch: _PendingBatch | None = None
+
+    @property
+    def dimension(self) -> int:
+        return self._inner.dimension
+
+    def embed(self, text: str) -> Embedding:
+        with self._lock:
+            batch = self._batch
+            leader = batch is None
+            if batch is None:
+                batch = self._batch = _PendingBatch()
+            row = len(batch.texts)
+            batch.texts.append(text)
+            if len(batch.texts) >= self._max_batch:
+                # Close the batch so later callers start a new one
+                self._batch = None
+                batch.full.set()
+
+        if not leader:
+            batch.done.wait()
+        else:
+            batch.full.wait(self._window)
+            with self._lock:
+                if self._batch is batch:
+                    self._batch = None
+            try:
+                batch.results = self._inner.embed_batch(batch.texts)
+            except BaseException as exc:
+                batch.error = exc
+            batch.done.set()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[row]
+
+    def embed_batch(self, texts: list[str]) -> Any:
+        return self._inner.embed_batch(texts)
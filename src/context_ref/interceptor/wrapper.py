@@ -1,6 +1,8 @@
 """Tool interceptor wrapper for LangGraph."""
 
+import threading
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from enum import Enum, auto
 from typing import Any
@@ -21,7 +23,7 @@ class CacheDecision(Enum):
     EXECUTE = auto()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DecisionResult:
     """Result of cache decision making."""
 
@@ -30,6 +32,10 @@ class DecisionResult:
     context_hints: list[CacheHit] | None = None
 
 
+# Shared result for every miss; DecisionResult is immutable
+_EXECUTE = DecisionResult(decision=CacheDecision.EXECUTE)
+
+
 class ToolInterceptor:
     """
     Interceptor for LangGraph tool calls with caching support.
@@ -43,6 +49,17 @@ class ToolInterceptor:
 
     This split enables more nuanced scoring that weights direct reuse
     higher than context provision based on config.reuse_context_factor.
+
+    With ``save_workers > 0`` results of executed tools are saved on a
+    background thread pool, so embedding and writing the new entry doesn't
+    delay the tool's return. A call made right after may then miss that
+    entry; ``flush()`` waits for pending saves and ``close()`` also shuts
+    the pool down.
+
+    With ``save_batch_size > 1`` results are buffered and written together
+    through ``ToolCache.save_many`` (one embed_batch call and one vector
+    store write) once that many have accumulated. Buffered results aren't
+    visible to lookups until written; ``flush()`` writes a partial buffer.
     """
 
     def __init__(
@@ -51,12 +68,21 @@ class ToolInterceptor:
         config: CacheConfig | None = None,
         on_cache_hit: Callable[[str, dict, Any], None] | None = None,
         on_cache_miss: Callable[[str, dict], None] | None = None,
+        save_workers: int = 0,
+        save_batch_size: int = 1,
     ) -> None:
         self.config = config or CacheConfig()
         self.cache = cache or ToolCache(config=self.config)
         self._on_cache_hit = on_cache_hit
         self._on_cache_miss = on_cache_miss
         self._stats = {"hits": 0, "misses": 0, "context_provided": 0}
+        self._save_workers = save_workers
+        self._save_executor: ThreadPoolExecutor | None = None
+        self._save_lock = threading.Lock()
+        self._pending_saves: set[Future[None]] = set()
+        self._save_error: BaseException | None = None
+        self._save_batch_size = save_batch_size
+        self._save_buffer: list[tuple[str, dict[str, Any], Any, bool]] = []
 
     def decide(
         self,
@@ -75,9 +101,28 @@ class ToolInterceptor:
             - EXECUTE: Execute the tool call normally (no cache hit).
         """
         hits = self.cache.search(tool_name, input_args)
+        return self._decide_from_hits(hits)
+
+    def decide_batch(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+    ) -> list[DecisionResult]:
+        """
+        Decide how to handle several tool calls at once.
+
+        Inputs are embedded in one batch; each call is then decided in order
+        exactly like decide(). Calls in the same batch do not see results
+        saved for earlier calls of that batch.
+
+        Returns:
+            One DecisionResult per call, in the same order as ``calls``.
+        """
+        return [self._decide_from_hits(hits) for hits in self.cache.search_batch(calls)]
 
+    def _decide_from_hits(self, hits: list[CacheHit]) -> DecisionResult:
+        """Turn search hits into a decision and update reference counts."""
         if not hits:
-            return DecisionResult(decision=CacheDecision.EXECUTE)
+            return _EXECUTE
 
         best_hit = hits[0]
 
@@ -89,17 +134,15 @@ class ToolInterceptor:
             )
 
         if best_hit.similarity >= self.config.similarity_threshold:
-            successful_hits = [h for h in hits if h.entry.success]
-            if successful_hits:
-                context_hints = successful_hits[:3]
-                for hit in context_hints:
-                    self.cache.increment_context(hit.entry.id)
+            context_hints = [h for h in hits if h.entry.success][:3]
+            if context_hints:
+                self.cache.increment_context_many([h.entry.id for h in context_hints])
                 return DecisionResult(
                     decision=CacheDecision.PROVIDE_CONTEXT,
                     context_hints=context_hints,
                 )
 
-        return DecisionResult(decision=CacheDecision.EXECUTE)
+        return _EXECUTE
 
     def format_context_hints(self, hints: list[CacheHit]) -> str:
         """Format cache hints as context for the LLM."""
@@ -108,19 +151,18 @@ class ToolInterceptor:
 
         lines = ["Historical tool usage suggestions:"]
         for i, hit in enumerate(hints, 1):
-            total_refs = hit.entry.reuse_count + hit.entry.provide_context_count
+            entry = hit.entry
+            output = str(entry.output)
+            preview = output[:200] + "..." if len(output) > 200 else output
             lines.append(
-                f"\n{i}. Tool: {hit.entry.tool_name} "
+                f"\n{i}. Tool: {entry.tool_name} "
                 f"(similarity: {hit.similarity:.2f}, "
-                f"reuse: {hit.entry.reuse_count}, "
-                f"context: {hit.entry.provide_context_count}, "
-                f"total_refs: {total_refs})"
+                f"reuse: {entry.reuse_count}, "
+                f"context: {entry.provide_context_count}, "
+                f"total_refs: {entry.reuse_count + entry.provide_context_count})\n"
+                f"   Input: {entry.input_text}\n"
+                f"   Output: {preview}"
             )
-            lines.append(f"   Input: {hit.entry.input_text}")
-            output_preview = str(hit.entry.output)[:200]
-            if len(str(hit.entry.output)) > 200:
-                output_preview += "..."
-            lines.append(f"   Output: {output_preview}")
 
         return "\n".join(lines)
 
@@ -166,7 +208,7 @@ class ToolInterceptor:
             result = execute(request)
 
             success = not (hasattr(result, "status") and result.status == "error")
-            self.cache.save(tool_name, tool_args, result.content, success=success)
+            self._save(tool_name, tool_args, result.content, success)
 
             return result
 
@@ -203,13 +245,91 @@ class ToolInterceptor:
                 self._on_cache_miss(tool_name, tool_args)
 
             result = tool(*args, **kwargs)
-            self.cache.save(tool_name, tool_args, result, success=True)
+            self._save(tool_name, tool_args, result, True)
             return result
 
         wrapped.__name__ = getattr(tool, "__name__", "wrapped_tool")
         wrapped.__doc__ = getattr(tool, "__doc__", None)
         return wrapped
 
+    def _save(
+        self, tool_name: str, tool_args: dict[str, Any], output: Any, success: bool
+    ) -> None:
+        """Save a tool result, buffered and/or in the background if configured."""
+        record = (tool_name, tool_args, output, success)
+        if self._save_batch_size <= 1:
+            self._write([record])
+            return
+        with self._save_lock:
+            self._save_buffer.append(record)
+            if len(self._save_buffer) < self._save_batch_size:
+                return
+            records, self._save_buffer = self._save_buffer, []
+        self._write(records)
+
+    def _write(self, records: list[tuple[str, dict[str, Any], Any, bool]]) -> None:
+        if self._save_workers <= 0:
+            self._save_records(records)
+            return
+        with self._save_lock:
+            if self._save_executor is None:
+                self._save_executor = ThreadPoolExecutor(
+                    max_workers=self._save_workers,
+                    thread_name_prefix="context-ref-save",
+                )
+            future = self._save_executor.submit(self._save_records, records)
+            self._pending_saves.add(future)
+        future.add_done_callback(self._save_done)
+
+    def _save_records(
+        self, records: list[tuple[str, dict[str, Any], Any, bool]]
+    ) -> None:
+        if len(records) == 1:
+            tool_name, tool_args, output, success = records[0]
+            self.cache.save(tool_name, tool_args, output, success=success)
+            return
+        for success in (True, False):
+            group = [record[:3] for record in records if bool(record[3]) is success]
+            if group:
+                self.cache.save_many(group, success=success)
+
+    def _save_done(self, future: Future[None]) -> None:
+        with self._save_lock:
+            self._pending_saves.discard(future)
+            error = future.exception()
+            if error is not None and self._save_error is None:
+                self._save_error = error
+
+    def flush(self) -> None:
+        """Write buffered results and wait for background saves.
+
+        Re-raises the first background save that failed.
+        """
+        with self._save_lock:
+            records, self._save_buffer = self._save_buffer, []
+        if records:
+            self._write(records)
+        with self._save_lock:
+            pending = list(self._pending_saves)
+        wait(pending)
+        with self._save_lock:
+            error, self._save_error = self._save_error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Flush pending saves and shut down the background save pool.
+
+        The pool is recreated if the interceptor saves again afterwards.
+        """
+        try:
+            self.flush()
+        finally:
+            with self._save_lock:
+                executor, self._save_executor = self._save_executor, None
+            if executor is not None:
+                executor.shutdown(wait=True)
+
     @property
     def stats(self) -> dict[str, int]:
         """Get interceptor statistics."""
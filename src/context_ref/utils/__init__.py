@@ -1,5 +1,17 @@
 """Utility functions."""
 
-from context_ref.utils.serialization import serialize_args, deserialize_args
+from context_ref.utils.serialization import (
+    deserialize_args,
+    dumps_json,
+    dumps_json_bytes,
+    loads_json,
+    serialize_args,
+)
 
-__all__ = ["serialize_args", "deserialize_args"]
+__all__ = [
+    "serialize_args",
+    "deserialize_args",
+    "dumps_json",
+    "dumps_json_bytes",
+    "loads_json",
+]
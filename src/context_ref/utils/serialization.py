@@ -4,6 +4,13 @@ import json
 from datetime import datetime
 from typing import Any, override
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - optional speedup
+    HAS_ORJSON = False
+
 
 class DateTimeEncoder(json.JSONEncoder):
     """JSON encoder that handles datetime objects."""
@@ -15,11 +22,57 @@ class DateTimeEncoder(json.JSONEncoder):
         return super().default(o)
 
 
+# Reused encoder instance; json.dumps(cls=...) builds a new one per call
+_ARGS_ENCODER = DateTimeEncoder(sort_keys=True)
+
+
 def serialize_args(args: dict[str, Any]) -> str:
     """Serialize tool arguments to a canonical string representation."""
-    return json.dumps(args, sort_keys=True, cls=DateTimeEncoder)
+    return _ARGS_ENCODER.encode(args)
 
 
 def deserialize_args(args_str: str) -> dict[str, Any]:
     """Deserialize tool arguments from string."""
     return json.loads(args_str)
+
+
+def dumps_json(obj: Any, indent: bool = False) -> str:
+    """Serialize an object to a JSON string.
+
+    Uses orjson when it is installed and falls back to the stdlib encoder.
+    Non-ASCII text is kept as-is and unknown types are converted with str().
+    With orjson, numpy arrays are written straight from their buffer.
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option).decode()
+    return json.dumps(
+        obj, indent=2 if indent else None, ensure_ascii=False, default=str
+    )
+
+
+def dumps_json_bytes(obj: Any) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes.
+
+    Same output as dumps_json, but orjson's bytes are returned directly
+    instead of being decoded into a str first.
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        return orjson.dumps(obj, default=str, option=option)
+    return dumps_json(obj).encode()
+
+
+def loads_json(data: str | bytes | bytearray | memoryview) -> Any:
+    """Deserialize a JSON document, using orjson when it is installed.
+
+    orjson parses a memoryview (e.g. over an mmap) in place; the stdlib
+    fallback needs a bytes copy first.
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -105,6 +105,14 @@ class TestResultSaving:
         save_result(result, csv_path, format="csv")
         assert csv_path.exists()
 
+        # Test JSONL format appends one line per run
+        jsonl_path = tmp_path / "benchmark_results.jsonl"
+        save_result(result, jsonl_path, format="jsonl")
+        save_result(result, jsonl_path, format="jsonl")
+        lines = jsonl_path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])["dataset_name"] == "save_test"
+
 
 class TestDatasetLoading:
     """Tests for dataset loading functions."""
@@ -172,6 +180,46 @@ class TestBenchmarkScenarios:
         result_low = run_benchmark(queries, config=low_config, dataset_name="low_threshold")
         assert result_low["total_queries"] == 10
 
+    def test_parallel_workers_matches_decision_totals(self) -> None:
+        """Test that parallel execution keeps decision totals consistent."""
+        queries = load_queries("sample", limit=20)
+        calls: list[str] = []
+
+        def executor(tool_name: str, input_args: dict) -> tuple[bool, Any]:
+            calls.append(tool_name)
+            return True, {"tool": tool_name, "args": input_args}
+
+        result = run_benchmark(
+            queries,
+            executor=executor,
+            dataset_name="parallel",
+            parallel_workers=4,
+        )
+
+        assert result["total_queries"] == 20
+        total = result["reuse_count"] + result["context_count"] + result["execute_count"]
+        assert total == 20
+        assert len(calls) == result["context_count"] + result["execute_count"]
+
+    def test_enable_compare_reports_latency_percentiles(self) -> None:
+        """Test that compare mode reports execution-time percentiles."""
+        queries = load_queries("sample", limit=20)
+
+        def executor(tool_name: str, _input_args: dict) -> tuple[bool, Any]:
+            return True, {"tool": tool_name}
+
+        result = run_benchmark(
+            queries,
+            executor=executor,
+            dataset_name="compare",
+            enable_compare=True,
+            quiet=True,
+        )
+
+        assert result["reuse_count"] > 0
+        assert 0 <= result["p50_execution_time"] <= result["p95_execution_time"]
+        assert result["avg_execution_time"] >= 0
+
 
 def test_quick_benchmark() -> None:
     """Quick test that can be run without pytest."""
@@ -1,15 +1,24 @@
 """Tests for ToolCache."""
 
 from datetime import datetime, timedelta
-import uuid
+import itertools
+import math
+import time
 
 import pytest
 
 from context_ref.core.cache import ToolCache
 from context_ref.core.config import CacheConfig
+from context_ref.core.models import CacheEntry
 from context_ref.core.storage import ChromaVectorStore, MemoryStorageBackend
 from context_ref.core.storage.vector import VectorStore
-from context_ref.core.utils import compute_weighted_score
+from context_ref.core.utils import (
+    compute_recency_factor,
+    compute_retention_score,
+    compute_retention_scores,
+    compute_weighted_score,
+    compute_weighted_scores,
+)
 from context_ref.embedding.base import EmbeddingFunction
 
 
@@ -23,15 +32,21 @@ class MockEmbedding(EmbeddingFunction):
     def embed(self, text: str) -> list[float]:
         import hashlib
 
-        h = hashlib.md5(text.encode()).hexdigest()
-        return [int(h[i : i + 2], 16) / 255.0 for i in range(0, 32, 2)]
+        import numpy as np
+
+        digest = hashlib.md5(text.encode()).digest()
+        return (np.frombuffer(digest, dtype=np.uint8) / 255.0).tolist()
+
+
+# Unique per process; the in-memory Chroma client is per process too
+_COLLECTION_IDS = itertools.count()
 
 
 def create_test_cache(
     embedding_func=None, eviction_policy="score", max_size=10
 ) -> ToolCache:
     """Create a ToolCache with isolated storage for testing."""
-    collection_name = f"test_cache_{uuid.uuid4().hex[:8]}"
+    collection_name = f"test_cache_{next(_COLLECTION_IDS):08x}"
     storage = MemoryStorageBackend()
     vector_store = ChromaVectorStore(collection_name=collection_name)
     config = CacheConfig(
@@ -119,6 +134,84 @@ class TestToolCache:
 
         assert storage.size() == 0
 
+    def test_search_drops_only_vectors_of_missing_entries(
+        self, cache: ToolCache, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that unreadable entries keep their vector and deleted ones don't."""
+        gone = cache.save("search", {"query": "gone"}, "r1")
+        unreadable = cache.save("search", {"query": "unreadable"}, "r2")
+        cache.storage.delete(gone.id)
+        # e.g. a Redis record whose JSON no longer decodes
+        monkeypatch.setattr(
+            cache.storage, "get_many", lambda keys: [None for _ in keys]
+        )
+
+        for query in ("gone", "unreadable"):
+            assert cache.search("search", {"query": query}) == []
+
+        monkeypatch.undo()
+        remaining = cache.vector_store.search(unreadable.embedding, k=5)["ids"][0]
+        assert remaining == [unreadable.id]
+        assert cache.storage.exists(unreadable.id)
+
+    def test_embedding_stored_outside_entry_record(self, cache: ToolCache) -> None:
+        """Test that the entry record omits the embedding and get_embedding loads it."""
+        entry = cache.save(
+            tool_name="search",
+            input_args={"query": "test"},
+            output="result",
+        )
+
+        assert "embedding" not in cache.storage.get(entry.id)
+        restored = cache.get_embedding(entry.id)
+        assert restored == pytest.approx(entry.embedding, abs=0.01)
+        assert cache.get_embedding("missing") is None
+
+    def test_repeated_inputs_reuse_cached_embedding(self) -> None:
+        """Test that save/search of the same input embed it only once."""
+
+        class CountingEmbedding(MockEmbedding):
+            def __init__(self) -> None:
+                self.calls = 0
+
+            def embed(self, text: str) -> list[float]:
+                self.calls += 1
+                return super().embed(text)
+
+        embedding = CountingEmbedding()
+        cache = create_test_cache(embedding_func=embedding)
+        cache.save(tool_name="search", input_args={"query": "test"}, output="result")
+        cache.search(tool_name="search", input_args={"query": "test"})
+        cache.search_batch([("search", {"query": "test"})])
+
+        assert embedding.calls == 1
+
+    def test_save_many_matches_save(self, cache: ToolCache) -> None:
+        """Test that save_many stores entries like repeated save() calls."""
+        existing = cache.save(
+            tool_name="search", input_args={"query": "q0"}, output="old"
+        )
+
+        entries = cache.save_many(
+            [
+                ("search", {"query": "q0"}, "new"),
+                ("search", {"query": "q1"}, "r1"),
+                ("weather", {"city": "Paris"}, "sunny"),
+                ("search", {"query": "q1"}, "r1b"),
+            ]
+        )
+
+        assert entries[0].id == existing.id
+        assert entries[1].id == entries[3].id
+        assert cache.storage.size() == 3
+        assert cache.storage.get(existing.id)["output"] == "new"
+        assert cache.storage.get(entries[1].id)["output"] == "r1b"
+        assert cache.get_embedding(entries[2].id) is not None
+        assert cache.stats()["total_entries"] == 3
+
+        hits = cache.search(tool_name="weather", input_args={"city": "Paris"})
+        assert hits[0].entry.output == "sunny"
+
     def test_save_updates_existing_entry(self, cache: ToolCache) -> None:
         """Test that saving same input updates existing entry."""
         cache.save(
@@ -136,6 +229,27 @@ class TestToolCache:
         assert entry.provide_context_count == 0
         assert entry.output == "result2"
 
+    def test_save_skips_self_context_reference(self, cache: ToolCache) -> None:
+        """Test that re-saving an entry withdraws its own context credit."""
+        entry = cache.save(
+            tool_name="search",
+            input_args={"query": "test"},
+            output="result1",
+        )
+        cache.increment_context(entry.id)
+
+        updated = cache.save(
+            tool_name="search",
+            input_args={"query": "test"},
+            output="result2",
+            already_referenced_ids={entry.id},
+        )
+
+        assert updated.provide_context_count == 0
+        data = cache.storage.get(entry.id)
+        assert data is not None
+        assert data["provide_context_count"] == 0
+
     def test_increment_reference_counts(self, cache: ToolCache) -> None:
         """Test incrementing reuse and context counts."""
         entry = cache.save(
@@ -182,6 +296,27 @@ class TestToolCache:
         assert all(h.entry.tool_name == "search" for h in search_hits)
         assert all(h.entry.tool_name == "calculator" for h in calc_hits)
 
+    def test_search_batch_matches_search(self, cache: ToolCache) -> None:
+        """Test that batched search groups by tool and keeps call order."""
+        cache.save("search", {"query": "alpha"}, "search alpha")
+        cache.save("search", {"query": "beta"}, "search beta")
+        cache.save("calculator", {"query": "alpha"}, "calc alpha")
+
+        calls = [
+            ("search", {"query": "alpha"}),
+            ("calculator", {"query": "alpha"}),
+            ("search", {"query": "beta"}),
+            ("missing", {"query": "alpha"}),
+        ]
+        batched = cache.search_batch(calls)
+
+        assert len(batched) == len(calls)
+        for (tool_name, input_args), hits in zip(calls, batched, strict=True):
+            single = cache.search(tool_name, input_args)
+            assert [h.entry.id for h in hits] == [h.entry.id for h in single]
+        assert batched[1][0].entry.output == "calc alpha"
+        assert batched[3] == []
+
     def test_get_best_match(self, cache: ToolCache) -> None:
         """Test getting best match from cache."""
         cache.save(
@@ -213,17 +348,17 @@ class TestToolCache:
         )
         cache.increment_reuse(entry.id)
 
-        raw = cache.storage.get(entry.id)
-        assert raw is not None
+        stored = cache.storage.get(entry.id)
+        assert stored is not None
+        raw = dict(stored)
 
         old_time = datetime.now() - timedelta(hours=500)
         raw["last_accessed_at"] = old_time.isoformat()
 
-        low_score = compute_weighted_score(
-            similarity=1.0,
+        low_score = compute_retention_score(
             reuse_count=raw.get("reuse_count", 0),
             provide_context_count=raw.get("provide_context_count", 0),
-            last_accessed=old_time,
+            last_accessed=old_time.timestamp(),
             reuse_context_factor=cache.config.reuse_context_factor,
             time_decay_lambda=cache.config.time_decay_lambda,
         )
@@ -245,7 +380,7 @@ class TestToolCache:
 
     def test_eviction_policies(self) -> None:
         """Test different eviction policies."""
-        for policy in ["lru", "lfu", "fifo", "score"]:
+        for policy in ["lru", "lfu", "fifo", "score", "lru-k", "tinylfu"]:
             cache = create_test_cache(eviction_policy=policy, max_size=3)
 
             for i in range(5):
@@ -257,6 +392,53 @@ class TestToolCache:
 
             assert cache.storage.size() <= 3
 
+    def test_memory_bottom_by_score_after_rescoring(self) -> None:
+        """Test that rescored and deleted keys don't leak into score eviction."""
+        storage = MemoryStorageBackend()
+        for i in range(200):
+            storage.set(f"k{i}", {"id": f"k{i}"}, score=float(i))
+        for i in range(0, 200, 2):
+            storage.update_score(f"k{i}", 1000.0 + i)
+        storage.delete("k1")
+
+        assert storage.get_bottom_by_score(3) == ["k3", "k5", "k7"]
+        assert storage.pop_bottom_by_score(2) == ["k3", "k5"]
+        assert storage.get_bottom_by_score(1) == ["k7"]
+        assert storage.size() == 197
+
+    def test_memory_stores_timestamps_as_epoch(self) -> None:
+        """Test that ISO timestamps are coerced to floats on insert."""
+        storage = MemoryStorageBackend()
+        storage.set("old", {"created_at": "2024-01-01T00:00:00"}, score=0.0)
+        storage.set("new", {"created_at": time.time()}, score=0.0)
+
+        assert isinstance(storage.get("old")["created_at"], float)
+        assert storage.get_oldest_by_creation(1) == ["old"]
+
+    def test_lru_k_eviction_resists_scans(self) -> None:
+        """Test that a one-off scan does not evict a repeatedly used entry."""
+        cache = create_test_cache(eviction_policy="lru-k", max_size=3)
+        hot = cache.save("search", {"query": "hot"}, "hot")
+        cache.increment_reuse(hot.id)
+
+        for i in range(5):
+            cache.save("search", {"query": f"scan_{i}"}, f"scan_{i}")
+
+        assert cache.storage.exists(hot.id)
+        assert cache.storage.size() == 3
+
+    def test_tinylfu_rejects_cold_candidate(self) -> None:
+        """Test that TinyLFU keeps a frequently used victim over a newcomer."""
+        cache = create_test_cache(eviction_policy="tinylfu", max_size=1)
+        warm = cache.save("search", {"query": "warm"}, "warm")
+        for _ in range(3):
+            cache.increment_reuse(warm.id)
+
+        cold = cache.save("search", {"query": "cold"}, "cold")
+
+        assert cache.storage.exists(warm.id)
+        assert not cache.storage.exists(cold.id)
+
     def test_clear_cache(self, cache: ToolCache) -> None:
         """Test clearing cache."""
         cache.save(
@@ -288,6 +470,13 @@ class TestToolCache:
         assert stats["total_reuse_count"] == 2
         assert stats["total_context_count"] == 1
         assert stats["total_references"] == 3
+        assert stats["max_reference_count"] == 2
+
+        cache.storage.delete(entries[0])
+        stats = cache.stats()
+        assert stats["total_entries"] == 2
+        assert stats["total_reuse_count"] == 0
+        assert stats["max_reference_count"] == 1
 
     def test_weighted_score_calculation(self, cache: ToolCache) -> None:
         """Test that weighted score considers both reuse and context counts."""
@@ -314,6 +503,68 @@ class TestToolCache:
         context_score = cache.storage.get_score(entry2.id)
         assert context_score is not None
 
+    def test_retention_score_order_matches_decayed_score(self) -> None:
+        """Test that stored scores rank entries like the decayed score does later."""
+        now = time.time()
+        entries = [
+            (0, 0, now - 3600),
+            (1, 0, now - 50 * 3600),
+            (5, 2, now - 200 * 3600),
+            (20, 3, now - 900 * 3600),
+            (2, 1, now),
+        ]
+        retention = [compute_retention_score(r, c, t) for r, c, t in entries]
+        for later in (now, now + 100 * 3600, now + 1000 * 3600):
+            decayed = [
+                compute_weighted_score(1.0, r, c, t, now=later) for r, c, t in entries
+            ]
+            referenced = [i for i, (r, c, _) in enumerate(entries) if r + c]
+            assert sorted(referenced, key=lambda i: retention[i]) == sorted(
+                referenced, key=lambda i: decayed[i]
+            )
+
+    def test_recency_factor_uses_given_now(self) -> None:
+        """Test that an explicit now is used instead of the clock."""
+        accessed = 1_000_000.0
+        assert compute_recency_factor(accessed, now=accessed) == 1.0
+        half_life = math.log(2) / 0.01 * 3600
+        assert compute_recency_factor(
+            accessed, now=accessed + half_life
+        ) == pytest.approx(0.5)
+
+    def test_batch_scores_match_scalar_formula(self) -> None:
+        """Test that batched scoring agrees with compute_weighted_score."""
+        now = time.time()
+        for size in (3, 40):
+            similarities = [0.5 + i / (2 * size) for i in range(size)]
+            reuse = [i % 7 for i in range(size)]
+            context = [i % 3 for i in range(size)]
+            accessed = [now - i * 3600 for i in range(size)]
+
+            batch = compute_weighted_scores(similarities, reuse, context, accessed)
+            scalar = [
+                compute_weighted_score(s, r, c, a)
+                for s, r, c, a in zip(
+                    similarities, reuse, context, accessed, strict=True
+                )
+            ]
+            assert batch == pytest.approx(scalar, abs=1e-6)
+
+    def test_batch_retention_scores_match_scalar_formula(self) -> None:
+        """Test that batched retention scores agree with compute_retention_score."""
+        now = time.time()
+        for size in (3, 40):
+            reuse = [i % 7 for i in range(size)]
+            context = [i % 3 for i in range(size)]
+            accessed = [now - i * 3600 for i in range(size)]
+
+            batch = compute_retention_scores(reuse, context, accessed)
+            scalar = [
+                compute_retention_score(r, c, a)
+                for r, c, a in zip(reuse, context, accessed, strict=True)
+            ]
+            assert batch == pytest.approx(scalar, rel=1e-12)
+
     def test_entry_has_uuid(self, cache: ToolCache) -> None:
         """Test that saved entries have UUID."""
         entry = cache.save(
@@ -339,3 +590,36 @@ class TestToolCache:
 
         score_after = cache.storage.get_score(entry.id)
         assert score_after > score_before
+
+    def test_increment_and_rescore_matches_entry_score(self, cache: ToolCache) -> None:
+        """Test that the fused storage bump stores the same score as a full rescore."""
+        entry = cache.save(
+            tool_name="search",
+            input_args={"query": "test"},
+            output="result",
+        )
+        cache.increment_reuse(entry.id)
+        cache.increment_context(entry.id)
+
+        stored = CacheEntry.from_dict(cache.storage.get(entry.id))
+        assert stored.reuse_count == 1
+        assert stored.provide_context_count == 1
+        assert cache.storage.get_score(entry.id) == pytest.approx(
+            cache._compute_entry_score(stored)
+        )
+        assert cache.storage.increment_and_rescore("missing", "reuse") is None
+        with pytest.raises(ValueError):
+            cache.storage.increment_and_rescore(entry.id, "bogus")
+
+    def test_increment_context_many(self, cache: ToolCache) -> None:
+        """Test that the batched context bump matches single increments."""
+        first = cache.save("search", {"query": "a"}, "a")
+        second = cache.save("search", {"query": "b"}, "b")
+
+        assert cache.increment_context_many([first.id, "missing", second.id]) == 2
+        for entry_id in (first.id, second.id):
+            stored = CacheEntry.from_dict(cache.storage.get(entry_id))
+            assert stored.provide_context_count == 1
+            assert cache.storage.get_score(entry_id) == pytest.approx(
+                cache._compute_entry_score(stored)
+            )
@@ -0,0 +1,110 @@
+"""Tests for ChromaVectorStore."""
+
+import itertools
+import threading
+
+from context_ref.core.cache import ToolCache
+from context_ref.core.config import CacheConfig
+from context_ref.core.storage import ChromaVectorStore, MemoryStorageBackend
+from context_ref.core.storage.chroma import _CLIENTS
+from context_ref.embedding.base import EmbeddingFunction
+
+# Unique per process; the in-memory Chroma client is per process too
+_COLLECTION_IDS = itertools.count()
+
+
+class AxisEmbedding(EmbeddingFunction):
+    """Maps inputs mentioning "a", "b" or "c" onto the matching axis."""
+
+    @property
+    def dimension(self) -> int:
+        return 3
+
+    def embed(self, text: str) -> list[float]:
+        return [1.0 if f'"{axis}"' in text else 0.0 for axis in "abc"]
+
+
+def _make_store(**kwargs) -> ChromaVectorStore:
+    store = ChromaVectorStore(
+        collection_name=f"test_{next(_COLLECTION_IDS):08x}", **kwargs
+    )
+    store.add(
+        ids=["a", "b", "c"],
+        embeddings=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        documents=["doc a", "doc b", "doc c"],
+        metadata=[{"tool_name": "search"}] * 3,
+    )
+    return store
+
+
+class TestChromaVectorStore:
+    """Test cases for ChromaVectorStore."""
+
+    def test_concurrent_cache_searches_are_coalesced(self) -> None:
+        """Test that concurrent ToolCache searches share one Chroma query."""
+        cache = ToolCache(
+            config=CacheConfig(similarity_threshold=0.5),
+            embedding_func=AxisEmbedding(),
+            storage=MemoryStorageBackend(),
+            vector_store=ChromaVectorStore(
+                collection_name=f"test_{next(_COLLECTION_IDS):08x}",
+                coalesce_window=0.2,
+            ),
+        )
+        for query in ("a", "b", "c"):
+            cache.save("search", {"q": query}, f"result {query}")
+
+        coalescer = cache.vector_store._coalescer
+        assert coalescer is not None
+        batch_sizes: list[int] = []
+        run_batch = coalescer._run_batch
+
+        def counting_run_batch(embeddings, k, filter):
+            batch_sizes.append(len(embeddings))
+            return run_batch(embeddings, k, filter)
+
+        coalescer._run_batch = counting_run_batch
+
+        results: dict[str, object] = {}
+
+        def search(query: str) -> None:
+            hits = cache.search("search", {"q": query})
+            results[query] = hits[0].entry.output
+
+        threads = [threading.Thread(target=search, args=(q,)) for q in "abc"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {q: f"result {q}" for q in "abc"}
+        assert batch_sizes == [3]
+
+    def test_search_without_coalescing(self) -> None:
+        """Test that the default store queries Chroma directly."""
+        store = _make_store()
+        assert store._coalescer is None
+        assert store.search([0.0, 1.0, 0.1], k=1)["ids"] == [["b"]]
+
+    def test_hnsw_settings_applied_to_new_collection(self) -> None:
+        """Test that HNSW parameters reach the collection and ef_search is tunable."""
+        store = _make_store(hnsw_m=32, ef_construction=200, ef_search=64)
+        hnsw = store.get_collection().configuration["hnsw"]
+        assert (hnsw["max_neighbors"], hnsw["ef_construction"]) == (32, 200)
+        assert hnsw["ef_search"] == 64
+
+        store.set_ef_search(20)
+        assert store.get_collection().configuration["hnsw"]["ef_search"] == 20
+        assert store.search([1.0, 0.0, 0.0], k=1)["ids"] == [["a"]]
+
+    def test_stores_share_one_client(self) -> None:
+        """Test that stores for the same location reuse a refcounted client."""
+        first = _make_store()
+        second = _make_store()
+        assert first.get_client() is second.get_client()
+
+        key = first._client_key
+        refs = _CLIENTS[key][1]
+        first.close()
+        assert _CLIENTS[key][1] == refs - 1
+        assert second.search([1.0, 0.0, 0.0], k=1)["ids"] == [["a"]]
@@ -3,7 +3,7 @@
 import pytest
 from pydantic import ValidationError
 
-from context_ref.core.config import CacheConfig
+from context_ref.core.config import CacheConfig, get_chroma_config
 
 
 class TestCacheConfig:
@@ -88,3 +88,11 @@ class TestCacheConfig:
         assert config.reuse_context_factor == 0.0
         assert config.time_decay_lambda == 0.0
         assert config.max_cache_size == 1
+
+    def test_env_configs_read_once(self) -> None:
+        """Test that env-backed sub-configs are cached but not shared."""
+        first = CacheConfig()
+        second = CacheConfig()
+        assert get_chroma_config() is get_chroma_config()
+        assert first.vector_store.chroma == second.vector_store.chroma
+        assert first.vector_store.chroma is not second.vector_store.chroma
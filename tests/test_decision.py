@@ -1,7 +1,10 @@
 """Tests for decision making logic with split reference counting."""
 
-import uuid
+import hashlib
+import itertools
+from functools import lru_cache
 
+import numpy as np
 import pytest
 
 from context_ref.core.cache import ToolCache
@@ -14,6 +17,12 @@ from context_ref.interceptor.wrapper import (
 )
 
 
+@lru_cache(maxsize=4096)
+def _mock_embed(text: str) -> tuple[float, ...]:
+    digest = hashlib.md5(text.encode()).digest()
+    return tuple((np.frombuffer(digest, dtype=np.uint8) / 255.0).tolist())
+
+
 class MockEmbedding(EmbeddingFunction):
     """Mock embedding that returns consistent vectors for same input."""
 
@@ -22,15 +31,21 @@ class MockEmbedding(EmbeddingFunction):
         return 16
 
     def embed(self, text: str) -> list[float]:
-        import hashlib
+        return list(_mock_embed(text))
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        digests = b"".join(hashlib.md5(text.encode()).digest() for text in texts)
+        matrix = np.frombuffer(digests, dtype=np.uint8).reshape(-1, 16) / 255.0
+        return matrix.tolist()
 
-        h = hashlib.md5(text.encode()).hexdigest()
-        return [int(h[i : i + 2], 16) / 255.0 for i in range(0, 32, 2)]
+
+# Unique per process; the in-memory Chroma client is per process too
+_COLLECTION_IDS = itertools.count()
 
 
 def create_test_cache(embedding_func=None) -> ToolCache:
     """Create a ToolCache with isolated storage for testing."""
-    collection_name = f"test_decision_{uuid.uuid4().hex[:8]}"
+    collection_name = f"test_decision_{next(_COLLECTION_IDS):08x}"
     storage = MemoryStorageBackend()
     vector_store = ChromaVectorStore(collection_name=collection_name)
     config = CacheConfig(
@@ -87,24 +102,17 @@ class TestToolInterceptorDecision:
             output="cached result",
         )
 
-        data = cache.storage.get(entry.id)
-        assert data is not None
-        assert data["reuse_count"] == 0
-        assert data["provide_context_count"] == 0
+        assert cache.storage.get_counts(entry.id) == (0, 0)
 
         # Make multiple REUSE decisions
         for i in range(1, 6):
             result = interceptor.decide("search", {"query": "test"})
             assert result.decision == CacheDecision.REUSE
-
-            data = cache.storage.get(entry.id)
-            assert data is not None
-            assert data["reuse_count"] == i
-            assert data["provide_context_count"] == 0
+            assert cache.storage.get_counts(entry.id) == (i, 0)
 
     def test_context_increments_context_count(self, cache: ToolCache) -> None:
         """Test that PROVIDE_CONTEXT decision increments provide_context_count."""
-        collection_name = f"test_context_{uuid.uuid4().hex[:8]}"
+        collection_name = f"test_context_{next(_COLLECTION_IDS):08x}"
         storage = MemoryStorageBackend()
         vector_store = ChromaVectorStore(collection_name=collection_name)
         config = CacheConfig(
@@ -184,3 +192,27 @@ class TestToolInterceptorDecision:
         final_score = cache.storage.get_score(entry.id)
         assert final_score is not None
         assert final_score > initial_score
+
+    def test_decide_batch_matches_decide(
+        self, cache: ToolCache, interceptor: ToolInterceptor
+    ) -> None:
+        """Test that decide_batch returns one decision per call, in order."""
+        cache.save(
+            tool_name="search",
+            input_args={"query": "test"},
+            output="cached result",
+        )
+
+        results = interceptor.decide_batch(
+            [
+                ("search", {"query": "test"}),
+                ("calculator", {"expression": "1 + 1"}),
+            ]
+        )
+
+        assert len(results) == 2
+        assert results[0].decision == CacheDecision.REUSE
+        assert results[0].cache_hit is not None
+        assert results[0].cache_hit.entry.output == "cached result"
+        assert results[1].decision == CacheDecision.EXECUTE
+        assert interceptor.decide_batch([]) == []
@@ -0,0 +1,57 @@
+"""Tests for embedding wrappers."""
+
+import threading
+
+from context_ref.embedding import BatchedEmbedding
+from context_ref.embedding.base import EmbeddingFunction
+
+
+class LengthEmbedding(EmbeddingFunction):
+    """Embeds a text as [len(text)] and records batch sizes."""
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+
+    @property
+    def dimension(self) -> int:
+        return 1
+
+    def embed(self, text: str) -> list[float]:
+        return [float(len(text))]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.batch_sizes.append(len(texts))
+        return [self.embed(text) for text in texts]
+
+
+class TestBatchedEmbedding:
+    """Test cases for BatchedEmbedding."""
+
+    def test_concurrent_embeds_share_a_batch(self) -> None:
+        """Test that concurrent callers get their own rows from one batch."""
+        inner = LengthEmbedding()
+        embedding = BatchedEmbedding(inner, window=0.2, max_batch=4)
+        results: dict[str, list[float]] = {}
+
+        def embed(text: str) -> None:
+            results[text] = embedding.embed(text)
+
+        texts = ["a", "bb", "ccc", "dddd"]
+        threads = [threading.Thread(target=embed, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {text: [float(len(text))] for text in texts}
+        assert inner.batch_sizes == [4]
+
+    def test_single_embed_and_passthrough(self) -> None:
+        """Test the single-caller path and the batch passthrough."""
+        inner = LengthEmbedding()
+        embedding = BatchedEmbedding(inner, window=0.0)
+
+        assert embedding.embed("abc") == [3.0]
+        assert embedding.embed_batch(["a", "bb"]) == [[1.0], [2.0]]
+        assert embedding.dimension == 1
+        assert inner.batch_sizes == [1, 2]
@@ -0,0 +1,40 @@
+"""Tests for the LRU-K and TinyLFU access-tracking helpers."""
+
+from context_ref.core.eviction import AccessHistory, FrequencySketch
+
+
+class TestFrequencySketch:
+    """Test cases for FrequencySketch."""
+
+    def test_every_row_spreads_keys(self) -> None:
+        """Test that no row maps all keys onto a single counter."""
+        sketch = FrequencySketch(1024)
+        keys = [f"key-{i}" for i in range(1000)]
+
+        for row in range(FrequencySketch._DEPTH):
+            used = {sketch._indexes(key)[row] for key in keys}
+            assert len(used) > 500
+
+    def test_estimate_tracks_frequency(self) -> None:
+        """Test that frequent keys estimate higher than rare ones."""
+        sketch = FrequencySketch(256)
+        for _ in range(5):
+            sketch.record("hot")
+        sketch.record("cold")
+
+        assert sketch.estimate("hot") == 5
+        assert sketch.estimate("cold") == 1
+        assert sketch.estimate("never") == 0
+
+
+class TestAccessHistory:
+    """Test cases for AccessHistory."""
+
+    def test_victims_prefer_entries_with_few_accesses(self) -> None:
+        """Test that unseen and once-seen keys go before repeatedly used ones."""
+        history = AccessHistory(k=2)
+        for key in ("hot", "once", "hot"):
+            history.record(key)
+
+        assert history.victims(["hot", "once", "unseen"], n=2) == ["unseen", "once"]
+        assert history.victims(["hot"], n=5) == ["hot"]
@@ -0,0 +1,59 @@
+"""Tests for FaissVectorStore."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from context_ref.core.storage import FaissVectorStore, MemoryVectorStore
+
+
+def _add_random(store, n: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    store.add(
+        ids=[f"e{i}" for i in range(n)],
+        embeddings=vectors,
+        documents=[f"doc {i}" for i in range(n)],
+        metadata=[{"tool_name": "even" if i % 2 == 0 else "odd"} for i in range(n)],
+    )
+    return vectors
+
+
+class TestFaissVectorStore:
+    """Test cases for FaissVectorStore."""
+
+    def test_exact_search_matches_memory_store(self) -> None:
+        """Test that below the ANN threshold results equal the exact store."""
+        faiss_store = FaissVectorStore()
+        memory = MemoryVectorStore()
+        for store in (faiss_store, memory):
+            vectors = _add_random(store, 50)
+
+        queries = vectors[:3] + 0.1
+        expected = memory.search_batch(queries, k=4, filter={"tool_name": "odd"})
+        result = faiss_store.search_batch(queries, k=4, filter={"tool_name": "odd"})
+
+        assert faiss_store._hnsw is None
+        assert result["ids"] == expected["ids"]
+        assert np.allclose(result["distances"], expected["distances"], atol=1e-5)
+
+    def test_hnsw_search_skips_deleted_and_updated_entries(self) -> None:
+        """Test the graph path with tombstones, filters and re-added ids."""
+        store = FaissVectorStore(ann_min_vectors=100)
+        vectors = _add_random(store, 200)
+        assert store._hnsw is not None
+
+        store.delete(["e0", "missing"])
+        assert "e0" not in store.search(vectors[0], k=5)["ids"][0]
+        assert store.search(vectors[2], k=1)["ids"] == [["e2"]]
+
+        store.add(["e4"], [vectors[5]], ["moved"], [{"tool_name": "even"}])
+        result = store.search(vectors[5], k=2, filter={"tool_name": "even"})
+        assert result["ids"][0][0] == "e4"
+        assert result["documents"][0][0] == "moved"
+        assert store.search(vectors[1], k=1, filter={"tool_name": "nope"})["ids"] == [
+            []
+        ]
+
+        store.clear()
+        assert store.search(vectors[1])["ids"] == [[]]
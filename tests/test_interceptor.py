@@ -1,7 +1,11 @@
 """Tests for tool interceptor with split reference counting."""
 
-import uuid
+import hashlib
+import itertools
+from collections.abc import Iterator
+from functools import lru_cache
 
+import numpy as np
 import pytest
 
 from context_ref.core.cache import ToolCache
@@ -11,6 +15,12 @@ from context_ref.embedding.base import EmbeddingFunction
 from context_ref.interceptor.wrapper import ToolInterceptor
 
 
+@lru_cache(maxsize=4096)
+def _mock_embed(text: str) -> tuple[float, ...]:
+    digest = hashlib.md5(text.encode()).digest()
+    return tuple((np.frombuffer(digest, dtype=np.uint8) / 255.0).tolist())
+
+
 class MockEmbedding(EmbeddingFunction):
     """Mock embedding for testing with better differentiation."""
 
@@ -19,15 +29,21 @@ class MockEmbedding(EmbeddingFunction):
         return 16
 
     def embed(self, text: str) -> list[float]:
-        import hashlib
+        return list(_mock_embed(text))
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        digests = b"".join(hashlib.md5(text.encode()).digest() for text in texts)
+        matrix = np.frombuffer(digests, dtype=np.uint8).reshape(-1, 16) / 255.0
+        return matrix.tolist()
 
-        h = hashlib.md5(text.encode()).hexdigest()
-        return [int(h[i : i + 2], 16) / 255.0 for i in range(0, 32, 2)]
+
+# Unique per process; the in-memory Chroma client is per process too
+_COLLECTION_IDS = itertools.count()
 
 
 def create_test_cache(embedding_func=None) -> ToolCache:
     """Create a ToolCache with isolated storage for testing."""
-    collection_name = f"test_interceptor_{uuid.uuid4().hex[:8]}"
+    collection_name = f"test_interceptor_{next(_COLLECTION_IDS):08x}"
     storage = MemoryStorageBackend()
     vector_store = ChromaVectorStore(collection_name=collection_name)
     config = CacheConfig(
@@ -43,17 +59,29 @@ def create_test_cache(embedding_func=None) -> ToolCache:
     )
 
 
+@pytest.fixture(scope="class")
+def shared_interceptor() -> Iterator[ToolInterceptor]:
+    """One interceptor (and Chroma collection) per test class."""
+    config = CacheConfig(
+        similarity_threshold=0.5,
+        reuse_threshold=0.95,
+    )
+    cache = create_test_cache()
+    yield ToolInterceptor(cache=cache, config=config)
+    cache.close()
+
+
 class TestToolInterceptor:
     """Test cases for ToolInterceptor."""
 
     @pytest.fixture
-    def interceptor(self) -> ToolInterceptor:
-        config = CacheConfig(
-            similarity_threshold=0.5,
-            reuse_threshold=0.95,
-        )
-        cache = create_test_cache()
-        return ToolInterceptor(cache=cache, config=config)
+    def interceptor(
+        self, shared_interceptor: ToolInterceptor
+    ) -> Iterator[ToolInterceptor]:
+        """The class-wide interceptor, emptied after every test."""
+        yield shared_interceptor
+        shared_interceptor.reset_stats()
+        shared_interceptor.cache.clear()
 
     def test_wrap_tool_caches_result(self, interceptor: ToolInterceptor) -> None:
         """Test that wrapped tool caches results and reuses them."""
@@ -74,6 +102,37 @@ class TestToolInterceptor:
         assert result2 == "Result for test"
         assert call_count == 1
 
+    def test_background_save_visible_after_flush(self) -> None:
+        """Test that background saves land in the cache once flushed."""
+        interceptor = ToolInterceptor(cache=create_test_cache(), save_workers=2)
+        wrapped = interceptor.wrap_tool(lambda query: f"Result for {query}")
+
+        for query in ("a", "b", "c"):
+            wrapped(query=query)
+        interceptor.flush()
+
+        assert interceptor.cache.storage.size() == 3
+        assert not interceptor._pending_saves
+
+        interceptor.close()
+        assert interceptor._save_executor is None
+
+    def test_batched_saves_written_together(self) -> None:
+        """Test that buffered saves are written once the batch fills or on flush."""
+        interceptor = ToolInterceptor(cache=create_test_cache(), save_batch_size=2)
+        wrapped = interceptor.wrap_tool(lambda query: f"Result for {query}")
+
+        wrapped(query="a")
+        assert interceptor.cache.storage.size() == 0
+        wrapped(query="b")
+        assert interceptor.cache.storage.size() == 2
+
+        wrapped(query="c")
+        interceptor.flush()
+        assert interceptor.cache.storage.size() == 3
+        assert wrapped(query="c") == "Result for c"
+        assert interceptor.stats["hits"] == 1
+
     def test_wrap_tool_preserves_metadata(self, interceptor: ToolInterceptor) -> None:
         """Test that wrapped tool preserves function name and docstring."""
         def my_tool(query: str) -> str:
@@ -100,8 +159,8 @@ class TestToolInterceptor:
         assert stats["hits"] == 1
         assert stats["misses"] == 2
         assert stats["total_entries"] == 2
-        assert "hit_rate" in stats
-        assert stats["hit_rate"] == pytest.approx(1/3)
+        # hits / (hits + misses) is computed exactly as 1 / 3
+        assert stats["hit_rate"] == 1 / 3
 
         interceptor.reset_stats()
         stats = interceptor.stats
@@ -153,19 +212,12 @@ class TestToolInterceptor:
 
         wrapped(query="test")
 
-        entries = list(interceptor.cache.storage.keys())
-        entry_id = entries[0]
-        data = interceptor.cache.storage.get(entry_id)
-        assert data is not None
-        assert data["reuse_count"] == 0
-        assert data["provide_context_count"] == 0
+        (entry_id,) = interceptor.cache.storage.keys()
+        assert interceptor.cache.storage.get_counts(entry_id) == (0, 0)
 
         for i in range(1, 6):
             wrapped(query="test")
-            data = interceptor.cache.storage.get(entry_id)
-            assert data is not None
-            assert data["reuse_count"] == i
-            assert data["provide_context_count"] == 0
+            assert interceptor.cache.storage.get_counts(entry_id) == (i, 0)
 
     def test_different_queries_different_entries(self, interceptor: ToolInterceptor) -> None:
         """Test that different queries create different cache entries."""
@@ -209,8 +261,7 @@ class TestToolInterceptor:
 
         wrapped(query="test")
 
-        entries = list(interceptor.cache.storage.keys())
-        entry_id = entries[0]
+        (entry_id,) = interceptor.cache.storage.keys()
         initial_score = interceptor.cache.storage.get_score(entry_id)
 
         for _ in range(3):
@@ -0,0 +1,127 @@
+"""Tests for MemoryVectorStore."""
+
+import pytest
+
+from context_ref.core.storage import ChromaVectorStore, MemoryVectorStore
+
+
+def _add_sample(store) -> None:
+    store.add(
+        ids=["a", "b", "c", "d"],
+        embeddings=[[1.0, 0.0, 0.0], [0.9, 0.1, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 2.0]],
+        documents=["doc a", "doc b", "doc c", "doc d"],
+        metadata=[
+            {"tool_name": "search"},
+            {"tool_name": "search"},
+            {"tool_name": "weather"},
+            {"tool_name": "search"},
+        ],
+    )
+
+
+class TestMemoryVectorStore:
+    """Test cases for MemoryVectorStore."""
+
+    def test_matches_chroma_cosine_search(self) -> None:
+        """Test that results agree with Chroma's cosine space."""
+        memory = MemoryVectorStore()
+        chroma = ChromaVectorStore(collection_name="test_memory_vector_cmp")
+        chroma.clear()
+        for store in (memory, chroma):
+            _add_sample(store)
+
+        query = [1.0, 0.2, 0.1]
+        expected = chroma.search(query, k=3, filter={"tool_name": "search"})
+        result = memory.search(query, k=3, filter={"tool_name": "search"})
+
+        assert result["ids"] == expected["ids"]
+        assert result["distances"][0] == pytest.approx(
+            expected["distances"][0], abs=1e-5
+        )
+        assert result["documents"][0][0] == "doc b"
+
+    def test_delete_moves_last_row(self) -> None:
+        """Test that deleting keeps the remaining rows searchable."""
+        store = MemoryVectorStore()
+        _add_sample(store)
+
+        store.delete(ids=["a", "missing"])
+        result = store.search([1.0, 0.0, 0.0], k=5)
+        assert sorted(result["ids"][0]) == ["b", "c", "d"]
+        assert result["ids"][0][0] == "b"
+
+        result = store.search([0.0, 0.0, 1.0], k=1, filter={"tool_name": "search"})
+        assert result["ids"] == [["d"]]
+
+    def test_search_batch_and_unknown_filter(self) -> None:
+        """Test batched queries and filters on values never stored."""
+        store = MemoryVectorStore()
+        _add_sample(store)
+
+        result = store.search_batch(
+            [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], k=1, filter={"tool_name": "weather"}
+        )
+        assert result["ids"] == [["c"], ["c"]]
+
+        result = store.search([1.0, 0.0, 0.0], k=2, filter={"tool_name": "nope"})
+        assert result["ids"] == [[]]
+
+        store.clear()
+        assert store.search([1.0, 0.0, 0.0])["ids"] == [[]]
+
+    def test_float16_matrix_matches_float32(self) -> None:
+        """Test that a half-precision store ranks like the float32 one."""
+        full = MemoryVectorStore()
+        half = MemoryVectorStore(dtype="float16")
+        half._SEARCH_BLOCK = 2
+        for store in (full, half):
+            _add_sample(store)
+
+        query = [1.0, 0.2, 0.1]
+        expected = full.search(query, k=4)
+        result = half.search(query, k=4)
+
+        assert result["ids"] == expected["ids"]
+        assert result["distances"][0] == pytest.approx(
+            expected["distances"][0], abs=1e-3
+        )
+        assert half._vectors is not None and half._vectors.dtype == "float16"
+
+    def test_int8_matrix_matches_float32(self) -> None:
+        """Test that an int8 store ranks like the float32 one and survives deletes."""
+        full = MemoryVectorStore()
+        quantized = MemoryVectorStore(dtype="int8")
+        for store in (full, quantized):
+            _add_sample(store)
+            store.delete(ids=["a"])
+
+        query = [1.0, 0.2, 0.1]
+        expected = full.search(query, k=3)
+        result = quantized.search(query, k=3)
+
+        assert result["ids"] == expected["ids"]
+        assert result["distances"][0] == pytest.approx(
+            expected["distances"][0], abs=1e-2
+        )
+        assert quantized._vectors is not None and quantized._vectors.dtype == "int8"
+
+    def test_snapshot_round_trip(self, tmp_path) -> None:
+        """Test that a store with a path reloads its rows after close()."""
+        path = str(tmp_path / "vectors")
+        query, search_only = [1.0, 0.2, 0.1], {"tool_name": "search"}
+        for dtype in ("float32", "int8"):
+            store = MemoryVectorStore(dtype=dtype, path=path)
+            _add_sample(store)
+            store.delete(ids=["b"])
+            expected = store.search(query, k=3, filter=search_only)
+            store.close()
+
+            reloaded = MemoryVectorStore(dtype=dtype, path=path)
+            result = reloaded.search(query, k=3, filter=search_only)
+            assert result["ids"] == expected["ids"] == [["a", "d"]]
+            assert result["documents"] == expected["documents"]
+            assert result["distances"][0] == pytest.approx(
+                expected["distances"][0], abs=1e-2
+            )
+            reloaded.clear()
+            reloaded.close()
@@ -74,6 +74,7 @@ class TestCacheEntry:
         assert data["provide_context_count"] == 3
         assert "uuid" in data
         assert "created_at" in data
+        assert "embedding" not in data
 
         restored_from_dict = CacheEntry.from_dict(data)
         assert restored_from_dict.id == entry.id
@@ -100,6 +101,24 @@ class TestCacheEntry:
         assert entry.reuse_count == 0
         assert entry.provide_context_count == 0
 
+    def test_from_dict_accepts_iso_timestamps(self) -> None:
+        """Test that ISO timestamps from older entries become epoch seconds."""
+        created = datetime(2024, 1, 2, 3, 4, 5)
+        data = {
+            "id": "test123",
+            "tool_name": "search",
+            "input_text": '{"query": "test"}',
+            "input_args": {"query": "test"},
+            "output": "result",
+            "created_at": created.isoformat(),
+            "last_accessed_at": created.timestamp(),
+        }
+        entry = CacheEntry.from_dict(data)
+        assert entry.created_at == created.timestamp()
+        assert entry.last_accessed_at == created.timestamp()
+        assert entry.created_at_dt == created
+        assert entry.to_dict()["created_at"] == created.timestamp()
+
 
 class TestCacheHit:
     """Test cases for CacheHit."""
@@ -122,6 +141,12 @@ class TestCacheHit:
         hit_low = CacheHit(entry=entry, similarity=0.85, weighted_score=0.8)
         assert hit_low.should_reuse is False
 
+        # The threshold comes from the cache config when set
+        hit_custom = CacheHit(
+            entry=entry, similarity=0.85, weighted_score=0.8, reuse_threshold=0.8
+        )
+        assert hit_custom.should_reuse is True
+
     def test_cache_hit_to_dict(self) -> None:
         """Test CacheHit serialization."""
         entry = CacheEntry(
@@ -0,0 +1,179 @@
+"""Tests for RedisStorageBackend on fakeredis, checked against the memory backend."""
+
+import itertools
+import time
+
+import pytest
+
+from context_ref.core.cache import ToolCache
+from context_ref.core.config import CacheConfig
+from context_ref.core.models import CacheEntry
+from context_ref.core.storage import (
+    MemoryStorageBackend,
+    MemoryVectorStore,
+    RedisStorageBackend,
+)
+from context_ref.embedding.base import EmbeddingFunction
+
+fakeredis = pytest.importorskip("fakeredis")
+# The eviction and access scripts need fakeredis' Lua support
+pytest.importorskip("lupa")
+
+
+class MockEmbedding(EmbeddingFunction):
+    """Distinct one-hot-ish vectors, so no two inputs are near duplicates."""
+
+    @property
+    def dimension(self) -> int:
+        return 64
+
+    def embed(self, text: str) -> list[float]:
+        vector = [0.0] * 64
+        vector[sum(text.encode()) % 64] = 1.0
+        vector[len(text) % 64] += 0.5
+        return vector
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed(text) for text in texts]
+
+
+@pytest.fixture
+def redis_backend() -> RedisStorageBackend:
+    server = fakeredis.FakeServer()
+    backend = RedisStorageBackend(prefix="test:")
+    backend._client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    backend._raw_client = fakeredis.FakeRedis(server=server)
+    return backend
+
+
+@pytest.fixture
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Strictly increasing time.time(), so access order never ties."""
+    ticks = itertools.count(1_700_000_000)
+    monkeypatch.setattr(time, "time", lambda: float(next(ticks)))
+
+
+def _entry(key: str, **fields) -> dict:
+    return CacheEntry(
+        id=key,
+        tool_name="search",
+        input_text=f'{{"q": "{key}"}}',
+        input_args={"q": key, "nested": [1, 2]},
+        output={"result": key},
+        **fields,
+    ).to_dict()
+
+
+def _both(redis_backend: RedisStorageBackend) -> list:
+    return [MemoryStorageBackend(), redis_backend]
+
+
+class TestRedisStorageBackend:
+    """Test cases for RedisStorageBackend."""
+
+    def test_round_trip(self, redis_backend: RedisStorageBackend) -> None:
+        """Test that entries and embeddings read back as written."""
+        data = _entry("a", reuse_count=2, created_at=1.0, last_accessed_at=2.0)
+        redis_backend.set("a", data, score=0.5, embedding=b"\x00\x7f")
+
+        assert redis_backend.get("a") == data
+        assert redis_backend.get_embedding("a") == b"\x00\x7f"
+        assert redis_backend.get_counts("a") == (2, 0)
+        assert redis_backend.get_many(["a", "missing"]) == [data, None]
+        assert redis_backend.exists("a") and not redis_backend.exists("missing")
+
+    def test_aggregates_match_memory_backend(
+        self, redis_backend: RedisStorageBackend
+    ) -> None:
+        """Test counters and aggregate stats through every write path."""
+        stats = []
+        for backend in _both(redis_backend):
+            backend.set("a", _entry("a", reuse_count=1), score=1.0)
+            backend.set_many(
+                [
+                    ("b", _entry("b", provide_context_count=2), 2.0),
+                    ("c", _entry("c"), 3.0),
+                ]
+            )
+            backend.set("a", _entry("a", reuse_count=3), score=1.0)
+            backend.increment_reuse("b")
+            backend.increment_context("c")
+            backend.increment_and_rescore_many(["a", "missing", "c"], "context")
+            backend.decrement_reference("b")
+            stats.append(
+                (
+                    backend.aggregate_stats(),
+                    [backend.get_counts(key) for key in ("a", "b", "c")],
+                )
+            )
+            assert backend.delete("c") and not backend.delete("c")
+            assert backend.delete_many(["a", "missing"]) == 1
+            stats.append(backend.aggregate_stats())
+
+        memory_stats, redis_stats = stats[:2], stats[2:]
+        assert redis_stats == memory_stats
+        assert memory_stats[0][0] == {
+            "total_entries": 3,
+            "total_reuse_count": 3,
+            "total_context_count": 5,
+            "max_reference_count": 4,
+        }
+
+    def test_eviction_order_matches_memory_backend(
+        self, redis_backend: RedisStorageBackend
+    ) -> None:
+        """Test the score, access, usage and creation indexes."""
+        rows = [
+            ("a", 0.4, {"created_at": 4.0, "last_accessed_at": 1.0, "reuse_count": 5}),
+            ("b", 0.1, {"created_at": 3.0, "last_accessed_at": 4.0}),
+            ("c", 0.3, {"created_at": 1.0, "last_accessed_at": 3.0, "reuse_count": 1}),
+            ("d", 0.2, {"created_at": 2.0, "last_accessed_at": 2.0, "reuse_count": 2}),
+        ]
+        orders = []
+        for backend in _both(redis_backend):
+            for key, score, fields in rows:
+                backend.set(key, _entry(key, **fields), score=score)
+            backend.update_score("a", 0.05)
+            orders.append(
+                (
+                    backend.get_bottom_by_score(2),
+                    backend.get_oldest_by_access(2),
+                    backend.get_least_used(2),
+                    backend.get_oldest_by_creation(2),
+                    backend.pop_bottom_by_score(2),
+                    sorted(backend.keys()),
+                    backend.size(),
+                )
+            )
+
+        assert orders[1] == orders[0]
+        assert orders[0][0] == ["a", "b"]
+        assert orders[0][5] == ["c", "d"]
+
+    @pytest.mark.usefixtures("fake_clock")
+    @pytest.mark.parametrize(
+        "policy", ["score", "lru", "lfu", "fifo", "lru-k", "tinylfu"]
+    )
+    def test_cache_eviction_matches_memory_backend(
+        self, redis_backend: RedisStorageBackend, policy: str
+    ) -> None:
+        """Test that ToolCache evicts the same entries on both backends."""
+        survivors = []
+        for storage in _both(redis_backend):
+            cache = ToolCache(
+                config=CacheConfig(max_cache_size=4, eviction_policy=policy),
+                embedding_func=MockEmbedding(),
+                storage=storage,
+                vector_store=MemoryVectorStore(),
+            )
+            hot = cache.save("search", {"q": "hot"}, "r")
+            for i in range(8):
+                cache.save("search", {"q": f"cold {i}"}, "r")
+                if cache.storage.exists(hot.id):
+                    cache.increment_reuse(hot.id)
+            survivors.append(
+                (sorted(cache.storage.keys()), cache.stats(), cache.storage.size())
+            )
+
+        assert survivors[1] == survivors[0]
+        assert survivors[0][2] == 4